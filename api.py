@@ -0,0 +1,357 @@
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Lock
+from typing import Callable, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from data import Node, build_resume_graph
+from graph_store import GraphStore
+from graph_utils import norm_kind
+from ingest import load_graph
+from metrics import REGISTRY, counter, gauge, histogram
+from paths import PathIndex
+from quantities import QuantityIndex
+from timeline import change_dates, event_dates, visible_by_date
+
+
+# Standalone read-only HTTP/JSON API over the same GraphStore indexes the app uses.
+#
+#   python api.py --port 8765
+#   python api.py --nodes nodes.parquet --edges edges.parquet
+#
+#   GET /nodes?kind=tool                    nodes of one kind (all kinds without ?kind)
+#   GET /nodes/<id>                         node + neighborhood (what Details shows)
+#   GET /dates                              timeline event stops
+#   GET /visible?date=2025-03-01            visible node ids at a date
+#   GET /delta?from=2024-01-01&to=2025-06-01  nodes added/removed between two dates
+#   GET /paths?from=<id>&to=<id>&k=3&weighted=1  shortest / top-k connection routes
+#   GET /measures?where=latency<50ms        parsed metric values in a range (quantities.py)
+#   GET /metrics                            Prometheus text format (metrics.py registry)
+#
+# /visible, /delta and /paths take the app's filters: kinds=project,tool,... and tool=<tool id>.
+# Responses carry an ETag derived from the graph version and request, so a matching
+# If-None-Match gets a 304 without touching the graph; encoded bodies are kept in a
+# small LRU so repeated reads are a dict lookup. /visible and /delta snap the date to the
+# last visibility change before it and drop unknown kinds and tools, so arbitrary query
+# values share a bounded set of store frame entries.
+#
+# Connections are kept alive (HTTP/1.1) but an idle one is closed after IDLE_TIMEOUT
+# seconds, so idle clients cannot hold every pool worker.
+
+DEFAULT_KINDS = frozenset({"experience", "project", "tool", "outcome"})
+RESPONSE_CACHE_SIZE = 1024
+IDLE_TIMEOUT = 5.0
+ENDPOINTS = ("nodes", "dates", "visible", "delta", "paths", "measures")
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def node_json(n: Node) -> dict:
+    return {
+        "id": n.id,
+        "label": n.label,
+        "kind": norm_kind(n.kind),
+        "subtitle": n.subtitle,
+        "metric": n.metric,
+        "start": n.start.isoformat() if n.start else None,
+        "end": n.end.isoformat() if n.end else None,
+        "url": n.url,
+    }
+
+
+def _param(query: Dict[str, list], name: str, default: Optional[str] = None) -> Optional[str]:
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _date_param(query: Dict[str, list], name: str) -> date:
+    value = _param(query, name)
+    if value is None:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"missing query parameter {name!r}")
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name!r} must be an ISO date (YYYY-MM-DD)")
+
+
+def _filters(query: Dict[str, list]) -> Tuple[frozenset, Optional[str]]:
+    kinds = _param(query, "kinds")
+    enabled = DEFAULT_KINDS if kinds is None else frozenset(norm_kind(k) for k in kinds.split(",") if k)
+    return enabled, _param(query, "tool")
+
+
+class GraphApi:
+    def __init__(self, store: GraphStore):
+        self.store = store
+        self.path_index = PathIndex(store)
+        self.quantities = QuantityIndex(store)
+        self._lock = Lock()
+        self._responses: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._stops: Tuple[int, list, frozenset] = (-1, [], frozenset())
+        self._routes: Dict[str, Callable[[list, Dict[str, list]], dict]] = {
+            "nodes": self.nodes,
+            "dates": self.dates,
+            "visible": self.visible,
+            "delta": self.delta,
+            "paths": self.paths,
+            "measures": self.measures,
+        }
+
+    def etag(self, path: str, query: Dict[str, list]) -> str:
+        canonical = json.dumps([self.store.version, path, sorted(query.items())])
+        return '"' + hashlib.sha1(canonical.encode()).hexdigest()[:20] + '"'
+
+    def handle(self, path: str, query: Dict[str, list]) -> bytes:
+        key = (self.store.version, path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        with self._lock:
+            body = self._responses.get(key)
+            if body is not None:
+                self._responses.move_to_end(key)
+        counter("api_cache_requests_total", "response cache lookups", result="miss" if body is None else "hit").inc()
+        if body is not None:
+            return body
+
+        parts = [p for p in path.split("/") if p]
+        route = self._routes.get(parts[0]) if parts else None
+        if route is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"unknown endpoint {path!r}")
+        payload = route(parts[1:], query)
+        payload["version"] = self.store.version
+        body = json.dumps(payload, ensure_ascii=False).encode()
+
+        with self._lock:
+            self._responses[key] = body
+            while len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return body
+
+    # --- endpoints ---
+
+    def nodes(self, rest: list, query: Dict[str, list]) -> dict:
+        store = self.store
+        if rest:
+            # ids may hold spaces, slashes or non-ASCII: the segment arrives percent-encoded
+            nid = unquote(rest[0])
+            info = store.neighborhood(nid)
+            if not info:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"unknown node {nid!r}")
+            return {
+                "node": node_json(store.nodes[nid]),
+                "neighbors": [
+                    {"id": nb, "label": label, "rel": rel, "kind": kind}
+                    for nb, label, rel, kind in info.get("neighbors", [])
+                ],
+            }
+
+        kind = _param(query, "kind")
+        kind = norm_kind(kind) if kind else None
+        nodes = [n for n in store.nodes.values() if kind is None or norm_kind(n.kind) == kind]
+        nodes.sort(key=lambda n: n.label.lower())
+        return {"kind": kind, "nodes": [node_json(n) for n in nodes]}
+
+    def dates(self, rest: list, query: Dict[str, list]) -> dict:
+        return {"dates": [d.isoformat() for d in event_dates(self.store.G)]}
+
+    def _canonical(self) -> Tuple[list, frozenset]:
+        # visibility change dates and node kinds of the current graph, rebuilt per version
+        version = self.store.version
+        with self._lock:
+            if self._stops[0] != version:
+                G = self.store.G
+                kinds = frozenset(data.get("kind") for _, data in G.nodes(data=True))
+                self._stops = (version, change_dates(G), kinds)
+            return self._stops[1], self._stops[2]
+
+    def _visible(self, d: date, enabled: frozenset, tool_id: Optional[str]) -> Set[str]:
+        # same cache key shape as app.py, so a co-hosted app and API share entries
+        starts, kinds = self._canonical()
+        G = self.store.G
+        i = bisect_right(starts, d)
+        d = starts[i - 1] if i else date.min
+        enabled = enabled & kinds
+        tool_id = tool_id if tool_id in G else None
+        key = ("visible", enabled, tool_id)
+        return self.store.frame(key, d, lambda: visible_by_date(G, d, set(enabled), tool_id))
+
+    def visible(self, rest: list, query: Dict[str, list]) -> dict:
+        d = _date_param(query, "date")
+        enabled, tool_id = _filters(query)
+        return {"date": d.isoformat(), "nodes": sorted(self._visible(d, enabled, tool_id))}
+
+    def delta(self, rest: list, query: Dict[str, list]) -> dict:
+        d0, d1 = _date_param(query, "from"), _date_param(query, "to")
+        enabled, tool_id = _filters(query)
+        before = self._visible(d0, enabled, tool_id)
+        after = self._visible(d1, enabled, tool_id)
+        return {
+            "from": d0.isoformat(),
+            "to": d1.isoformat(),
+            "added": sorted(after - before),
+            "removed": sorted(before - after),
+        }
+
+    def paths(self, rest: list, query: Dict[str, list]) -> dict:
+        source, target = _param(query, "from"), _param(query, "to")
+        for name, nid in (("from", source), ("to", target)):
+            if nid is None:
+                raise ApiError(HTTPStatus.BAD_REQUEST, f"missing query parameter {name!r}")
+            if nid not in self.store.nodes:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"unknown node {nid!r}")
+        try:
+            k = int(_param(query, "k", "1"))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'k' must be an integer")
+        weighted = _param(query, "weighted", "0").lower() in ("1", "true", "yes")
+        enabled = None if _param(query, "kinds") is None else _filters(query)[0]
+        routes = self.path_index.paths(source, target, k=k, weighted=weighted, enabled_kinds=enabled)
+        return {
+            "from": source,
+            "to": target,
+            "routes": [{"nodes": list(r.nodes), "hops": r.hops, "cost": r.cost} for r in routes],
+        }
+
+    def measures(self, rest: list, query: Dict[str, list]) -> dict:
+        where = _param(query, "where")
+        if where is None:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "missing query parameter 'where'")
+        try:
+            matches = self.quantities.query(where)
+        except ValueError as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, str(e))
+        return {
+            "where": where,
+            "measures": [
+                {"node": m.node, "quantity": m.quantity, "unit": m.unit, "value": m.value, "text": m.text}
+                for m in matches
+            ],
+        }
+
+
+class PooledHTTPServer(HTTPServer):
+    # requests are served by a fixed worker pool instead of a thread per connection
+    def __init__(self, address, handler, workers: int = 8):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def make_handler(api: GraphApi, idle_timeout: float = IDLE_TIMEOUT):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # an idle keep-alive connection times out and frees its pool worker
+        timeout = idle_timeout
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path.rstrip("/") == "/metrics":
+                self._send(HTTPStatus.OK, REGISTRY.render().encode(), METRICS_CONTENT_TYPE)
+                return
+            endpoint = next((p for p in url.path.split("/") if p), "")
+            with histogram("api_request_seconds", "request handling time",
+                           endpoint=endpoint if endpoint in ENDPOINTS else "other").time():
+                self._get(url)
+
+        def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _get(self, url):
+            query = parse_qs(url.query)
+            etag = api.etag(url.path, query)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            try:
+                body, status = api.handle(url.path, query), HTTPStatus.OK
+            except ApiError as e:
+                body, status = json.dumps({"error": str(e)}).encode(), e.status
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if status == HTTPStatus.OK:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(
+    store: GraphStore,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    workers: int = 8,
+    idle_timeout: float = IDLE_TIMEOUT,
+) -> PooledHTTPServer:
+    gauge("graph_nodes", "nodes in the graph store").set(store.G.number_of_nodes())
+    gauge("graph_edges", "edges in the graph store").set(store.G.number_of_edges())
+    return PooledHTTPServer((host, port), make_handler(GraphApi(store), idle_timeout), workers=workers)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API over the resume graph")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--nodes", help="node table (.csv / .parquet) to serve instead of the built-in resume")
+    parser.add_argument("--edges", help="edge table (.csv / .parquet), required with --nodes")
+    args = parser.parse_args()
+    if bool(args.nodes) != bool(args.edges):
+        parser.error("--nodes and --edges go together")
+
+    if args.nodes:
+        nodes, edges, report = load_graph(args.nodes, args.edges)
+        print(f"Loaded {report.nodes} nodes, {report.edges} edges ({len(report.dangling)} dangling dropped)")
+    else:
+        nodes, edges = build_resume_graph()
+    server = serve(GraphStore.from_data(nodes, edges), args.host, args.port, args.workers)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
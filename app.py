@@ -1,182 +1,135 @@
+import os
+import time
+import uuid
 import streamlit as st
-from datetime import date, datetime
+from datetime import date
 
 from data import build_resume_graph
-from graph_utils import build_nx_graph, plot_graph_timeline, describe_node
+from centrality import CentralityEngine
+from counts import CountCube, CountIndex
+from graph_store import GraphStore
+from graph_component import adjacency_list, graph_canvas, label_placement
+from ingest import load_graph
+from metrics import SIZE_BUCKETS, counter, flush_to_file, gauge, histogram
+from multiples import plot_small_multiples
+from graph_utils import LAYOUT_GAP, LAYOUT_SPREAD, apply_axis_ranges, apply_highlight, plot_graph_timeline, spacing_ranges
+from paths import MAX_ROUTES, PathIndex
+from quantities import Measure, QuantityIndex
+from related import RelatedIndex
+from shared import SharedGraphReader
+from timeline import event_dates, hierarchical_stops, visible_by_date
 from ui import inject_global_ui, card_open, card_close
 
+RERUN_STARTED = time.perf_counter()
+ACTIVE_SESSION_WINDOW = 300.0  # seconds since a session's last rerun for it to count as active
+
 st.set_page_config(page_title="Dheer Doshi — Resume Graph", page_icon="🧭", layout="wide")
 inject_global_ui()
 
-# --- Neutral, powerful palette (minimal gradients) + fix sidebar dropdown readability ---
-st.markdown(
-    """
-    <style>
-      @import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700&family=DM+Sans:wght@400;500;700&display=swap');
-
-      :root{
-        --ink: rgba(226,232,240,0.92);
-        --muted: rgba(226,232,240,0.72);
-        --muted2: rgba(226,232,240,0.58);
-        --stroke: rgba(148,163,184,0.22);
-        --panel: rgba(15,23,42,0.58);
-        --panel2: rgba(15,23,42,0.40);
-
-        /* Neutral-yet-powerful accents (limited) */
-        --accent: rgba(56,189,248,1);   /* cyan */
-        --accent2: rgba(167,139,250,1); /* violet */
-        --good: rgba(34,197,94,1);      /* green */
-        --warn: rgba(251,191,36,1);     /* amber */
-      }
-
-      html, body, [class*="css"] {
-        font-family: "DM Sans", system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, sans-serif !important;
-        color: var(--ink);
-      }
-      .block-container { padding-top: 1.2rem; }
-
-      /* Hero: ONE subtle highlight only */
-      .hero {
-        border: 1px solid var(--stroke);
-        background: rgba(15,23,42,0.52);
-        border-radius: 20px;
-        padding: 18px 18px 14px 18px;
-        box-shadow: 0 10px 34px rgba(0,0,0,0.24);
-        position: relative;
-        overflow: hidden;
-      }
-      .hero::before{
-        content:"";
-        position:absolute;
-        top:0; left:0; right:0;
-        height: 3px;
-        background: rgba(56,189,248,0.85); /* simple accent bar, no gradient */
-        opacity: 0.9;
-      }
-
-      .name {
-        font-family: "Space Grotesk", system-ui, sans-serif !important;
-        font-weight: 700;
-        font-size: 42px;
-        line-height: 1.0;
-        letter-spacing: -0.03em;
-        margin: 2px 0 6px 0;
-      }
-      .name span{
-        color: rgba(226,232,240,0.96);
-      }
-      .accent-dot{
-        display:inline-block;
-        width: 10px;
-        height: 10px;
-        border-radius: 999px;
-        background: rgba(56,189,248,0.95);
-        margin-left: 10px;
-        transform: translateY(-2px);
-        box-shadow: 0 0 0 4px rgba(56,189,248,0.10);
-      }
-
-      .subline{
-        font-size: 14.5px;
-        color: var(--muted);
-        display:flex;
-        flex-wrap: wrap;
-        gap: 10px;
-        align-items:center;
-        margin-top: 6px;
-      }
-      .sep{ opacity: .55; }
-
-      .edu {
-        margin-top: 10px;
-        font-size: 15.5px;
-        color: rgba(226,232,240,0.86);
-        display:flex;
-        align-items:center;
-        gap: 10px;
-      }
-      .pill{
-        display:inline-flex;
-        align-items:center;
-        gap: 8px;
-        padding: 7px 10px;
-        border-radius: 999px;
-        border: 1px solid rgba(148,163,184,0.18);
-        background: rgba(2,6,23,0.28);
-        color: rgba(226,232,240,0.88);
-        font-size: 12.5px;
-      }
-      .pill b{ font-weight: 700; color: rgba(226,232,240,0.94); }
-      .pill .icon{ color: rgba(56,189,248,0.95); }
-
-      .section-title{
-        font-family: "Space Grotesk", system-ui, sans-serif !important;
-        font-size: 14px;
-        letter-spacing: .06em;
-        text-transform: uppercase;
-        color: rgba(226,232,240,0.68);
-        margin: 14px 0 8px 0;
-      }
-
-      .chips { display:flex; flex-wrap: wrap; gap: 8px; }
-      .chip{
-        display:inline-flex;
-        align-items:center;
-        padding: 8px 10px;
-        border-radius: 999px;
-        border: 1px solid rgba(148,163,184,0.16);
-        background: rgba(15,23,42,0.38);
-        color: rgba(226,232,240,0.88);
-        font-size: 13px;
-      }
-      .chip.lang{ border-color: rgba(56,189,248,0.22); }
-      .chip.lang:nth-child(2){ border-color: rgba(167,139,250,0.22); }
-      .chip.lang:nth-child(3){ border-color: rgba(34,197,94,0.18); }
-
-      .hr{
-        height:1px;
-        margin: 14px 0 14px 0;
-        background: rgba(148,163,184,0.18);
-        border: 0;
-      }
-
-      /* Sidebar dropdown readability */
-      div[data-baseweb="select"] > div {
-        background: rgba(2,6,23,0.55) !important;
-        border: 1px solid rgba(148,163,184,0.28) !important;
-        color: rgba(226,232,240,0.95) !important;
-      }
-      div[data-baseweb="select"] span { color: rgba(226,232,240,0.95) !important; }
-      div[role="listbox"] {
-        background: rgba(2,6,23,0.92) !important;
-        border: 1px solid rgba(148,163,184,0.28) !important;
-      }
-      div[role="option"] { color: rgba(226,232,240,0.95) !important; }
-      div[role="option"]:hover { background: rgba(56,189,248,0.12) !important; }
-      div[data-baseweb="select"] input {
-        color: rgba(226,232,240,0.95) !important;
-        caret-color: rgba(226,232,240,0.95) !important;
-      }
-
-      section[data-testid="stSidebar"] h3 {
-        font-family: "Space Grotesk", system-ui, sans-serif !important;
-        letter-spacing: -0.01em;
-      }
-
-      .stCaption { color: var(--muted2) !important; }
-      div[data-baseweb="slider"] > div { filter: saturate(1.05); }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
-
 def chips(items, cls=""):
     html = ""
     for it in items:
         html += f"<span class='chip {cls}'>{it}</span>"
     st.markdown(f"<div class='chips'>{html}</div>", unsafe_allow_html=True)
 
-nodes, edges = build_resume_graph()
+@st.cache_resource
+def get_shared_reader():
+    # RESUME_GRAPH_SHM: attach to the graph a `python shared.py publish` process keeps
+    # in shared memory instead of loading the tables in every worker (scope: shared.py)
+    prefix = os.environ.get("RESUME_GRAPH_SHM")
+    return SharedGraphReader(prefix) if prefix else None
+
+# every graph-derived resource is keyed by the published version, so a republish
+# rebuilds them on the next rerun (max_entries=1 drops the previous one). Over shared
+# memory the networkx store is only built for the views the arrays do not answer
+@st.cache_resource(max_entries=1)
+def get_graph_store(graph_version: int = 0) -> GraphStore:
+    # RESUME_GRAPH_NODES / RESUME_GRAPH_EDGES point at bulk tables (.csv / .parquet)
+    nodes_path, edges_path = os.environ.get("RESUME_GRAPH_NODES"), os.environ.get("RESUME_GRAPH_EDGES")
+    reader = get_shared_reader()
+    if reader is not None:
+        # the version this rerun was keyed on, not whatever was published since
+        nodes, edges = reader.at(graph_version).to_data()
+    elif nodes_path and edges_path:
+        nodes, edges, _ = load_graph(nodes_path, edges_path)
+    else:
+        nodes, edges = build_resume_graph()
+    return GraphStore.from_data(nodes, edges)
+
+@st.cache_resource(max_entries=1)
+def get_centrality(graph_version: int = 0) -> CentralityEngine:
+    reader = get_shared_reader()
+    if reader is not None:
+        return CentralityEngine.from_arrays(reader.at(graph_version))
+    return CentralityEngine(get_graph_store(graph_version))
+
+@st.cache_resource(max_entries=1)
+def get_counts(graph_version: int = 0) -> CountIndex:
+    reader = get_shared_reader()
+    if reader is not None:
+        return CountIndex.from_arrays(reader.at(graph_version))
+    return CountIndex(get_graph_store(graph_version))
+
+@st.cache_resource(max_entries=1)
+def get_path_index(graph_version: int = 0) -> PathIndex:
+    return PathIndex(get_graph_store(graph_version))
+
+@st.cache_resource(max_entries=1)
+def get_related(graph_version: int = 0) -> RelatedIndex:
+    reader = get_shared_reader()
+    if reader is not None:
+        return RelatedIndex.from_arrays(reader.at(graph_version))
+    return RelatedIndex(get_graph_store(graph_version))
+
+@st.cache_resource(max_entries=1)
+def get_quantities(graph_version: int = 0) -> QuantityIndex:
+    return QuantityIndex(get_graph_store(graph_version))
+
+@st.cache_resource
+def get_metrics_flusher():
+    # RESUME_GRAPH_METRICS_FILE: Prometheus text file rewritten every few seconds (metrics.py)
+    return flush_to_file()
+
+@st.cache_resource
+def get_session_seen() -> dict:
+    return {}
+
+def track_session() -> None:
+    seen = get_session_seen()
+    now = time.time()
+    seen[st.session_state.setdefault("metrics_session", uuid.uuid4().hex)] = now
+    for sid, last in list(seen.items()):
+        if now - last > ACTIVE_SESSION_WINDOW:
+            seen.pop(sid, None)
+    gauge("app_active_sessions", "sessions with a rerun in the last 5 minutes").set(len(seen))
+
+get_metrics_flusher()
+track_session()
+
+shared_reader = get_shared_reader()
+shared_arrays = shared_reader.current() if shared_reader is not None else None
+graph_version = shared_arrays.version if shared_arrays is not None else 0
+
+def graph_store() -> GraphStore:
+    return get_graph_store(graph_version)
+
+if shared_arrays is not None:
+    nodes = shared_arrays.nodes
+    node_kinds, node_labels = shared_arrays.kinds, shared_arrays.labels
+    relations = shared_arrays.meta["rels"]
+    node_count, edge_count = shared_arrays.meta["nodes"], shared_arrays.meta["edges"]
+    # the app never edits its store: the published version alone keys the caches
+    store_version = 0
+else:
+    store = graph_store()
+    nodes = store.nodes
+    node_kinds = dict(store.G.nodes(data="kind", default=""))
+    node_labels = {nid: n.label for nid, n in nodes.items()}
+    relations = sorted({rel for _, _, rel in store.G.edges(data="rel", default="")})
+    node_count, edge_count = store.G.number_of_nodes(), store.G.number_of_edges()
+    store_version = store.version
+gauge("graph_nodes", "nodes in the graph store").set(node_count)
+gauge("graph_edges", "edges in the graph store").set(edge_count)
 
 def norm_kind(k: str) -> str:
     s = (k or "").strip().lower()
@@ -191,7 +144,8 @@ def norm_kind(k: str) -> str:
     return mapping.get(s, s)
 
 def kind_of(nid: str) -> str:
-    return norm_kind(getattr(nodes[nid], "kind", ""))
+    # the graph's kinds are already normalized (data.node_attrs)
+    return node_kinds.get(nid, "")
 
 project_ids = [nid for nid in nodes if kind_of(nid) == "project"]
 tool_ids = [nid for nid in nodes if kind_of(nid) == "tool"]
@@ -242,18 +196,30 @@ with st.sidebar:
     show_leadership = st.toggle("Leadership", value=False)
     show_tags = st.toggle("Tags", value=False)
 
+    st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
+    st.subheader("Relations")
+    enabled_rels = {rel for rel in relations if st.toggle(rel.capitalize() or "(none)", value=True, key=f"rel_{rel}")}
+    edge_weights = st.toggle("Edge width by weight", value=False)
+
     st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
     st.subheader("Focus")
     tool_filter = st.selectbox(
         "Filter projects by tool",
-        ["All tools"] + [nodes[nid].label for nid in tool_ids],
+        ["All tools"] + [node_labels[nid] for nid in tool_ids],
         index=0,
     )
+    click_spotlight = st.toggle("Click nodes to spotlight", value=True)
+    small_multiples = st.toggle("Small multiples by project", value=False)
 
     st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
     st.subheader("Labels")
     label_mode = st.selectbox("Labels", ["Smart", "All", "None"], index=0)
 
+    st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
+    st.subheader("Importance")
+    importance = st.selectbox("Order columns by", ["Connections", "PageRank", "Betweenness"], index=0)
+    size_by_importance = st.toggle("Size nodes by importance", value=False)
+
 enabled_kinds = set()
 if show_experiences: enabled_kinds.add("experience")
 if show_projects: enabled_kinds.add("project")
@@ -262,139 +228,402 @@ if show_outcomes: enabled_kinds.add("outcome")
 if show_leadership: enabled_kinds.add("leadership")
 if show_tags: enabled_kinds.add("tag")
 
-G = build_nx_graph(nodes, edges, allowed_nodes=set(nodes.keys()))
-
-def month_floor(d: date) -> date:
-    return date(d.year, d.month, 1)
-
-def parse_start(value) -> date | None:
-    if isinstance(value, date):
-        return value
-    if isinstance(value, datetime):
-        return value.date()
-    if isinstance(value, str):
-        try:
-            return date.fromisoformat(value.strip())
-        except Exception:
-            return None
-    return None
-
-def start_of(nid: str) -> date | None:
-    return parse_start(getattr(nodes[nid], "start", None))
-
-event_dates = set()
-for nid in set(project_ids) | set(experience_ids) | set(leadership_ids):
-    s = start_of(nid)
-    if s:
-        event_dates.add(month_floor(s))
-event_dates.add(month_floor(date.today()))
-dates = sorted(event_dates)
-
-def visible_by_date(d: date) -> set[str]:
-    visible = set()
-
-    if show_projects:
-        for nid in project_ids:
-            s = start_of(nid)
-            if s and s <= d:
-                visible.add(nid)
-
-    if show_experiences:
-        for nid in experience_ids:
-            s = start_of(nid)
-            if s and s <= d:
-                visible.add(nid)
-
-    if show_leadership:
-        visible.update(leadership_ids)
-
-    if show_tags:
-        visible.update(tag_ids)
-
-    if tool_filter != "(all tools)":
-        tool_id = next((tid for tid in tool_ids if nodes[tid].label == tool_filter), None)
-        if tool_id:
-            connected_projects = set()
-            for nb in G.neighbors(tool_id):
-                if nb in project_ids and nb in visible:
-                    connected_projects.add(nb)
-            visible = (visible - set(project_ids)) | connected_projects | {tool_id}
-
-    expanded = set(visible)
-    for nid in list(visible):
-        for nb in G.neighbors(nid):
-            k = kind_of(nb)
-            if k == "tool" and show_tools:
-                expanded.add(nb)
-            if k == "outcome" and show_outcomes:
-                expanded.add(nb)
-
-    return expanded
-
-visible_nodes_by_date = [visible_by_date(d) for d in dates]
+dates = shared_arrays.event_dates() if shared_arrays is not None else event_dates(graph_store().G)
+date_labels = None
+
+with st.sidebar:
+    st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
+    st.subheader("Timeline")
+    timeline_mode = st.selectbox("Stops", ["Event months", "Years (zoomable)"], index=0)
+    if timeline_mode == "Years (zoomable)":
+        years = list(range(dates[0].year, dates[-1].year + 1))
+        zoom = st.select_slider("Zoom into", ["All years"] + years, value="All years")
+        detail = st.radio("Detail", ["Monthly", "Weekly"], horizontal=True)
+        stops = hierarchical_stops(
+            dates[0], dates[-1],
+            zoom_year=None if zoom == "All years" else zoom,
+            resolution="month" if detail == "Monthly" else "week",
+        )
+        dates = [d for d, _ in stops]
+        date_labels = [label for _, label in stops]
+
+tool_id = next((tid for tid in tool_ids if node_labels[tid] == tool_filter), None)
+visibility_key = ("visible", frozenset(enabled_kinds), tool_id)
+# the default view's visible sets come straight from the published bitmaps
+shared_visible = shared_arrays.visible_by_dates(dates, enabled_kinds, tool_id) if shared_arrays is not None else None
+if shared_visible is not None:
+    visible_nodes_by_date = shared_visible
+else:
+    store = graph_store()
+    G = store.G
+    visible_nodes_by_date = [
+        store.frame(visibility_key, d, lambda d=d: visible_by_date(G, d, enabled_kinds, tool_id))
+        for d in dates
+    ]
 latest_visible = visible_nodes_by_date[-1] if visible_nodes_by_date else set()
+counts = get_counts(graph_version).cube(enabled_kinds, tool_id)
 
 def display_label(nid: str) -> str:
     k = kind_of(nid)
     prefix = {"experience": "🏢 ", "project": "📁 ", "tool": "🧰 ", "outcome": "📊 ", "leadership": "🎯 ", "tag": "🏷️ "}.get(k, "")
-    return prefix + nodes[nid].label
+    return prefix + node_labels[nid]
 
-spot_ids = sorted(list(latest_visible), key=lambda x: (kind_of(x), nodes[x].label.lower()))
+spot_ids = sorted(list(latest_visible), key=lambda x: (kind_of(x), node_labels[x].lower()))
 spot_options = ["None"] + [display_label(nid) for nid in spot_ids]
 display_to_id = {display_label(nid): nid for nid in spot_ids}
 
-selected_display = st.sidebar.selectbox("Spotlight", spot_options, index=0)
-selected = None if selected_display == "(none)" else display_to_id.get(selected_display)
+connect_ids = sorted(
+    [nid for nid in nodes if kind_of(nid) in enabled_kinds],
+    key=lambda x: (kind_of(x), node_labels[x].lower()),
+)
+connect_options = ["None"] + [display_label(nid) for nid in connect_ids]
+
+with st.sidebar:
+    st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
+    st.subheader("Connections")
+    connect_from = st.selectbox("From", connect_options, index=0)
+    connect_to = st.selectbox("To", connect_options, index=0)
+    route_count = st.slider("Routes", 1, MAX_ROUTES, 1)
+    strong_links = st.toggle("Prefer strong links", value=False)
+
+connect_ids_by_label = {display_label(nid): nid for nid in connect_ids}
+routes = []
+if connect_from in connect_ids_by_label and connect_to in connect_ids_by_label:
+    routes = get_path_index(graph_version).paths(
+        connect_ids_by_label[connect_from], connect_ids_by_label[connect_to],
+        k=route_count, weighted=strong_links, enabled_kinds=enabled_kinds,
+    )
+route_nodes = [list(r.nodes) for r in routes]
+
+with st.sidebar:
+    st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
+    st.subheader("Metrics")
+    metric_query = st.text_input("Find metrics", placeholder="e.g. latency < 50 ms", key="metric_query")
+
+# typed (quantity, unit, value) facts parsed from metric text; matches are ringed in the graph
+measures: list[Measure] = []
+if metric_query.strip():
+    try:
+        measures = get_quantities(graph_version).query(metric_query)
+        st.sidebar.caption(f"{len({m.node for m in measures})} matching nodes")
+    except ValueError as e:
+        st.sidebar.caption(str(e))
 
 with st.sidebar:
     st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
     st.subheader("Spacing")
-    layer_gap = st.slider("Column spacing", 1.2, 3.6, 2.2, 0.1)
-    y_spread = st.slider("Vertical spacing", 1.6, 6.0, 3.2, 0.1)
+    layout = st.selectbox("Layout", ["Columns", "Force-directed"], index=0)
+    # the layout is drawn at the reference spacing; sliders only zoom out from it (spacing_ranges)
+    layer_gap = st.slider("Column spacing", 1.2, LAYOUT_GAP, LAYOUT_GAP, 0.1)
+    y_spread = st.slider("Vertical spacing", 1.6, LAYOUT_SPREAD, LAYOUT_SPREAD, 0.1)
+
+# -------------------------
+# Explorer (graph + Details)
+# -------------------------
+# Everything above reruns only when a sidebar control changes. The Spotlight lives in
+# the Details card, inside the explorer fragment, so picking a node reruns just the
+# graph and Details panels; their inputs are passed explicitly as fragment arguments.
+
+SESSION_CACHE_SIZE = 4
 
-left, right = st.columns([0.72, 0.28], gap="large")
 
-with left:
+def session_cached(name: str, key, build):
+    # small per-session LRU: serialized figures (click-spotlight reruns reuse them as-is)
+    # and timeline frames already built for this view (zooming back is free)
+    cache = st.session_state.setdefault(name, {})
+    hit = key in cache
+    counter("app_cache_requests_total", "session cache lookups", cache=name, result="hit" if hit else "miss").inc()
+    if hit:
+        cache[key] = cache.pop(key)
+    else:
+        cache[key] = build()
+        while len(cache) > SESSION_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+    return cache[key]
+
+
+def graph_panel(
+    view_key: tuple,
+    dates: list[date],
+    date_labels: list[str] | None,
+    visible_nodes_by_date: list[set[str]],
+    enabled_kinds: set[str],
+    selected: str | None,
+    label_mode: str,
+    importance: str,
+    size_by_importance: bool,
+    layout: str,
+    layer_gap: float,
+    y_spread: float,
+    click_spotlight: bool,
+    route_nodes: list[list[str]],
+    counts: CountCube,
+    enabled_rels: set[str],
+    edge_weights: bool,
+    highlight: set[str],
+) -> str | None:
     card_open()
 
     layer_kinds = ["experience", "project", "tool", "outcome", "leadership", "tag"]
+    metric = {"Connections": "degree", "PageRank": "pagerank", "Betweenness": "betweenness"}[importance]
+    centrality = get_centrality(graph_version)
+    # the default view is drawn straight from the published arrays, through a graph of
+    # just the drawn layers built on a cache miss and not kept; every other view needs the store
+    from_arrays = shared_visible is not None and metric == "degree" and layout != "Force-directed"
+    drawn = {}
+
+    def draw_graph():
+        if "G" not in drawn:
+            drawn["G"] = shared_arrays.graph(enabled_kinds) if from_arrays else graph_store().G
+        return drawn["G"]
+
+    # the layout (and every frame built from it) is spacing-independent; the sliders
+    # only change the graph's axis ranges
+    if metric == "degree" and shared_visible is not None:
+        pos = shared_arrays.positions()
+    elif metric == "degree":
+        pos = graph_store().positions(layer_kinds, enabled_kinds, layer_gap=LAYOUT_GAP, y_spread=LAYOUT_SPREAD)
+    else:
+        pos = graph_store().positions(
+            layer_kinds, enabled_kinds, layer_gap=LAYOUT_GAP, y_spread=LAYOUT_SPREAD,
+            scores=centrality.scores(metric, enabled_kinds), scores_key=(metric, store_version),
+        )
+    frame_positions = None
+    if layout == "Force-directed":
+        frame_positions = graph_store().force_positions(enabled_kinds, visible_nodes_by_date, LAYOUT_GAP, LAYOUT_SPREAD)
+        pos = frame_positions[-1] if frame_positions else pos
+    axis_ranges = spacing_ranges(pos, layer_gap, y_spread)
+    node_scores = None
+    if size_by_importance:
+        node_scores = centrality.scores_by_stop(metric, enabled_kinds, visible_nodes_by_date)
+
+    graph_slot = st.empty()
+    chart_config = {"displaylogo": False}
+
+    def first_paint(static_fig):
+        apply_axis_ranges(static_fig, axis_ranges)
+        graph_slot.plotly_chart(static_fig, use_container_width=True, config=chart_config)
+
+    def figure_json(fig) -> str:
+        body = fig.to_json()
+        histogram("app_figure_bytes", "serialized figure size", buckets=SIZE_BUCKETS).observe(len(body))
+        return body
+
+    def build_figure(spotlight: str | None, on_first_paint=None, axis_ranges=None):
+        # frames are cached per relation layout, not per relation selection or route; a
+        # force layout settles over the whole stop sequence, so only there are the stops part of the key
+        frames_key = (
+            graph_version, store_version, view_key, label_mode, importance, size_by_importance, layout,
+            spotlight, edge_weights,
+        ) + ((tuple(dates),) if layout == "Force-directed" else ())
+        with histogram("app_figure_build_seconds", "plot_graph_timeline wall time per build, first paint included").time():
+            return plot_graph_timeline(
+                G=draw_graph(),
+                nodes=nodes,
+                dates=dates,
+                visible_nodes_by_date=visible_nodes_by_date,
+                enabled_kinds=enabled_kinds,
+                selected=spotlight,
+                title="",
+                layer_kinds=layer_kinds,
+                label_mode=label_mode,
+                frame_ms=1000,
+                pos=pos,
+                node_scores=node_scores,
+                on_first_paint=on_first_paint,
+                compact=True,
+                date_labels=date_labels,
+                frame_cache=session_cached("timeline_frames", frames_key, dict),
+                paths=route_nodes,
+                axis_ranges=axis_ranges,
+                frame_positions=frame_positions,
+                counts=counts,
+                enabled_rels=enabled_rels,
+                edge_weights=edge_weights,
+            )
+
+    if click_spotlight:
+        fig_key = (
+            graph_version, store_version, view_key, tuple(dates), label_mode, importance, size_by_importance, layout,
+            tuple(tuple(r) for r in route_nodes), tuple(sorted(enabled_rels)), edge_weights,
+        )
+        fig_json = session_cached("figure_json", fig_key, lambda: figure_json(build_figure(None, on_first_paint=first_paint)))
+        if from_arrays:
+            adjacency = shared_arrays.adjacency(pos)
+        else:
+            adjacency = adjacency_list(graph_store().G.subgraph(pos))
+        with graph_slot:
+            selected = graph_canvas(
+                fig_json,
+                adjacency=adjacency,
+                labels={nid: node_labels[nid] for nid in pos},
+                label_mode=label_mode,
+                config=chart_config,
+                axis_ranges=axis_ranges,
+                highlight=highlight,
+                placement=session_cached(
+                    "label_placement", (graph_version, store_version, view_key),
+                    lambda: label_placement(draw_graph().subgraph(pos)),
+                ),
+                selected=st.session_state.get("graph_canvas"),
+                key="graph_canvas",
+            )
+    else:
+        fig = build_figure(selected, on_first_paint=first_paint, axis_ranges=axis_ranges)
+        if highlight:
+            apply_highlight(fig, highlight)
+        graph_slot.plotly_chart(fig, use_container_width=True, config=chart_config)
+
+    card_close()
+    return selected
+
+
+def measures_panel(measures: list[Measure]) -> None:
+    if not measures:
+        return
+    st.markdown("**Metric matches:**")
+    for m in measures:
+        st.write(f"{display_label(m.node)} — {m.text}")
+
+
+def routes_panel(route_nodes: list[list[str]]) -> None:
+    if not route_nodes:
+        return
+    st.markdown("**Connection:**")
+    for r in route_nodes:
+        st.write(" → ".join(node_labels[nid] for nid in r))
+
+
+def details_panel(selected: str | None, enabled_kinds: set[str]) -> None:
+    if selected is None or selected not in nodes:
+        st.write("Select a node to see its description and connections.")
+        return
+
+    store = graph_store()
+    info = store.neighborhood(selected)
+    st.markdown(f"### {info.get('label','')}")
+    if info.get("subtitle"):
+        st.caption(info["subtitle"])
+    if info.get("metric"):
+        st.markdown(f"**Evidence / metrics:** {info['metric']}")
+
+    st.markdown("**Connected to:**")
+    for nb_id, nb_label, rel, nb_kind in info.get("neighbors", []):
+        nk = norm_kind(nb_kind)
+        if nk in enabled_kinds:
+            st.write(f"- **{nb_label}** ({nk}) — _{rel}_")
+
+    related = [(nid, score) for nid, score in get_related(graph_version).related(selected) if kind_of(nid) in enabled_kinds]
+    if related:
+        st.markdown("**Related:**")
+        mine = set(store.G.neighbors(selected))
+        for nid, score in related:
+            shared = sorted(node_labels[s] for s in mine & set(store.G.neighbors(nid)))
+            st.write(f"- **{node_labels[nid]}** ({kind_of(nid)}) — {score:.0%} overlap: _{', '.join(shared)}_")
+
+
+def multiples_panel(
+    view_key: tuple,
+    dates: list[date],
+    date_labels: list[str] | None,
+    visible_nodes_by_date: list[set[str]],
+    enabled_kinds: set[str],
+) -> None:
+    # one mini timeline per visible project, on one shared slider
+    latest = visible_nodes_by_date[-1] if visible_nodes_by_date else set()
+    projects = sorted((nid for nid in project_ids if nid in latest), key=lambda nid: node_labels[nid].lower())
+    card_open()
+    if not projects:
+        st.write("No projects are visible with the current filters.")
+    else:
+        fig_key = (graph_version, store_version, view_key, tuple(dates), tuple(projects))
+        fig = session_cached("multiples_figure", fig_key, lambda: plot_small_multiples(
+            shared_arrays.graph(enabled_kinds) if shared_visible is not None else graph_store().G,
+            projects, dates, visible_nodes_by_date, enabled_kinds, date_labels=date_labels,
+        ))
+        st.plotly_chart(fig, use_container_width=True, config={"displaylogo": False})
+    card_close()
 
-    fig = plot_graph_timeline(
-        G=G,
-        nodes=nodes,
+
+@st.fragment
+def explorer(
+    view_key: tuple,
+    dates: list[date],
+    date_labels: list[str] | None,
+    visible_nodes_by_date: list[set[str]],
+    enabled_kinds: set[str],
+    spot_options: list[str],
+    display_to_id: dict[str, str],
+    label_mode: str,
+    importance: str,
+    size_by_importance: bool,
+    layout: str,
+    layer_gap: float,
+    y_spread: float,
+    click_spotlight: bool,
+    route_nodes: list[list[str]],
+    counts: CountCube,
+    enabled_rels: set[str],
+    edge_weights: bool,
+    measures: list[Measure],
+) -> None:
+    started = time.perf_counter()
+    left, right = st.columns([0.72, 0.28], gap="large")
+
+    selected = None
+    if not click_spotlight:
+        with right:
+            card_open()
+            st.subheader("Details")
+            selected_display = st.selectbox("Spotlight", spot_options, index=0, key="spotlight")
+            selected = None if selected_display == "(none)" else display_to_id.get(selected_display)
+            details_panel(selected, enabled_kinds)
+            routes_panel(route_nodes)
+            measures_panel(measures)
+            card_close()
+
+    with left:
+        selected = graph_panel(
+            view_key, dates, date_labels, visible_nodes_by_date, enabled_kinds, selected,
+            label_mode, importance, size_by_importance, layout, layer_gap, y_spread, click_spotlight, route_nodes,
+            counts, enabled_rels, edge_weights, {m.node for m in measures},
+        )
+
+    if click_spotlight:
+        with right:
+            card_open()
+            st.subheader("Details")
+            details_panel(selected, enabled_kinds)
+            routes_panel(route_nodes)
+            measures_panel(measures)
+            card_close()
+    # runs alone on Spotlight clicks, as part of the script run otherwise
+    histogram("app_rerun_seconds", "script / explorer fragment run time", scope="explorer").observe(time.perf_counter() - started)
+
+
+if small_multiples:
+    multiples_panel(visibility_key, dates, date_labels, visible_nodes_by_date, enabled_kinds)
+else:
+    explorer(
+        view_key=visibility_key,
         dates=dates,
+        date_labels=date_labels,
         visible_nodes_by_date=visible_nodes_by_date,
         enabled_kinds=enabled_kinds,
-        selected=selected,
-        title="",
-        layer_kinds=layer_kinds,
+        spot_options=spot_options,
+        display_to_id=display_to_id,
+        label_mode=label_mode,
+        importance=importance,
+        size_by_importance=size_by_importance,
+        layout=layout,
         layer_gap=layer_gap,
         y_spread=y_spread,
-        label_mode=label_mode,
-        frame_ms=1000,
+        click_spotlight=click_spotlight,
+        route_nodes=route_nodes,
+        counts=counts,
+        enabled_rels=enabled_rels,
+        edge_weights=edge_weights,
+        measures=measures,
     )
-    st.plotly_chart(fig, use_container_width=True, config={"displaylogo": False})
-
-    card_close()
 
-with right:
-    card_open()
-    st.subheader("Details")
-
-    if selected is None or selected not in G:
-        st.write("Select a node to see its description and connections.")
-    else:
-        info = describe_node(G, selected)
-        st.markdown(f"### {info.get('label','')}")
-        if info.get("subtitle"):
-            st.caption(info["subtitle"])
-        if info.get("metric"):
-            st.markdown(f"**Evidence / metrics:** {info['metric']}")
-
-        st.markdown("**Connected to:**")
-        for nb_id, nb_label, rel, nb_kind in info.get("neighbors", []):
-            nk = norm_kind(nb_kind)
-            if nk in enabled_kinds:
-                st.write(f"- **{nb_label}** ({nk}) — _{rel}_")
-
-    card_close()
+histogram("app_rerun_seconds", "script / explorer fragment run time", scope="script").observe(time.perf_counter() - RERUN_STARTED)
@@ -0,0 +1,295 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from threading import RLock
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Set, Tuple
+import numpy as np
+
+from graph_store import ChangeSet, GraphStore
+
+if TYPE_CHECKING:
+    from shared import GraphArrays
+
+
+# Centrality scores over the live graph, computed with vectorized sparse operations on
+# COO edge arrays instead of networkx's pure-Python algorithms. Everything is cached per
+# graph version; per-timeline-stop PageRank warm-starts from the previous stop. Over a
+# published shared-memory version the COO / CSR arrays are sliced from its CSR segment.
+
+EXACT_BETWEENNESS_MAX_NODES = 400
+BETWEENNESS_SAMPLES = 64
+
+
+@dataclass(frozen=True)
+class SparseGraph:
+    ids: List[str]
+    index: Dict[str, int]
+    src: np.ndarray      # both directions of every undirected edge
+    dst: np.ndarray
+    weight: np.ndarray
+    indptr: np.ndarray   # CSR view (sorted by src) for traversals
+    indices: np.ndarray
+    csr_weight: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return len(self.ids)
+
+    def mask(self, nids) -> np.ndarray:
+        m = np.zeros(self.n, dtype=bool)
+        idx = [self.index[nid] for nid in nids if nid in self.index]
+        m[idx] = True
+        return m
+
+    def to_dict(self, values: np.ndarray, mask: Optional[np.ndarray] = None) -> Dict[str, float]:
+        if mask is None:
+            return {nid: float(v) for nid, v in zip(self.ids, values)}
+        return {self.ids[i]: float(values[i]) for i in np.flatnonzero(mask)}
+
+
+def sparse_graph(store: GraphStore, enabled_kinds: Optional[Set[str]] = None) -> SparseGraph:
+    G = store.G
+    if enabled_kinds is None:
+        ids = list(G.nodes())
+    else:
+        ids = [nid for nid, data in G.nodes(data=True) if data.get("kind") in enabled_kinds]
+    index = {nid: i for i, nid in enumerate(ids)}
+
+    us, vs, ws = [], [], []
+    for u, v, w in G.edges(data="weight", default=1.0):
+        iu, iv = index.get(u), index.get(v)
+        if iu is None or iv is None:
+            continue
+        us.append(iu)
+        vs.append(iv)
+        ws.append(w)
+
+    u = np.asarray(us, dtype=np.int64)
+    v = np.asarray(vs, dtype=np.int64)
+    w = np.asarray(ws, dtype=np.float64)
+    src = np.concatenate([u, v])
+    dst = np.concatenate([v, u])
+    weight = np.concatenate([w, w])
+
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(ids)), out=indptr[1:])
+    return SparseGraph(
+        ids=ids, index=index, src=src, dst=dst, weight=weight,
+        indptr=indptr, indices=dst[order], csr_weight=weight[order],
+    )
+
+
+def weighted_degree(g: SparseGraph, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    if mask is None:
+        return np.bincount(g.src, weights=g.weight, minlength=g.n)
+    keep = mask[g.src] & mask[g.dst]
+    return np.bincount(g.src[keep], weights=g.weight[keep], minlength=g.n)
+
+
+def pagerank(
+    g: SparseGraph,
+    mask: Optional[np.ndarray] = None,
+    alpha: float = 0.85,
+    tol: float = 1e-8,
+    max_iter: int = 100,
+    x0: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    if mask is None:
+        mask = np.ones(g.n, dtype=bool)
+    n_active = int(mask.sum())
+    r = np.zeros(g.n)
+    if n_active == 0:
+        return r
+
+    keep = mask[g.src] & mask[g.dst]
+    src, dst, w = g.src[keep], g.dst[keep], g.weight[keep]
+    strength = np.bincount(src, weights=w, minlength=g.n)
+    dangling = mask & (strength == 0)
+    share = np.divide(w, strength[src], out=np.zeros_like(w), where=strength[src] > 0)
+
+    if x0 is not None:
+        r[mask] = x0[mask]
+    total = r.sum()
+    if total <= 0:
+        r[mask] = 1.0 / n_active
+    else:
+        # nodes new to this stop start from the uniform share, then renormalize
+        r[mask & (r == 0)] = 1.0 / n_active
+        r /= r.sum()
+
+    teleport = (1.0 - alpha) / n_active
+    for _ in range(max_iter):
+        nxt = np.bincount(dst, weights=share * r[src], minlength=g.n)
+        nxt = alpha * (nxt + r[dangling].sum() / n_active) + teleport
+        nxt[~mask] = 0.0
+        err = np.abs(nxt - r).sum()
+        r = nxt
+        if err < n_active * tol:
+            break
+    return r
+
+
+def _expand(g: SparseGraph, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    starts = g.indptr[frontier]
+    counts = g.indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    nbrs = g.indices[np.arange(total) + offsets]
+    return np.repeat(frontier, counts), nbrs
+
+
+def _brandes_from(g: SparseGraph, s: int, mask: np.ndarray) -> np.ndarray:
+    # level-synchronous BFS + dependency accumulation (unweighted shortest paths)
+    dist = np.full(g.n, -1, dtype=np.int64)
+    sigma = np.zeros(g.n)
+    dist[s] = 0
+    sigma[s] = 1.0
+    frontier = np.array([s], dtype=np.int64)
+    levels: List[Tuple[np.ndarray, np.ndarray]] = []
+    depth = 0
+    while frontier.size:
+        parents, nbrs = _expand(g, frontier)
+        ok = mask[nbrs]
+        parents, nbrs = parents[ok], nbrs[ok]
+        fresh = nbrs[dist[nbrs] == -1]
+        dist[fresh] = depth + 1
+        on_path = dist[nbrs] == depth + 1
+        parents, nbrs = parents[on_path], nbrs[on_path]
+        sigma += np.bincount(nbrs, weights=sigma[parents], minlength=g.n)
+        levels.append((parents, nbrs))
+        frontier = np.unique(fresh)
+        depth += 1
+
+    delta = np.zeros(g.n)
+    for parents, nbrs in reversed(levels):
+        if parents.size:
+            contrib = sigma[parents] / sigma[nbrs] * (1.0 + delta[nbrs])
+            delta += np.bincount(parents, weights=contrib, minlength=g.n)
+    delta[s] = 0.0
+    return delta
+
+
+def betweenness(
+    g: SparseGraph,
+    mask: Optional[np.ndarray] = None,
+    samples: Optional[int] = None,
+    seed: int = 0,
+) -> np.ndarray:
+    if mask is None:
+        mask = np.ones(g.n, dtype=bool)
+    active = np.flatnonzero(mask)
+    bc = np.zeros(g.n)
+    if active.size < 3:
+        return bc
+
+    if samples is None:
+        samples = active.size if active.size <= EXACT_BETWEENNESS_MAX_NODES else BETWEENNESS_SAMPLES
+    if samples >= active.size:
+        sources = active
+    else:
+        sources = np.random.default_rng(seed).choice(active, size=samples, replace=False)
+
+    for s in sources:
+        bc += _brandes_from(g, int(s), mask)
+
+    # undirected pairs are counted twice; scale sampled estimates to all sources
+    bc *= active.size / len(sources) / 2.0
+    n = active.size
+    bc /= (n - 1) * (n - 2) / 2.0
+    return bc
+
+
+METRICS = ("degree", "pagerank", "betweenness")
+
+
+class CentralityEngine:
+    def __init__(self, store: Optional[GraphStore], arrays: Optional["GraphArrays"] = None):
+        self.store = store
+        self.arrays = arrays
+        self._lock = RLock()
+        self._version = store.version if store is not None else arrays.version
+        self._graphs: Dict[Hashable, SparseGraph] = {}
+        self._scores: Dict[Hashable, Dict[str, float]] = {}
+        self._stops: Dict[Hashable, List[Dict[str, float]]] = {}
+        if store is not None:
+            store.subscribe(self._on_change)
+
+    @classmethod
+    def from_arrays(cls, arrays: "GraphArrays") -> "CentralityEngine":
+        # a published version never changes, so there is nothing to follow
+        return cls(None, arrays)
+
+    def _on_change(self, changes: ChangeSet) -> None:
+        # centrality is global: any structural change shifts every score
+        with self._lock:
+            self._graphs.clear()
+            self._scores.clear()
+            self._stops.clear()
+            self._version = changes.version
+
+    @staticmethod
+    def _key(enabled_kinds: Optional[Set[str]]):
+        return frozenset(enabled_kinds) if enabled_kinds is not None else None
+
+    def graph(self, enabled_kinds: Optional[Set[str]] = None) -> SparseGraph:
+        key = self._key(enabled_kinds)
+        with self._lock:
+            g = self._graphs.get(key)
+            if g is None:
+                if self.arrays is not None:
+                    g = self.arrays.sparse_graph(enabled_kinds)
+                else:
+                    g = sparse_graph(self.store, enabled_kinds)
+                self._graphs[key] = g
+            return g
+
+    def scores(self, metric: str, enabled_kinds: Optional[Set[str]] = None) -> Dict[str, float]:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown centrality metric: {metric!r}")
+        key = (metric, self._key(enabled_kinds))
+        with self._lock:
+            cached = self._scores.get(key)
+            if cached is None:
+                g = self.graph(enabled_kinds)
+                if metric == "degree":
+                    values = weighted_degree(g)
+                elif metric == "pagerank":
+                    values = pagerank(g)
+                else:
+                    values = betweenness(g)
+                cached = g.to_dict(values)
+                self._scores[key] = cached
+            return cached
+
+    def scores_by_stop(
+        self,
+        metric: str,
+        enabled_kinds: Optional[Set[str]],
+        visible_nodes_by_date: List[Set[str]],
+    ) -> List[Dict[str, float]]:
+        stops_key = (metric, self._key(enabled_kinds), tuple(frozenset(v) for v in visible_nodes_by_date))
+        with self._lock:
+            cached = self._stops.get(stops_key)
+            if cached is not None:
+                return cached
+
+            if metric == "betweenness":
+                # too costly per stop; the full-graph estimate is reused for every frame
+                full = self.scores(metric, enabled_kinds)
+                cached = [{nid: full.get(nid, 0.0) for nid in visible} for visible in visible_nodes_by_date]
+            else:
+                g = self.graph(enabled_kinds)
+                cached = []
+                prev: Optional[np.ndarray] = None
+                for visible in visible_nodes_by_date:
+                    mask = g.mask(visible)
+                    if metric == "degree":
+                        values = weighted_degree(g, mask)
+                    else:
+                        values = pagerank(g, mask, x0=prev)
+                        prev = values
+                    cached.append(g.to_dict(values, mask))
+            self._stops[stops_key] = cached
+            return cached
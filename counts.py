@@ -0,0 +1,115 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date
+from threading import RLock
+from typing import TYPE_CHECKING, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+import networkx as nx
+import numpy as np
+
+from graph_store import ChangeSet, GraphStore
+from timeline import appearance_dates
+
+if TYPE_CHECKING:
+    from shared import GraphArrays
+
+
+# Per-date count cube for the KPI tiles and sparklines. Every node has a first-visible
+# date (timeline.appearance_dates) and every edge appears once both ends are visible,
+# so visible counts by kind / relation are cumulative sums over those dates, built in
+# one bincount + cumsum. Reading any list of timeline stops is a searchsorted. Over a
+# published shared-memory version the cubes come from its arrays (shared.py) instead.
+
+
+@dataclass(frozen=True)
+class CountCube:
+    days: np.ndarray        # sorted distinct appearance days (ordinals)
+    kinds: Tuple[str, ...]
+    rels: Tuple[str, ...]
+    nodes: np.ndarray       # (len(days) + 1, len(kinds)) visible nodes; row 0 = before the first day
+    edges: np.ndarray       # (len(days) + 1, len(rels)) visible edges
+
+    def _rows(self, dates: List[date]) -> np.ndarray:
+        ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+        return np.searchsorted(self.days, ordinals, side="right")
+
+    def nodes_at(self, dates: List[date]) -> np.ndarray:
+        return self.nodes[self._rows(dates)]
+
+    def edges_at(self, dates: List[date]) -> np.ndarray:
+        return self.edges[self._rows(dates)]
+
+    def kind_at(self, kind: str, dates: List[date]) -> np.ndarray:
+        if kind not in self.kinds:
+            return np.zeros(len(dates), dtype=np.int64)
+        return self.nodes_at(dates)[:, self.kinds.index(kind)]
+
+
+def _cumulative(days: np.ndarray, rows: np.ndarray, cols: np.ndarray, n_cols: int) -> np.ndarray:
+    counts = np.bincount(rows * n_cols + cols, minlength=len(days) * n_cols).reshape(len(days), n_cols)
+    out = np.zeros((len(days) + 1, n_cols), dtype=np.int64)
+    np.cumsum(counts, axis=0, out=out[1:])
+    return out
+
+
+def count_cube(G: nx.Graph, first: Dict[str, date], enabled_kinds: Set[str]) -> CountCube:
+    ids = [nid for nid in first if G.nodes[nid].get("kind") in enabled_kinds]
+    day = {nid: first[nid].toordinal() for nid in ids}
+    node_day = np.fromiter((day[nid] for nid in ids), dtype=np.int64, count=len(ids))
+    edge_day, edge_rel = [], []
+    for u, v, rel in G.edges(data="rel", default=""):
+        if u in day and v in day:
+            edge_day.append(max(day[u], day[v]))
+            edge_rel.append(rel)
+    return cube_from_days(node_day, [G.nodes[nid].get("kind") for nid in ids], np.asarray(edge_day, dtype=np.int64), edge_rel)
+
+
+def cube_from_days(node_day: np.ndarray, node_kinds: List[str], edge_day: np.ndarray, edge_rels: List[str]) -> CountCube:
+    # visible nodes (first day, kind) and edges (day both ends are visible, relation)
+    kinds = tuple(sorted(set(node_kinds)))
+    kind_index = {k: i for i, k in enumerate(kinds)}
+    node_kind = np.array([kind_index[k] for k in node_kinds], dtype=np.int64)
+    rels = tuple(sorted(set(edge_rels)))
+    rel_index = {r: i for i, r in enumerate(rels)}
+    edge_col = np.array([rel_index[r] for r in edge_rels], dtype=np.int64)
+
+    days = np.unique(np.concatenate([node_day, edge_day]))
+    return CountCube(
+        days=days,
+        kinds=kinds,
+        rels=rels,
+        nodes=_cumulative(days, np.searchsorted(days, node_day), node_kind, len(kinds)),
+        edges=_cumulative(days, np.searchsorted(days, edge_day), edge_col, len(rels)),
+    )
+
+
+class CountIndex:
+    def __init__(self, store: Optional[GraphStore], arrays: Optional["GraphArrays"] = None):
+        self.store = store
+        self.arrays = arrays
+        self._lock = RLock()
+        self._cubes: Dict[Hashable, CountCube] = {}
+        if store is not None:
+            store.subscribe(self._on_change)
+
+    @classmethod
+    def from_arrays(cls, arrays: "GraphArrays") -> "CountIndex":
+        # a published version never changes, so there is nothing to follow
+        return cls(None, arrays)
+
+    def _on_change(self, changes: ChangeSet) -> None:
+        # a new start date or edge shifts every later count
+        with self._lock:
+            self._cubes.clear()
+
+    def cube(self, enabled_kinds: Set[str], tool_id: Optional[str] = None) -> CountCube:
+        key: Tuple[FrozenSet[str], Optional[str]] = (frozenset(enabled_kinds), tool_id)
+        with self._lock:
+            cube = self._cubes.get(key)
+            if cube is None:
+                if self.arrays is not None:
+                    cube = self.arrays.count_cube(enabled_kinds, tool_id)
+                else:
+                    G = self.store.G
+                    cube = count_cube(G, appearance_dates(G, enabled_kinds, tool_id), enabled_kinds)
+                self._cubes[key] = cube
+            return cube
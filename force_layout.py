@@ -0,0 +1,192 @@
+from __future__ import annotations
+from typing import List, Optional, Tuple
+import numpy as np
+
+
+# Force-directed (Fruchterman-Reingold) layout with Barnes-Hut repulsion, in NumPy.
+# The quadtree is built level by level from quantized coordinates, and the tree walk is
+# vectorized over (node, cell) pairs: a pair is accepted when the cell looks small from
+# the node (size / distance < theta), otherwise it is replaced by the cell's children.
+# Each call runs a fixed iteration budget; timeline stops warm-start from the previous
+# stop so only new nodes move much.
+
+THETA = 0.8
+ITERATIONS = 80           # cold start
+WARM_ITERATIONS = 30      # per timeline stop after the first
+SETTLED_MOBILITY = 0.1    # step cap for already-placed nodes, relative to newcomers
+MAX_DEPTH = 12
+GRAVITY = 0.05            # pull toward the origin so components don't drift apart
+
+
+def _quadtree(p: np.ndarray, depth: int):
+    lo = p.min(axis=0)
+    span = float((p.max(axis=0) - lo).max()) or 1.0
+    side = 1 << depth
+    q = np.minimum(((p - lo) / span * side).astype(np.int64), side - 1)
+
+    levels = []
+    for level in range(depth + 1):
+        shift = depth - level
+        keys, inv = np.unique((q[:, 0] >> shift) * (1 << level) + (q[:, 1] >> shift), return_inverse=True)
+        mass = np.bincount(inv, minlength=len(keys)).astype(np.float64)
+        com = np.stack([np.bincount(inv, p[:, 0]), np.bincount(inv, p[:, 1])], axis=1) / mass[:, None]
+        levels.append((keys, inv, mass, com, span / (1 << level)))
+
+    # children of each cell, as CSR over the next level's cell indices
+    children = []
+    for level in range(depth):
+        child_keys = levels[level + 1][0]
+        child_side = 1 << (level + 1)
+        parent_keys = ((child_keys // child_side) >> 1) * (1 << level) + ((child_keys % child_side) >> 1)
+        parent = np.searchsorted(levels[level][0], parent_keys)
+        indptr = np.zeros(len(levels[level][0]) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parent, minlength=len(levels[level][0])), out=indptr[1:])
+        children.append((indptr, np.argsort(parent, kind="stable")))
+    return levels, children
+
+
+def _repulsion(p: np.ndarray, k2: float, theta: float) -> np.ndarray:
+    n = len(p)
+    depth = int(min(MAX_DEPTH, max(2, np.ceil(np.log(max(n, 2)) / np.log(4)) + 2)))
+    levels, children = _quadtree(p, depth)
+
+    force = np.zeros((n, 2))
+    nodes = np.arange(n)
+    cells = np.zeros(n, dtype=np.int64)
+    for level in range(depth + 1):
+        _, inv, mass, com, size = levels[level]
+        own = inv[nodes] == cells
+        m = mass[cells] - own
+        # a node's own cell acts through the centroid of the *other* nodes in it
+        center = com[cells]
+        if own.any():
+            others = np.maximum(m[own], 1.0)[:, None]
+            center[own] = (com[cells[own]] * mass[cells[own]][:, None] - p[nodes[own]]) / others
+        d = p[nodes] - center
+        dist2 = np.maximum((d * d).sum(axis=1), 1e-9)
+
+        far = (size * size < theta * theta * dist2) & ~own
+        accept = far | (mass[cells] == 1) | (level == depth)
+        push = accept & (m > 0)
+        scale = k2 * m[push] / dist2[push]
+        force[:, 0] += np.bincount(nodes[push], weights=d[push, 0] * scale, minlength=n)
+        force[:, 1] += np.bincount(nodes[push], weights=d[push, 1] * scale, minlength=n)
+
+        descend = ~accept
+        if level == depth or not descend.any():
+            break
+        indptr, order = children[level]
+        parents, who = cells[descend], nodes[descend]
+        starts = indptr[parents]
+        counts = indptr[parents + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        cells = order[np.arange(int(counts.sum())) + offsets]
+        nodes = np.repeat(who, counts)
+    return force
+
+
+def barnes_hut_layout(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: Optional[np.ndarray] = None,
+    pos0: Optional[np.ndarray] = None,
+    iterations: int = ITERATIONS,
+    temperature: float = 0.2,
+    theta: float = THETA,
+    k: Optional[float] = None,
+    mobility: Optional[np.ndarray] = None,
+    seed: int = 0,
+) -> np.ndarray:
+    # src/dst: each undirected edge once; coordinates live in roughly [-1, 1]^2 and k is
+    # the ideal edge length (defaults to what n nodes need to fill that box); mobility
+    # scales each node's maximum step
+    rng = np.random.default_rng(seed)
+    p = rng.uniform(-1.0, 1.0, size=(n, 2)) if pos0 is None else np.array(pos0, dtype=np.float64)
+    if n < 2:
+        return p
+    if k is None:
+        k = 2.0 / np.sqrt(n)
+    w = np.ones(len(src)) if weight is None else np.asarray(weight, dtype=np.float64)
+
+    for it in range(iterations):
+        f = _repulsion(p, k * k, theta)
+        d = p[src] - p[dst]
+        dist = np.sqrt((d * d).sum(axis=1)) + 1e-9
+        pull = d * (dist * w / k)[:, None]
+        for axis in (0, 1):
+            f[:, axis] -= np.bincount(src, weights=pull[:, axis], minlength=n)
+            f[:, axis] += np.bincount(dst, weights=pull[:, axis], minlength=n)
+        f -= GRAVITY * p
+
+        step = np.sqrt((f * f).sum(axis=1)) + 1e-9
+        t = temperature * (1.0 - it / iterations)
+        if mobility is not None:
+            t = t * mobility
+        p += f * (np.minimum(step, t) / step)[:, None]
+    return p
+
+
+def layout_stops(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: Optional[np.ndarray],
+    stops: List[np.ndarray],
+    iterations: int = ITERATIONS,
+    warm_iterations: int = WARM_ITERATIONS,
+    seed: int = 0,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    # one layout per stop (boolean masks over the n nodes); returns (node indices, coords).
+    # The edge length is sized for the final, largest stop and kept fixed, so early
+    # stops don't shrink as nodes join.
+    rng = np.random.default_rng(seed)
+    k = 2.0 / np.sqrt(max(max((int(m.sum()) for m in stops), default=1), 1))
+    placed = np.full((n, 2), np.nan)
+    out: List[Tuple[np.ndarray, np.ndarray]] = []
+    first = True
+    prev_mask = None
+    for mask in stops:
+        idx = np.flatnonzero(mask)
+        if prev_mask is not None and np.array_equal(mask, prev_mask):
+            out.append((idx, placed[idx].copy()))
+            continue
+        prev_mask = mask
+        local = np.full(n, -1, dtype=np.int64)
+        local[idx] = np.arange(len(idx))
+        keep = mask[src] & mask[dst]
+        s, t = local[src[keep]], local[dst[keep]]
+        w = None if weight is None else weight[keep]
+
+        p0 = placed[idx]
+        new = np.isnan(p0[:, 0])
+        mobility = np.where(new, 1.0, SETTLED_MOBILITY)
+        if new.all():
+            p0 = None
+        elif new.any():
+            # newcomers start at the mean of their already-placed neighbors (or near the middle)
+            known = ~new
+            acc = np.zeros((len(idx), 2))
+            cnt = np.zeros(len(idx))
+            for a, b in ((s, t), (t, s)):
+                ok = new[a] & known[b]
+                np.add.at(acc, a[ok], p0[b[ok]])
+                np.add.at(cnt, a[ok], 1.0)
+            seedpos = np.where(cnt[:, None] > 0, acc / np.maximum(cnt, 1.0)[:, None], p0[known].mean(axis=0))
+            jitter = rng.normal(scale=0.5 / np.sqrt(len(idx)), size=(len(idx), 2))
+            p0[new] = seedpos[new] + jitter[new]
+
+        if len(idx):
+            cold = first or p0 is None
+            p = barnes_hut_layout(
+                len(idx), s, t, w, pos0=p0,
+                iterations=iterations if cold else warm_iterations,
+                temperature=0.2 if cold else 0.1,
+                k=k,
+                mobility=None if cold else mobility,
+                seed=seed,
+            )
+            placed[idx] = p
+            first = False
+        out.append((idx, placed[idx].copy()))
+    return out
@@ -0,0 +1,107 @@
+from __future__ import annotations
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple
+import networkx as nx
+import plotly
+import plotly.graph_objects as go
+import streamlit.components.v1 as components
+
+from graph_utils import KIND_STYLES
+from labels import CHAR_PX, GAP_PX, LINE_PX, PAD_PX, PLOT_HEIGHT_PX, PLOT_WIDTH_PX, GridIndex, label_priority
+
+
+# Bidirectional Streamlit component that draws the timeline figure and does Spotlight
+# highlighting in the browser (see components/graph_canvas/index.html). Only the id of
+# the clicked node travels back to the server.
+
+_SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "graph_canvas")
+_PLOTLY_JS = "plotly.min.js"
+
+
+def _frontend_dir() -> str:
+    # index.html plus the plotly.js bundled with the Python package (no CDN), assembled
+    # outside the source tree; Streamlit only serves real files under the component root
+    with open(os.path.join(_SOURCE_DIR, "index.html"), "rb") as f:
+        html = f.read()
+    tag = hashlib.sha1(html).hexdigest()[:12]
+    target = os.path.join(tempfile.gettempdir(), f"graph_canvas-{plotly.__version__}-{tag}")
+    os.makedirs(target, exist_ok=True)
+    plotly_js = os.path.join(os.path.dirname(plotly.__file__), "package_data", _PLOTLY_JS)
+    for name, source in (("index.html", os.path.join(_SOURCE_DIR, "index.html")), (_PLOTLY_JS, plotly_js)):
+        path = os.path.join(target, name)
+        if os.path.exists(path):
+            continue
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, path)
+    return target
+
+
+_graph_canvas = components.declare_component("graph_canvas", path=_frontend_dir())
+
+
+def adjacency_list(G: nx.Graph) -> Dict[str, List[str]]:
+    return {nid: sorted(G.neighbors(nid)) for nid in G.nodes()}
+
+
+def label_placement(H: nx.Graph) -> dict:
+    # what the browser needs to run labels.LabelPlacer itself when a click spotlights a
+    # node, so "smart" labels match the server: ranks follow label_priority (minus the
+    # spotlight term, which the browser adds) and marker sizes the KIND_STYLES ones
+    kinds = {nid: H.nodes[nid].get("kind", "") for nid in H}
+    labels = {nid: str(H.nodes[nid].get("label", nid)) for nid in H}
+    priority = label_priority(kinds, dict(H.degree()), labels)
+    ranked = sorted(H, key=lambda n: priority[n])
+    return {
+        "rank": {nid: i for i, nid in enumerate(ranked)},
+        "marker_px": {nid: KIND_STYLES.get(k, {"size": 14})["size"] for nid, k in kinds.items()},
+        "char_px": CHAR_PX,
+        "line_px": LINE_PX,
+        "gap_px": GAP_PX,
+        "pad_px": PAD_PX,
+        "plot_width_px": PLOT_WIDTH_PX,
+        "plot_height_px": PLOT_HEIGHT_PX,
+        "cell_px": GridIndex().cell_px,
+    }
+
+
+def graph_canvas(
+    figure: go.Figure | str,
+    adjacency: Dict[str, List[str]],
+    labels: Dict[str, str],
+    label_mode: str = "smart",
+    height: int = 450,
+    config: Optional[dict] = None,
+    axis_ranges: Optional[Tuple[List[float], List[float]]] = None,
+    highlight: Optional[List[str]] = None,
+    placement: Optional[dict] = None,
+    selected: Optional[str] = None,
+    key: Optional[str] = None,
+) -> Optional[str]:
+    # The figure must be built without a selection: highlighting happens client-side.
+    # Pass a cached JSON string to keep reruns from re-serializing the figure; identical
+    # args are deduplicated by Streamlit's message cache and do not re-plot. axis_ranges
+    # (spacing) is applied with a relayout, so changing it never re-sends the figure work;
+    # highlight (node ids to ring) is a restyle in the browser. selected is the node the
+    # server currently shows in Details; a remounted component picks it up again.
+    fig_json = figure if isinstance(figure, str) else figure.to_json()
+    return _graph_canvas(
+        figure=fig_json,
+        adjacency=adjacency,
+        labels=labels,
+        label_mode=label_mode,
+        height=height,
+        config=config or {},
+        axis_ranges=list(axis_ranges) if axis_ranges is not None else None,
+        highlight=sorted(highlight or []),
+        placement=placement or {},
+        selected=selected,
+        key=key,
+        default=None,
+    )
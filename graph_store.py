@@ -0,0 +1,304 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from threading import RLock
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+import networkx as nx
+
+from data import Node, Edge
+from graph_utils import (
+    build_nx_graph, node_attrs, norm_kind, _layer_order, _place_layers, describe_node, force_positions_by_stop,
+)
+
+
+# A live, versioned graph. Every mutation returns a ChangeSet describing exactly which
+# derived state went stale, so caches are dropped per layer / per date / per node
+# instead of rebuilding nodes, nx graph, positions and frames from scratch. Frame states
+# and force layouts are keyed by caller-supplied filters, so both are LRU-bounded.
+
+ALL_FRAMES = date.min
+FRAME_CACHE_SIZE = 4096
+FORCE_CACHE_SIZE = 8
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    version: int
+    nodes: FrozenSet[str] = frozenset()       # nodes added / updated / removed
+    endpoints: FrozenSet[str] = frozenset()   # nodes whose neighborhood changed
+    kinds: FrozenSet[str] = frozenset()       # layers whose ordering / positions are stale
+    frames_from: Optional[date] = None        # first frame date affected (None = no frames)
+
+    def merge(self, other: "ChangeSet") -> "ChangeSet":
+        if self.frames_from is None:
+            since = other.frames_from
+        elif other.frames_from is None:
+            since = self.frames_from
+        else:
+            since = min(self.frames_from, other.frames_from)
+        return ChangeSet(
+            version=max(self.version, other.version),
+            nodes=self.nodes | other.nodes,
+            endpoints=self.endpoints | other.endpoints,
+            kinds=self.kinds | other.kinds,
+            frames_from=since,
+        )
+
+
+def _edge_key(u: str, v: str) -> Tuple[str, str]:
+    return (u, v) if u <= v else (v, u)
+
+
+@dataclass
+class GraphStore:
+    nodes: Dict[str, Node]
+    edge_index: Dict[Tuple[str, str], Edge] = field(default_factory=dict)
+    version: int = 0
+
+    def __post_init__(self):
+        self._lock = RLock()
+        self.G: nx.Graph = build_nx_graph(self.nodes, list(self.edge_index.values()))
+        self._layer_cache: Dict[Tuple[str, Optional[FrozenSet[str]], Hashable], List[str]] = {}
+        self._frame_cache: "OrderedDict[Tuple[Hashable, date], object]" = OrderedDict()
+        self._neigh_cache: Dict[str, dict] = {}
+        self._force_cache: "OrderedDict[Hashable, List[Dict[str, Tuple[float, float]]]]" = OrderedDict()
+        self._listeners: List[Callable[[ChangeSet], None]] = []
+
+    @classmethod
+    def from_data(cls, nodes: Dict[str, Node], edges: List[Edge]) -> "GraphStore":
+        index: Dict[Tuple[str, str], Edge] = {}
+        for e in edges:
+            if e.source in nodes and e.target in nodes:
+                index[_edge_key(e.source, e.target)] = e
+        return cls(nodes=dict(nodes), edge_index=index)
+
+    @property
+    def edges(self) -> List[Edge]:
+        return list(self.edge_index.values())
+
+    def subscribe(self, listener: Callable[[ChangeSet], None]) -> None:
+        self._listeners.append(listener)
+
+    # --- mutations ---
+
+    def add_node(self, node: Node) -> ChangeSet:
+        with self._lock:
+            if node.id in self.nodes:
+                return self.update_node(node)
+            self.nodes[node.id] = node
+            self.G.add_node(node.id, **node_attrs(node))
+            return self._commit(
+                nodes={node.id},
+                kinds={norm_kind(node.kind)},
+                frames_from=self._node_since(node),
+            )
+
+    def update_node(self, node: Node) -> ChangeSet:
+        with self._lock:
+            old = self.nodes.get(node.id)
+            if old is None:
+                return self.add_node(node)
+            self.nodes[node.id] = node
+            self.G.add_node(node.id, **node_attrs(node))
+
+            kind_changed = norm_kind(old.kind) != norm_kind(node.kind)
+            since = None
+            if kind_changed or old.start != node.start:
+                since = self._min_date(self._node_since(old), self._node_since(node))
+
+            # layers sort by label; neighbors render this node's label in their Details entry
+            kinds: Set[str] = set()
+            neighbors: Set[str] = set()
+            if kind_changed or old.label != node.label:
+                kinds = {norm_kind(old.kind), norm_kind(node.kind)}
+                neighbors = set(self.G.neighbors(node.id))
+            if kind_changed:
+                # neighbors' layers count only neighbors of enabled kinds when ordering
+                kinds |= {self.G.nodes[nb].get("kind", "") for nb in neighbors}
+            return self._commit(nodes={node.id}, endpoints=neighbors, kinds=kinds, frames_from=since)
+
+    def remove_node(self, nid: str) -> ChangeSet:
+        with self._lock:
+            node = self.nodes.pop(nid, None)
+            if node is None:
+                return ChangeSet(version=self.version)
+            neighbors = set(self.G.neighbors(nid))
+            for nb in neighbors:
+                self.edge_index.pop(_edge_key(nid, nb), None)
+            self.G.remove_node(nid)
+            kinds = {norm_kind(node.kind)} | {self.G.nodes[nb].get("kind", "") for nb in neighbors}
+            return self._commit(
+                nodes={nid},
+                endpoints=neighbors,
+                kinds=kinds,
+                frames_from=self._node_since(node),
+            )
+
+    def add_edge(self, edge: Edge) -> ChangeSet:
+        with self._lock:
+            if edge.source not in self.nodes or edge.target not in self.nodes:
+                raise KeyError(f"Edge endpoint not in graph: {edge.source!r} -> {edge.target!r}")
+            self.edge_index[_edge_key(edge.source, edge.target)] = edge
+            self.G.add_edge(edge.source, edge.target, rel=edge.rel, weight=edge.weight)
+            return self._edge_changed(edge.source, edge.target)
+
+    def update_edge(self, edge: Edge) -> ChangeSet:
+        return self.add_edge(edge)
+
+    def remove_edge(self, source: str, target: str) -> ChangeSet:
+        with self._lock:
+            if self.edge_index.pop(_edge_key(source, target), None) is None:
+                return ChangeSet(version=self.version)
+            if self.G.has_edge(source, target):
+                self.G.remove_edge(source, target)
+            return self._edge_changed(source, target)
+
+    def _edge_changed(self, u: str, v: str) -> ChangeSet:
+        # an edge only shows once both endpoints are visible
+        since_u = self._node_since(self.nodes[u])
+        since_v = self._node_since(self.nodes[v])
+        return self._commit(
+            endpoints={u, v},
+            kinds={self.G.nodes[u].get("kind", ""), self.G.nodes[v].get("kind", "")},
+            frames_from=max(since_u, since_v),
+        )
+
+    def _commit(
+        self,
+        nodes: Set[str] = frozenset(),
+        endpoints: Set[str] = frozenset(),
+        kinds: Set[str] = frozenset(),
+        frames_from: Optional[date] = None,
+    ) -> ChangeSet:
+        self.version += 1
+        changes = ChangeSet(
+            version=self.version,
+            nodes=frozenset(nodes),
+            endpoints=frozenset(endpoints) | frozenset(nodes),
+            kinds=frozenset(kinds),
+            frames_from=frames_from,
+        )
+        self.invalidate(changes)
+        for listener in self._listeners:
+            listener(changes)
+        return changes
+
+    @staticmethod
+    def _node_since(node: Node) -> date:
+        # only projects and experiences appear on their start date; everything else (and
+        # an undated one) can show up in every frame, whatever start it carries
+        if node.start is None or norm_kind(node.kind) not in {"project", "experience"}:
+            return ALL_FRAMES
+        return node.start
+
+    @staticmethod
+    def _min_date(a: Optional[date], b: Optional[date]) -> Optional[date]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return min(a, b)
+
+    # --- derived state ---
+
+    def invalidate(self, changes: ChangeSet) -> None:
+        with self._lock:
+            # score-ordered layers (e.g. PageRank) depend on the whole graph
+            for key in [k for k in self._layer_cache if k[0] in changes.kinds or k[2] is not None]:
+                del self._layer_cache[key]
+
+            if changes.frames_from is not None:
+                for key in [k for k in self._frame_cache if k[1] >= changes.frames_from]:
+                    del self._frame_cache[key]
+
+            for nid in changes.endpoints:
+                self._neigh_cache.pop(nid, None)
+
+            # a force layout settles globally: any change moves everything
+            self._force_cache.clear()
+
+    def layer_order(
+        self,
+        kind: str,
+        enabled_kinds: Optional[Set[str]] = None,
+        scores: Optional[Dict[str, float]] = None,
+        scores_key: Hashable = None,
+    ) -> List[str]:
+        enabled = frozenset(enabled_kinds) if enabled_kinds is not None else None
+        key = (kind, enabled, scores_key if scores is not None else None)
+        with self._lock:
+            order = self._layer_cache.get(key)
+            if order is None:
+                G = self.G
+                layer_nodes = [nid for nid, data in G.nodes(data=True) if data.get("kind") == kind]
+                if scores is not None:
+                    def degree(n):
+                        return scores.get(n, 0.0)
+                elif enabled is None:
+                    degree = G.degree
+                else:
+                    def degree(n):
+                        return sum(1 for nb in G.neighbors(n) if G.nodes[nb].get("kind") in enabled)
+                order = _layer_order(G, layer_nodes, degree=degree)
+                self._layer_cache[key] = order
+            return order
+
+    def positions(
+        self,
+        layer_kinds: List[str],
+        enabled_kinds: Optional[Set[str]] = None,
+        layer_gap: float = 2.2,
+        y_spread: float = 3.2,
+        scores: Optional[Dict[str, float]] = None,
+        scores_key: Hashable = None,
+    ) -> Dict[str, Tuple[float, float]]:
+        layer_kinds = [norm_kind(k) for k in layer_kinds]
+        if enabled_kinds is not None:
+            enabled_kinds = {norm_kind(k) for k in enabled_kinds}
+            layer_kinds = [k for k in layer_kinds if k in enabled_kinds]
+        layers = [self.layer_order(k, enabled_kinds, scores, scores_key) for k in layer_kinds]
+        return _place_layers(layers, layer_gap=layer_gap, y_spread=y_spread)
+
+    def force_positions(
+        self,
+        enabled_kinds: Optional[Set[str]],
+        visible_nodes_by_date: List[Set[str]],
+        layer_gap: float = 2.2,
+        y_spread: float = 3.2,
+    ) -> List[Dict[str, Tuple[float, float]]]:
+        enabled = frozenset(norm_kind(k) for k in enabled_kinds) if enabled_kinds is not None else None
+        key = (enabled, tuple(frozenset(v) for v in visible_nodes_by_date), layer_gap, y_spread)
+        with self._lock:
+            cached = self._force_cache.get(key)
+            if cached is not None:
+                self._force_cache.move_to_end(key)
+                return cached
+            G = self.G
+            if enabled is not None:
+                G = G.subgraph([nid for nid, data in G.nodes(data=True) if data.get("kind") in enabled])
+            cached = force_positions_by_stop(G, visible_nodes_by_date, layer_gap=layer_gap, y_spread=y_spread)
+            self._force_cache[key] = cached
+            while len(self._force_cache) > FORCE_CACHE_SIZE:
+                self._force_cache.popitem(last=False)
+            return cached
+
+    def frame(self, key: Hashable, d: date, compute: Callable[[], object]):
+        with self._lock:
+            if (key, d) in self._frame_cache:
+                self._frame_cache.move_to_end((key, d))
+                return self._frame_cache[key, d]
+            state = self._frame_cache[key, d] = compute()
+            while len(self._frame_cache) > FRAME_CACHE_SIZE:
+                self._frame_cache.popitem(last=False)
+            return state
+
+    def neighborhood(self, nid: str) -> dict:
+        with self._lock:
+            info = self._neigh_cache.get(nid)
+            if info is None:
+                info = describe_node(self.G, nid)
+                # unknown ids (e.g. from an API path) are not cached
+                if nid in self.G:
+                    self._neigh_cache[nid] = info
+            return info
@@ -1,9 +1,20 @@
 from __future__ import annotations
-from typing import Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
 import networkx as nx
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from data import Node, Edge
+from force_layout import ITERATIONS, WARM_ITERATIONS, layout_stops
+from labels import LabelPlacer, label_priority
+from metrics import counter, histogram
+
+if TYPE_CHECKING:
+    from counts import CountCube
 
 
 KIND_STYLES = {
@@ -28,19 +39,57 @@ KIND_COLORS = {
 
 EDGE_COLOR = "rgba(148,163,184,0.78)"
 EDGE_WIDTH = 2.2
+# line widths for light / medium / heavy edges when edge width follows weight
+WEIGHT_WIDTHS = (1.2, 2.2, 3.6)
+
+# layouts are computed (and cached) once at this reference spacing; the spacing sliders
+# only rescale the graph axes around it (see spacing_ranges)
+LAYOUT_GAP = 2.2
+LAYOUT_SPREAD = 3.2
+
+PATH_COLOR = "rgba(251,191,36,0.88)"
+SPARK_COLOR = "rgba(148,163,184,0.55)"
+PATH_WIDTH = 4.0
+
+NODE_LINE_COLOR = "rgba(15,23,42,0.45)"
+NODE_LINE_WIDTH = 1.0
+# ring around nodes matched by a quantity query (see apply_highlight)
+HIGHLIGHT_COLOR = "rgba(244,114,182,0.98)"
+HIGHLIGHT_WIDTH = 3.5
+
+# compact mode: hovers render client-side from customdata columns (id, label, subtitle, metric)
+NODE_HOVERTEMPLATE = "<b>%{customdata[1]}</b>%{customdata[2]}<span style='color:#94a3b8'>%{customdata[3]}</span><extra></extra>"
+
+# per-stage build time of plot_graph_timeline and hit rates of its caches
+STAGE_SECONDS = {
+    stage: histogram("graph_figure_stage_seconds", "plot_graph_timeline time per stage", stage=stage)
+    for stage in ("prepare", "skeleton", "traces", "frames", "assemble")
+}
+CACHE_HITS = {
+    (cache, result): counter("graph_cache_requests_total", "graph_utils cache lookups", cache=cache, result=result)
+    for cache in ("figure_skeleton", "frame_state") for result in ("hit", "miss")
+}
+
+
+KIND_ALIASES = {
+    "projects": "project", "project": "project",
+    "tools": "tool", "tool": "tool", "tech": "tool", "technology": "tool", "technologies": "tool",
+    "outcome": "outcome", "outcomes": "outcome", "metric": "outcome", "metrics": "outcome", "result": "outcome", "results": "outcome",
+    "experience": "experience", "experiences": "experience", "work": "experience", "job": "experience",
+    "leadership": "leadership", "leaderships": "leadership",
+    "tag": "tag", "tags": "tag", "label": "tag", "labels": "tag",
+}
 
 
 def norm_kind(k: str) -> str:
     s = (k or "").strip().lower()
-    mapping = {
-        "projects": "project", "project": "project",
-        "tools": "tool", "tool": "tool", "tech": "tool", "technology": "tool", "technologies": "tool",
-        "outcome": "outcome", "outcomes": "outcome", "metric": "outcome", "metrics": "outcome", "result": "outcome", "results": "outcome",
-        "experience": "experience", "experiences": "experience", "work": "experience", "job": "experience",
-        "leadership": "leadership", "leaderships": "leadership",
-        "tag": "tag", "tags": "tag", "label": "tag", "labels": "tag",
-    }
-    return mapping.get(s, s)
+    return KIND_ALIASES.get(s, s)
+
+
+def node_attrs(n: Node) -> dict:
+    data = dict(n.__dict__)
+    data["kind"] = norm_kind(data.get("kind", ""))
+    return data
 
 
 def build_nx_graph(nodes: Dict[str, Node], edges: List[Edge], allowed_nodes: Optional[Set[str]] = None) -> nx.Graph:
@@ -48,9 +97,7 @@ def build_nx_graph(nodes: Dict[str, Node], edges: List[Edge], allowed_nodes: Opt
     for nid, n in nodes.items():
         if allowed_nodes is not None and nid not in allowed_nodes:
             continue
-        data = dict(n.__dict__)
-        data["kind"] = norm_kind(data.get("kind", ""))
-        G.add_node(nid, **data)
+        G.add_node(nid, **node_attrs(n))
 
     for e in edges:
         if allowed_nodes is not None and (e.source not in allowed_nodes or e.target not in allowed_nodes):
@@ -60,16 +107,22 @@ def build_nx_graph(nodes: Dict[str, Node], edges: List[Edge], allowed_nodes: Opt
     return G
 
 
-def _layered_positions(
-    G: nx.Graph,
-    layer_kinds: List[str],
+def _layer_order(G: nx.Graph, layer_nodes: List[str], degree=None) -> List[str]:
+    if degree is None:
+        degree = G.degree
+    return sorted(
+        layer_nodes,
+        key=lambda n: (degree(n), str(G.nodes[n].get("label", n)).lower()),
+        reverse=True
+    )
+
+
+def _place_layers(
+    layers: List[List[str]],
     layer_gap: float = 2.2,
     y_spread: float = 3.0,
 ) -> Dict[str, Tuple[float, float]]:
-    layers: List[List[str]] = []
-    for k in layer_kinds:
-        layers.append([nid for nid, data in G.nodes(data=True) if data.get("kind") == k])
-
+    # layers are expected to be already ordered (see _layer_order)
     pos: Dict[str, Tuple[float, float]] = {}
     L = len(layers)
     x0 = -((L - 1) * layer_gap) / 2.0
@@ -79,12 +132,6 @@ def _layered_positions(
         if not layer_nodes:
             continue
 
-        layer_nodes = sorted(
-            layer_nodes,
-            key=lambda n: (G.degree(n), str(G.nodes[n].get("label", n)).lower()),
-            reverse=True
-        )
-
         m = len(layer_nodes)
         ys = [0.0] if m == 1 else [y_spread - (2 * y_spread) * (j / (m - 1)) for j in range(m)]
 
@@ -95,12 +142,151 @@ def _layered_positions(
     return pos
 
 
-def compute_positions(G: nx.Graph, layer_kinds: List[str], layer_gap: float, y_spread: float) -> Dict[str, Tuple[float, float]]:
+def _layered_positions(
+    G: nx.Graph,
+    layer_kinds: List[str],
+    layer_gap: float = 2.2,
+    y_spread: float = 3.0,
+) -> Dict[str, Tuple[float, float]]:
+    layers: List[List[str]] = []
+    for k in layer_kinds:
+        layer_nodes = [nid for nid, data in G.nodes(data=True) if data.get("kind") == k]
+        layers.append(_layer_order(G, layer_nodes))
+
+    return _place_layers(layers, layer_gap=layer_gap, y_spread=y_spread)
+
+
+LAYOUTS = ("layered", "force")
+
+
+def _fit_box(coords: np.ndarray, ref: np.ndarray, layer_gap: float, y_spread: float) -> np.ndarray:
+    # map coordinates so `ref` spans the same box a layered layout would use
+    lo, hi = ref.min(axis=0), ref.max(axis=0)
+    mid, half = (lo + hi) / 2.0, np.maximum((hi - lo) / 2.0, 1e-9)
+    return (coords - mid) / half * np.array([layer_gap * 1.5, y_spread])
+
+
+def force_positions_by_stop(
+    G: nx.Graph,
+    visible_nodes_by_date: List[Set[str]],
+    layer_gap: float = 2.2,
+    y_spread: float = 3.2,
+    iterations: int = ITERATIONS,
+    warm_iterations: int = WARM_ITERATIONS,
+    seed: int = 0,
+) -> List[Dict[str, Tuple[float, float]]]:
+    # every stop gets a position for every node in G: not-yet-visible nodes sit where
+    # they will first appear, so the node traces never jump when they fade in
+    ids = list(G.nodes())
+    if not ids or not visible_nodes_by_date:
+        return [{} for _ in visible_nodes_by_date]
+    index = {nid: i for i, nid in enumerate(ids)}
+    edges = [(index[u], index[v], w) for u, v, w in G.edges(data="weight", default=1.0)]
+    src = np.array([e[0] for e in edges], dtype=np.int64)
+    dst = np.array([e[1] for e in edges], dtype=np.int64)
+    weight = np.array([e[2] for e in edges], dtype=np.float64)
+
+    stops = []
+    for visible in visible_nodes_by_date:
+        mask = np.zeros(len(ids), dtype=bool)
+        mask[[index[nid] for nid in visible if nid in index]] = True
+        stops.append(mask)
+    if not stops[-1].all():
+        stops.append(np.ones(len(ids), dtype=bool))  # settle never-visible nodes last
+    layouts = layout_stops(len(ids), src, dst, weight, stops, iterations, warm_iterations, seed)
+
+    frames = []
+    upcoming = np.zeros((len(ids), 2))
+    for idx, coords in reversed(layouts):
+        upcoming = upcoming.copy()
+        upcoming[idx] = coords
+        frames.append(upcoming)
+    frames = frames[::-1][:len(visible_nodes_by_date)]
+
+    out = []
+    for frame in frames:
+        xy = _fit_box(frame, frames[-1], layer_gap, y_spread)
+        out.append({nid: (float(xy[i, 0]), float(xy[i, 1])) for i, nid in enumerate(ids)})
+    return out
+
+
+def compute_positions(
+    G: nx.Graph,
+    layer_kinds: List[str],
+    layer_gap: float,
+    y_spread: float,
+    layout: str = "layered",
+) -> Dict[str, Tuple[float, float]]:
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout!r}")
     if G.number_of_nodes() == 0:
         return {}
+    if layout == "force":
+        return force_positions_by_stop(G, [set(G.nodes())], layer_gap=layer_gap, y_spread=y_spread)[-1]
     return _layered_positions(G, layer_kinds=layer_kinds, layer_gap=layer_gap, y_spread=y_spread)
 
 
+def spacing_ranges(
+    pos: Dict[str, Tuple[float, float]],
+    layer_gap: float = LAYOUT_GAP,
+    y_spread: float = LAYOUT_SPREAD,
+    pad: float = 0.08,
+) -> Tuple[List[float], List[float]]:
+    # axis ranges that make a reference-spacing layout look laid out at (layer_gap, y_spread):
+    # tighter spacing = a wider window onto the same coordinates. The window never gets
+    # narrower than the padded data bounds, so spacing past the reference cannot crop nodes.
+    if not pos:
+        return [-1.0, 1.0], [-1.0, 1.0]
+    xs = [p[0] for p in pos.values()]
+    ys = [p[1] for p in pos.values()]
+    cx, cy = (max(xs) + min(xs)) / 2.0, (max(ys) + min(ys)) / 2.0
+    hx = max((max(xs) - min(xs)) / 2.0, 0.5) * (1.0 + pad) * max(1.0, LAYOUT_GAP / layer_gap)
+    hy = max((max(ys) - min(ys)) / 2.0, 0.5) * (1.0 + pad) * max(1.0, LAYOUT_SPREAD / y_spread)
+    return [cx - hx, cx + hx], [cy - hy, cy + hy]
+
+
+@dataclass(frozen=True)
+class EdgePartitions:
+    # edges sorted by (relation, width): partition i is u[offsets[i]:offsets[i + 1]], so
+    # hiding a relation only drops its partitions
+    keys: Tuple[Tuple[str, float], ...]   # (rel, line width)
+    offsets: np.ndarray
+    u: np.ndarray                         # endpoint indices into the node order
+    v: np.ndarray
+
+    def select(self, rels: Optional[Set[str]]) -> List[int]:
+        return [i for i, (rel, _) in enumerate(self.keys) if rels is None or rel in rels]
+
+
+def edge_partitions(G: nx.Graph, index: Dict[str, int], by_weight: bool = False) -> EdgePartitions:
+    eu, ev, rel, weight = [], [], [], []
+    for a, b, data in G.edges(data=True):
+        if a in index and b in index:
+            eu.append(index[a])
+            ev.append(index[b])
+            rel.append(data.get("rel", ""))
+            weight.append(float(data.get("weight", 1.0)))
+    rels = sorted(set(rel))
+    code = np.array([rels.index(r) for r in rel], dtype=np.int64)
+    level = np.zeros(len(rel), dtype=np.int64)
+    if by_weight and weight:
+        w = np.asarray(weight)
+        level = np.clip((len(WEIGHT_WIDTHS) * w / (w.max() or 1.0)).astype(np.int64), 0, len(WEIGHT_WIDTHS) - 1)
+    order = np.lexsort((level, code))
+    code, level = code[order], level[order]
+
+    starts = np.flatnonzero(np.r_[True, (code[1:] != code[:-1]) | (level[1:] != level[:-1])]) if len(code) else code
+    keys = tuple(
+        (rels[code[i]], WEIGHT_WIDTHS[level[i]] if by_weight else EDGE_WIDTH)
+        for i in starts.tolist()
+    )
+    return EdgePartitions(
+        keys=keys,
+        offsets=np.r_[starts, len(code)].astype(np.int64),
+        u=np.asarray(eu, dtype=np.int64)[order],
+        v=np.asarray(ev, dtype=np.int64)[order],
+    )
+
 # --- KPI helpers: split label/value into separate traces (prevents overlap) ---
 
 def _kpi_label_html(text: str) -> str:
@@ -109,6 +295,249 @@ def _kpi_label_html(text: str) -> str:
 def _kpi_value_html(value: int | str) -> str:
     return f"<span style='font-size:34px'><b>{value}</b></span>"
 
+def _kpi_delta_html(value: int, delta: int) -> str:
+    if delta <= 0:
+        return _kpi_value_html(value)
+    return _kpi_value_html(f"{value} <span style='font-size:15px;opacity:.7'>+{delta}</span>")
+
+def _kpi_series(counts: "CountCube", dates: List) -> Dict[str, np.ndarray]:
+    # every tile value for every stop, read from the cube in one go
+    per_kind = counts.nodes_at(dates)
+    tools = counts.kind_at("tool", dates)
+    return {
+        "per_kind": per_kind,
+        "per_rel": counts.edges_at(dates),
+        "nodes": per_kind.sum(axis=1),
+        "tools": tools,
+        "new_tools": np.diff(tools, prepend=0),
+        "outcomes": counts.kind_at("outcome", dates),
+    }
+
+
+def _marker_size(base_size: float, nid: str, selected: Optional[str], neigh: Set[str]) -> float:
+    if selected == nid:
+        return base_size + 10
+    if selected is None:
+        return base_size
+    return base_size + 2 if nid in neigh else max(8, base_size - 3)
+
+
+def timeline_controls(dates: List, date_labels: List[str], frame_ms: int) -> dict:
+    # Play / Pause buttons and the stop slider, driving frames named by stop date
+    steps = []
+    for d, label in zip(dates, date_labels):
+        steps.append(dict(
+            method="animate",
+            args=[[d.isoformat()],
+                  {"frame": {"duration": frame_ms, "redraw": True},
+                   "transition": {"duration": int(frame_ms * 0.85), "easing": "cubic-in-out"}}],
+            label=label,
+        ))
+
+    return dict(
+        updatemenus=[dict(
+            type="buttons",
+            direction="left",
+            x=0.01,
+            y=-0.08,
+            xanchor="left",
+            yanchor="top",
+            showactive=False,
+            buttons=[
+                dict(label="▶ Play", method="animate",
+                     args=[None, {"fromcurrent": True,
+                                 "frame": {"duration": frame_ms, "redraw": True},
+                                 "transition": {"duration": int(frame_ms * 0.85)}}]),
+                dict(label="⏸ Pause", method="animate",
+                     args=[[None], {"mode": "immediate",
+                                   "frame": {"duration": 0, "redraw": True},
+                                   "transition": {"duration": 0}}]),
+            ],
+        )],
+        sliders=[dict(
+            active=max(0, len(steps) - 1),
+            x=0.01,
+            y=-0.14,
+            xanchor="left",
+            yanchor="top",
+            len=0.98,
+            pad={"t": 0, "b": 0},
+            currentvalue={"prefix": "Timeline: ", "font": {"color": "rgba(255,255,255,.78)"}},
+            steps=steps,
+        )],
+    )
+
+
+SKELETON_CACHE = 16
+_skeletons: "OrderedDict[tuple, dict]" = OrderedDict()
+_skeleton_lock = Lock()
+
+
+def _set_ranges(layout: dict, xaxis: str, yaxis: str, axis_ranges: Tuple[List[float], List[float]]) -> None:
+    # trace axis refs ("x4") name layout keys ("xaxis4")
+    for ref, rng in ((xaxis, axis_ranges[0]), (yaxis, axis_ranges[1])):
+        key = f"{ref[0]}axis{ref[1:]}"
+        layout[key] = dict(layout.get(key, {}), range=list(rng))
+
+
+def apply_axis_ranges(fig: go.Figure, axis_ranges: Tuple[List[float], List[float]]) -> None:
+    # graph (row 2) axes of a plot_graph_timeline figure; the edge trace is drawn on them
+    patch: dict = {}
+    _set_ranges(patch, fig.data[6].xaxis, fig.data[6].yaxis, axis_ranges)
+    fig.update_layout(patch)
+
+
+def apply_highlight(fig: go.Figure, highlight: Set[str]) -> None:
+    # ring the given nodes; node traces are the marker traces carrying ids in customdata
+    # (what graph_canvas keys on too, where the same ring is drawn client-side)
+    for trace in fig.data:
+        if trace.customdata is None or "markers" not in (trace.mode or ""):
+            continue
+        hit = [(cd[0] if isinstance(cd, (list, tuple)) else cd) in highlight for cd in trace.customdata]
+        trace.marker.line = dict(
+            width=[HIGHLIGHT_WIDTH if h else NODE_LINE_WIDTH for h in hit],
+            color=[HIGHLIGHT_COLOR if h else NODE_LINE_COLOR for h in hit],
+        )
+
+
+def figure_skeleton(
+    title: str,
+    tiles: Tuple[Tuple[str, int | str], ...],
+    label_y: float,
+    value_y: float,
+    kinds: Tuple[str, ...],
+    compact: bool,
+    with_path: bool,
+    sparklines: bool,
+    dates: Tuple,
+    date_labels: Tuple[str, ...],
+    frame_ms: int,
+    edge_layers: Tuple[Tuple[str, float], ...] = (("", EDGE_WIDTH),),
+) -> dict:
+    # plot_graph_timeline's figure minus its data, as validated plain dicts:
+    # {"data": trace shells, "layout": full layout, "static_layout": layout without Play/slider}
+    key = (title, tiles, label_y, value_y, kinds, compact, with_path, sparklines, dates, date_labels, frame_ms, edge_layers)
+    with _skeleton_lock:
+        skeleton = _skeletons.get(key)
+        if skeleton is not None:
+            _skeletons.move_to_end(key)
+            CACHE_HITS["figure_skeleton", "hit"].inc()
+            return skeleton
+    CACHE_HITS["figure_skeleton", "miss"].inc()
+
+    fig = make_subplots(
+        rows=2, cols=3,
+        row_heights=[0.22, 0.78],
+        vertical_spacing=0.02,
+        specs=[
+            [{"type": "scatter"}, {"type": "scatter"}, {"type": "scatter"}],
+            [{"type": "scatter", "colspan": 3}, None, None],
+        ],
+    )
+
+    # KPI traces: 6 total (label,value) x 3 tiles
+    # indices:
+    # 0 label stops, 1 value stops
+    # 2 label nodes, 3 value nodes
+    # 4 label edges, 5 value edges
+    # graph edge traces start at index 6
+    for col, (label, value) in enumerate(tiles, start=1):
+        fig.add_trace(go.Scatter(x=[0], y=[label_y], mode="text",
+                                 text=[_kpi_label_html(label)],
+                                 textposition="middle center", hoverinfo="skip", showlegend=False), row=1, col=col)
+        fig.add_trace(go.Scatter(x=[0], y=[value_y], mode="text",
+                                 text=[_kpi_value_html(value)],
+                                 textposition="middle center", hoverinfo="skip", showlegend=False), row=1, col=col)
+
+    for c in (1, 2, 3):
+        fig.update_xaxes(visible=False, row=1, col=c, range=[-1, 1])
+        fig.update_yaxes(visible=False, row=1, col=c, range=[0, 1])
+
+    # Graph edge traces (index 6 on) on row 2: one per (relation, width) partition
+    for rel, width in edge_layers:
+        fig.add_trace(go.Scatter(
+            x=[], y=[],
+            mode="lines",
+            line=dict(width=width, color=EDGE_COLOR),
+            hoverinfo="none",
+            name=rel or None,
+            showlegend=False,
+        ), row=2, col=1)
+
+    # Node traces follow the edge traces
+    for k in kinds:
+        fig.add_trace(go.Scatter(
+            x=[], y=[],
+            mode="markers+text",
+            textposition="bottom center",
+            marker=dict(
+                color=KIND_COLORS.get(k, "#2563eb"),
+                line=dict(width=NODE_LINE_WIDTH, color=NODE_LINE_COLOR),
+                symbol=KIND_STYLES.get(k, {"symbol": "circle"})["symbol"],
+            ),
+            name=k.capitalize(),
+        ), row=2, col=1)
+
+    if with_path:
+        fig.add_trace(go.Scatter(
+            x=[], y=[],
+            mode="lines",
+            line=dict(width=PATH_WIDTH, color=PATH_COLOR),
+            hoverinfo="skip",
+            name="Connection",
+        ), row=2, col=1)
+
+    if sparklines:
+        for col in (1, 2, 3):
+            fig.add_trace(go.Scatter(
+                x=[], y=[],
+                mode="lines",
+                line=dict(width=1.5, color=SPARK_COLOR, shape="hv"),
+                hovertemplate="%{text}<extra></extra>",
+                showlegend=False,
+            ), row=1, col=col)
+        for col in (1, 2, 3):
+            fig.add_trace(go.Scatter(
+                x=[], y=[],
+                mode="markers",
+                marker=dict(size=6, color="rgba(255,255,255,.9)"),
+                hoverinfo="skip",
+                showlegend=False,
+            ), row=1, col=col)
+
+    fig.update_layout(
+        title=dict(text=title, x=0.01, xanchor="left", font=dict(size=18, color="rgba(255,255,255,.92)")),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="left",
+            x=0.01,
+            font=dict(color="rgba(255,255,255,.78)"),
+            bgcolor="rgba(0,0,0,0)",
+        ),
+        margin=dict(l=8, r=8, t=40, b=55),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        hoverlabel=dict(bgcolor="rgba(15,23,42,.92)", font=dict(color="white")),
+        font=dict(color="rgba(255,255,255,.85)"),
+    )
+
+    fig.update_xaxes(visible=False, row=2, col=1)
+    fig.update_yaxes(visible=False, row=2, col=1)
+    static_layout = fig.to_dict()["layout"]
+
+    fig.update_layout(**timeline_controls(dates, date_labels, frame_ms))
+
+    full = fig.to_dict()
+    skeleton = {"data": full["data"], "layout": full["layout"], "static_layout": static_layout}
+    with _skeleton_lock:
+        _skeletons[key] = skeleton
+        while len(_skeletons) > SKELETON_CACHE:
+            _skeletons.popitem(last=False)
+    return skeleton
+
 
 def plot_graph_timeline(
     G: nx.Graph,
@@ -123,11 +552,25 @@ def plot_graph_timeline(
     y_spread: float = 3.2,
     label_mode: str = "smart",
     frame_ms: int = 560,  # SLOWER default playback
+    pos: Optional[Dict[str, Tuple[float, float]]] = None,
+    node_scores: Optional[List[Dict[str, float]]] = None,  # per-date importance -> marker size
+    on_first_paint: Optional[Callable[[go.Figure], None]] = None,
+    compact: bool = False,  # numeric arrays as base64 typed arrays + hovertemplate hovers
+    date_labels: Optional[List[str]] = None,  # slider labels (default "%b %Y")
+    frame_cache: Optional[Dict] = None,  # date -> frame state, reused across calls with the same view
+    paths: Optional[List[List[str]]] = None,  # connection routes drawn as an overlay
+    axis_ranges: Optional[Tuple[List[float], List[float]]] = None,  # graph x/y ranges (see spacing_ranges)
+    frame_positions: Optional[List[Dict[str, Tuple[float, float]]]] = None,  # per-stop layout (force_positions_by_stop)
+    counts: Optional["CountCube"] = None,  # KPI tiles + sparklines from the count cube
+    enabled_rels: Optional[Set[str]] = None,  # relations drawn (None = all)
+    edge_weights: bool = False,  # edge width follows weight (WEIGHT_WIDTHS)
 ) -> go.Figure:
 
+    t_start = perf_counter()
     if layer_kinds is None:
         layer_kinds = ["experience", "project", "tool", "outcome", "leadership", "tag"]
 
+    label_mode = (label_mode or "smart").lower()
     layer_kinds = [norm_kind(k) for k in layer_kinds]
     if enabled_kinds is not None:
         enabled_kinds = {norm_kind(k) for k in enabled_kinds}
@@ -136,9 +579,21 @@ def plot_graph_timeline(
     drawable_ids = {nid for nid in G.nodes() if (enabled_kinds is None) or (G.nodes[nid].get("kind") in enabled_kinds)}
     H = G.subgraph(drawable_ids).copy()
 
-    pos = compute_positions(H, layer_kinds=layer_kinds, layer_gap=layer_gap, y_spread=y_spread)
+    moving = bool(frame_positions)  # node coordinates change from stop to stop
+    if pos is None and moving:
+        pos = frame_positions[-1]
+    if pos is None:
+        pos = compute_positions(H, layer_kinds=layer_kinds, layer_gap=layer_gap, y_spread=y_spread)
     drawable = set(pos.keys())
 
+    # integer node order shared by the edge partitions and the compact frame arrays;
+    # frames hold segments for every partition, the figure draws the enabled ones
+    order = list(pos.keys())
+    index = {nid: i for i, nid in enumerate(order)}
+    parts = edge_partitions(H, index, by_weight=edge_weights)
+    shown_parts = parts.select(enabled_rels)
+    edge_layers = tuple(parts.keys[p] for p in shown_parts) or (("", EDGE_WIDTH),)
+
     total_stops = len(dates)
 
     neigh: Set[str] = set()
@@ -158,118 +613,247 @@ def plot_graph_timeline(
         nids = [nid for nid in H.nodes() if H.nodes[nid].get("kind") == k]
         kind_nodes[k] = sorted(nids, key=lambda n: str(H.nodes[n].get("label", n)).lower())
 
-    fig = make_subplots(
-        rows=2, cols=3,
-        row_heights=[0.22, 0.78],
-        vertical_spacing=0.02,
-        specs=[
-            [{"type": "scatter"}, {"type": "scatter"}, {"type": "scatter"}],
-            [{"type": "scatter", "colspan": 3}, None, None],
-        ],
-    )
-
-    # KPI traces: 6 total (label,value) x 3 tiles
-    # indices:
-    # 0 label stops, 1 value stops
-    # 2 label nodes, 3 value nodes
-    # 4 label edges, 5 value edges
-    # graph edge trace becomes index 6
-    fig.add_trace(go.Scatter(x=[0], y=[0.68], mode="text",
-                             text=[_kpi_label_html("Timeline stops")],
-                             textposition="middle center", hoverinfo="skip", showlegend=False), row=1, col=1)
-    fig.add_trace(go.Scatter(x=[0], y=[0.22], mode="text",
-                             text=[_kpi_value_html(total_stops)],
-                             textposition="middle center", hoverinfo="skip", showlegend=False), row=1, col=1)
-
-    fig.add_trace(go.Scatter(x=[0], y=[0.68], mode="text",
-                             text=[_kpi_label_html("Latest visible nodes")],
-                             textposition="middle center", hoverinfo="skip", showlegend=False), row=1, col=2)
-    fig.add_trace(go.Scatter(x=[0], y=[0.22], mode="text",
-                             text=[_kpi_value_html(0)],
-                             textposition="middle center", hoverinfo="skip", showlegend=False), row=1, col=2)
-
-    fig.add_trace(go.Scatter(x=[0], y=[0.68], mode="text",
-                             text=[_kpi_label_html("Total edges")],
-                             textposition="middle center", hoverinfo="skip", showlegend=False), row=1, col=3)
-    fig.add_trace(go.Scatter(x=[0], y=[0.22], mode="text",
-                             text=[_kpi_value_html(0)],
-                             textposition="middle center", hoverinfo="skip", showlegend=False), row=1, col=3)
-
-    for c in (1, 2, 3):
-        fig.update_xaxes(visible=False, row=1, col=c, range=[-1, 1])
-        fig.update_yaxes(visible=False, row=1, col=c, range=[0, 1])
-
-    # Graph edge trace (index 6) on row 2
-    fig.add_trace(go.Scatter(
-        x=[], y=[],
-        mode="lines",
-        line=dict(width=EDGE_WIDTH, color=EDGE_COLOR),
-        hoverinfo="none",
-        showlegend=False,
-    ), row=2, col=1)
-
-    graph_xaxis = fig.data[6].xaxis
-    graph_yaxis = fig.data[6].yaxis
+    placer = None
+    if label_mode == "smart":
+        kinds = {nid: H.nodes[nid].get("kind", "") for nid in pos}
+        labels = {nid: str(H.nodes[nid].get("label", nid)) for nid in pos}
+        placer = LabelPlacer(
+            pos,
+            labels,
+            marker_px={nid: KIND_STYLES.get(k, {"size": 14})["size"] for nid, k in kinds.items()},
+            priority=label_priority(kinds, dict(H.degree()), labels, selected, neigh),
+        )
 
-    # Node traces start at 7
-    node_trace_start = 7
-    for k in kinds_present:
+    def smart_labels(visible: Set[str], fpos: Dict[str, Tuple[float, float]]) -> Set[str]:
+        # spotlight: only the selected node's neighborhood competes for label space
+        candidates = visible if not neigh else visible & neigh
+        if moving:
+            # nodes move between stops, so nothing carries over from the previous frame
+            return LabelPlacer(fpos, placer.labels, placer.marker_px, placer.priority).place(candidates)
+        return placer.place(candidates)
+
+    # with a count cube the tiles show tools / nodes / outcomes over a sparkline band
+    kpi = _kpi_series(counts, dates) if counts is not None and dates else None
+    if kpi is None:
+        tiles = (("Timeline stops", total_stops), ("Latest visible nodes", 0), ("Total edges", 0))
+        label_y, value_y = 0.68, 0.22
+    else:
+        tiles = (("Tools adopted", 0), ("Visible nodes", 0), ("Outcomes", 0))
+        label_y, value_y = 0.82, 0.48
+
+    if date_labels is None:
+        date_labels = [d.strftime("%b %Y") for d in dates]
+
+    # scaffold (subplots, tiles, legend, Play/slider) is validated once per shape; this
+    # call only fills in data arrays
+    t_skeleton = perf_counter()
+    STAGE_SECONDS["prepare"].observe(t_skeleton - t_start)
+    skeleton = figure_skeleton(
+        title, tiles, label_y, value_y, tuple(kinds_present), compact, bool(paths), kpi is not None,
+        tuple(dates), tuple(date_labels), frame_ms, edge_layers,
+    )
+    t_traces = perf_counter()
+    STAGE_SECONDS["skeleton"].observe(t_traces - t_skeleton)
+    traces = [dict(t) for t in skeleton["data"]]
+    graph_xaxis, graph_yaxis = traces[6]["xaxis"], traces[6]["yaxis"]
+
+    # Node traces follow the edge traces
+    edge_traces = list(range(6, 6 + len(edge_layers)))
+    node_trace_start = 6 + len(edge_layers)
+    for i, k in enumerate(kinds_present):
         nids = kind_nodes[k]
         xs = [pos[nid][0] for nid in nids]
         ys = [pos[nid][1] for nid in nids]
 
-        hovers = []
-        for nid in nids:
-            label = H.nodes[nid].get("label", nid)
-            subtitle = H.nodes[nid].get("subtitle", "")
-            metric = H.nodes[nid].get("metric", "")
-            hover = f"<b>{label}</b>"
-            if subtitle:
-                hover += f"<br>{subtitle}"
-            if metric:
-                hover += f"<br><span style='color:#94a3b8'>{metric}</span>"
-            hovers.append(hover)
+        base_size = KIND_STYLES.get(k, {"size": 14})["size"]
+        sizes = [_marker_size(base_size, nid, selected, neigh) for nid in nids]
 
+        if compact:
+            customdata = []
+            for nid in nids:
+                data = H.nodes[nid]
+                subtitle = data.get("subtitle", "")
+                metric = data.get("metric", "")
+                customdata.append([
+                    nid,
+                    data.get("label", nid),
+                    f"<br>{subtitle}" if subtitle else "",
+                    f"<br>{metric}" if metric else "",
+                ])
+            hover = dict(hovertemplate=NODE_HOVERTEMPLATE, customdata=customdata)
+            xs, ys = np.asarray(xs, dtype=np.float32), np.asarray(ys, dtype=np.float32)
+            sizes = np.asarray(sizes, dtype=np.float32)
+            opacity = np.zeros(len(nids), dtype=np.float32)
+        else:
+            hovers = []
+            for nid in nids:
+                label = H.nodes[nid].get("label", nid)
+                subtitle = H.nodes[nid].get("subtitle", "")
+                metric = H.nodes[nid].get("metric", "")
+                hover = f"<b>{label}</b>"
+                if subtitle:
+                    hover += f"<br>{subtitle}"
+                if metric:
+                    hover += f"<br><span style='color:#94a3b8'>{metric}</span>"
+                hovers.append(hover)
+            hover = dict(hovertext=hovers, hoverinfo="text", customdata=nids)
+            opacity = [0.0] * len(nids)
+
+        trace = traces[node_trace_start + i]
+        trace.update(x=xs, y=ys, text=[""] * len(nids), **hover)
+        trace["marker"] = dict(trace["marker"], size=sizes, opacity=opacity)
+
+    # path overlay: one trace after the node traces, segments shown once both ends are visible
+    path_trace = node_trace_start + len(kinds_present)
+    path_segments = []
+    if paths:
+        seen_segments = set()
+        for p in paths:
+            for u, v in zip(p, p[1:]):
+                if u in pos and v in pos and frozenset((u, v)) not in seen_segments:
+                    seen_segments.add(frozenset((u, v)))
+                    path_segments.append((u, v))
+
+    # sparklines: a static line per tile (hover = per-stop breakdown) and a marker at the
+    # current stop, the only sparkline part frames touch
+    spark_line = path_trace + (1 if paths else 0)
+    spark_trace = spark_line + (3 if kpi is not None else 0)
+    spark_markers = []
+    if kpi is not None:
+        spark_x = np.linspace(-0.8, 0.8, len(dates)) if len(dates) > 1 else np.zeros(1)
+        kinds_hover = [
+            " · ".join(f"{n} {k}" for k, n in zip(counts.kinds, row) if n)
+            for row in kpi["per_kind"].tolist()
+        ]
+        rels_hover = [
+            " · ".join(f"{n} {r}" for r, n in zip(counts.rels, row) if n)
+            for row in kpi["per_rel"].tolist()
+        ]
+        series = [
+            (kpi["tools"], [f"{t} tools (+{n} new)" for t, n in zip(kpi["tools"].tolist(), kpi["new_tools"].tolist())]),
+            (kpi["nodes"], kinds_hover),
+            (kpi["outcomes"], [f"{n} outcomes<br>{r}" for n, r in zip(kpi["outcomes"].tolist(), rels_hover)]),
+        ]
+        for j, (values, hover) in enumerate(series):
+            spark_y = 0.04 + 0.16 * values / max(int(values.max()), 1)
+            traces[spark_line + j].update(
+                x=spark_x, y=spark_y,
+                text=[f"<b>{label}</b><br>{h}" for label, h in zip(date_labels, hover)],
+            )
+            spark_markers.append((spark_x, spark_y))
+
+    def path_xy(visible: Set[str], pos: Dict[str, Tuple[float, float]]):
+        shown = [(u, v) for u, v in path_segments if u in visible and v in visible]
+        if compact:
+            xy = np.full((len(shown), 2, 3), np.nan, dtype=np.float32)
+            for i, (u, v) in enumerate(shown):
+                xy[i, 0, :2] = pos[u][0], pos[v][0]
+                xy[i, 1, :2] = pos[u][1], pos[v][1]
+            return xy[:, 0].ravel(), xy[:, 1].ravel()
+        px_, py_ = [], []
+        for u, v in shown:
+            px_ += [pos[u][0], pos[v][0], None]
+            py_ += [pos[u][1], pos[v][1], None]
+        return px_, py_
+
+    def frame_sizes(scores: Dict[str, float], k: str, nids: List[str]) -> List[float]:
         base_size = KIND_STYLES.get(k, {"size": 14})["size"]
-        sizes = []
-        for nid in nids:
-            if selected == nid:
-                sizes.append(base_size + 10)
-            elif selected is None:
-                sizes.append(base_size)
+        top = max(scores.values(), default=0.0) or 1.0
+        return [
+            _marker_size(base_size * (0.7 + 0.6 * scores.get(nid, 0.0) / top), nid, selected, neigh)
+            for nid in nids
+        ]
+
+    if compact:
+        # integer-indexed arrays so each frame is a handful of vectorized masks
+        px = np.array([pos[nid][0] for nid in order], dtype=np.float32)
+        py = np.array([pos[nid][1] for nid in order], dtype=np.float32)
+
+        kind_idx, kind_spot, kind_labels, kind_label_on = {}, {}, {}, {}
+        for k in kinds_present:
+            nids = kind_nodes[k]
+            kind_idx[k] = np.array([index[nid] for nid in nids], dtype=np.int64)
+            if selected is None:
+                spot = [0.92] * len(nids)
             else:
-                sizes.append(base_size + 2 if nid in neigh else max(8, base_size - 3))
-
-        fig.add_trace(go.Scatter(
-            x=xs, y=ys,
-            mode="markers+text",
-            text=[""] * len(nids),
-            textposition="bottom center",
-            hovertext=hovers,
-            hoverinfo="text",
-            customdata=nids,
-            marker=dict(
-                size=sizes,
-                color=KIND_COLORS.get(k, "#2563eb"),
-                opacity=[0.0] * len(nids),
-                line=dict(width=1.0, color="rgba(15,23,42,0.45)"),
-                symbol=KIND_STYLES.get(k, {"symbol": "circle"})["symbol"],
-            ),
-            name=k.capitalize(),
-        ), row=2, col=1)
-
-    def frame_state(visible_raw: Set[str]):
+                spot = [1.0 if nid == selected else (0.92 if nid in neigh else 0.18) for nid in nids]
+            kind_spot[k] = np.asarray(spot, dtype=np.float32)
+            kind_labels[k] = np.array([H.nodes[nid].get("label", nid) for nid in nids], dtype=object)
+            if label_mode == "none":
+                label_on = [False] * len(nids)
+            elif label_mode == "all":
+                label_on = [True] * len(nids)
+            else:
+                label_on = [False] * len(nids)  # smart: decided per frame by the placer
+            kind_label_on[k] = np.asarray(label_on, dtype=bool)
+
+    def compact_frame_state(
+        visible_raw: Set[str],
+        scores: Optional[Dict[str, float]],
+        fpos: Dict[str, Tuple[float, float]],
+    ):
         visible = {nid for nid in visible_raw if nid in drawable}
+        vis = np.zeros(len(order), dtype=bool)
+        vis[[index[nid] for nid in visible]] = True
+        fx, fy = px, py
+        if moving:
+            fx = np.array([fpos[nid][0] for nid in order], dtype=np.float32)
+            fy = np.array([fpos[nid][1] for nid in order], dtype=np.float32)
+
+        if placer is not None:
+            placed = smart_labels(visible, fpos)
+            vis_label = np.zeros(len(order), dtype=bool)
+            vis_label[[index[nid] for nid in placed]] = True
+
+        on = vis[parts.u] & vis[parts.v]
+        segments = []
+        for lo, hi in zip(parts.offsets[:-1].tolist(), parts.offsets[1:].tolist()):
+            eu, ev = parts.u[lo:hi][on[lo:hi]], parts.v[lo:hi][on[lo:hi]]
+            # NaN breaks the line between segments, like the None separators
+            ex = np.full((len(eu), 3), np.nan, dtype=np.float32)
+            ey = np.full((len(eu), 3), np.nan, dtype=np.float32)
+            ex[:, 0], ex[:, 1] = fx[eu], fx[ev]
+            ey[:, 0], ey[:, 1] = fy[eu], fy[ev]
+            segments.append((ex.ravel(), ey.ravel(), len(eu)))
 
-        ex, ey = [], []
-        edge_count = 0
-        for u, v in G.edges():
-            if u in visible and v in visible and u in drawable and v in drawable:
-                x0, y0 = pos[u]
-                x1, y1 = pos[v]
-                ex += [x0, x1, None]
-                ey += [y0, y1, None]
-                edge_count += 1
+        node_updates = []
+        for k in kinds_present:
+            vis_k = vis[kind_idx[k]]
+            marker = {"opacity": vis_k * kind_spot[k]}
+            if scores is not None:
+                marker["size"] = np.asarray(frame_sizes(scores, k, kind_nodes[k]), dtype=np.float32)
+            label_on = vis_label[kind_idx[k]] if placer is not None else kind_label_on[k]
+            labels = np.where(vis_k & label_on, kind_labels[k], "").tolist()
+            update = {"marker": marker, "text": labels}
+            if moving:
+                update["x"], update["y"] = fx[kind_idx[k]], fy[kind_idx[k]]
+            node_updates.append(update)
+
+        return visible, segments, node_updates
+
+    def frame_state(
+        visible_raw: Set[str],
+        scores: Optional[Dict[str, float]] = None,
+        fpos: Optional[Dict[str, Tuple[float, float]]] = None,
+    ):
+        if fpos is None:
+            fpos = pos
+        if compact:
+            return compact_frame_state(visible_raw, scores, fpos)
+        visible = {nid for nid in visible_raw if nid in drawable}
+        placed = smart_labels(visible, fpos) if placer is not None else set()
+
+        segments = []
+        for lo, hi in zip(parts.offsets[:-1].tolist(), parts.offsets[1:].tolist()):
+            ex, ey = [], []
+            for a, b in zip(parts.u[lo:hi].tolist(), parts.v[lo:hi].tolist()):
+                u, v = order[a], order[b]
+                if u in visible and v in visible:
+                    x0, y0 = fpos[u]
+                    x1, y1 = fpos[v]
+                    ex += [x0, x1, None]
+                    ey += [y0, y1, None]
+            segments.append((ex, ey, len(ex) // 3))
 
         node_updates = []
         for k in kinds_present:
@@ -292,113 +876,117 @@ def plot_graph_timeline(
                 elif label_mode == "all":
                     labels.append(H.nodes[nid].get("label", nid))
                 else:
-                    if selected is not None:
-                        labels.append(H.nodes[nid].get("label", nid) if nid in neigh else "")
-                    else:
-                        labels.append(H.nodes[nid].get("label", nid) if k in {"project", "experience"} else "")
+                    labels.append(H.nodes[nid].get("label", nid) if nid in placed else "")
 
-            node_updates.append({"marker": {"opacity": opacities}, "text": labels})
+            marker = {"opacity": opacities}
+            if scores is not None:
+                marker["size"] = frame_sizes(scores, k, nids)
+            update = {"marker": marker, "text": labels}
+            if moving:
+                update["x"] = [fpos[nid][0] for nid in nids]
+                update["y"] = [fpos[nid][1] for nid in nids]
+            node_updates.append(update)
 
-        return visible, ex, ey, edge_count, node_updates
+        return visible, segments, node_updates
 
-    frames = []
     num_node_traces = len(kinds_present)
 
     # traces updated per frame:
     # value nodes trace index 3
     # value edges trace index 5
-    # graph edge trace index 6
-    # node traces start at 7
-    trace_indices = [3, 5, 6] + list(range(node_trace_start, node_trace_start + num_node_traces))
-
-    for i, d in enumerate(dates):
-        visible, ex, ey, edge_count, node_updates = frame_state(visible_nodes_by_date[i])
-
-        kpi_nodes_val = {"text": [_kpi_value_html(len(visible))]}
-        kpi_edges_val = {"text": [_kpi_value_html(edge_count)]}
-
-        edge_update = {"x": ex, "y": ey, "xaxis": graph_xaxis, "yaxis": graph_yaxis}
-        frame_data = [kpi_nodes_val, kpi_edges_val, edge_update] + node_updates
-
-        frames.append(go.Frame(name=d.isoformat(), data=frame_data, traces=trace_indices))
-
-    fig.frames = frames
-
-    # Init to last frame
-    if frames:
-        visible, ex, ey, edge_count, node_updates = frame_state(visible_nodes_by_date[-1])
-        fig.data[3].text = [_kpi_value_html(len(visible))]
-        fig.data[5].text = [_kpi_value_html(edge_count)]
-        fig.data[6].x, fig.data[6].y = ex, ey
-
-        idx = node_trace_start
-        for upd in node_updates:
-            fig.data[idx].marker.opacity = upd["marker"]["opacity"]
-            fig.data[idx].text = upd["text"]
-            idx += 1
+    # graph edge traces from index 6, one per drawn partition
+    # node traces after the edge traces
+    # value stops trace index 1 (cube tiles only)
+    # sparkline markers after the path overlay
+    lead = 1 if kpi is not None else 0
+    trace_indices = [1] * lead + [3, 5] + edge_traces + list(range(node_trace_start, node_trace_start + num_node_traces))
+    if path_segments:
+        trace_indices.append(path_trace)
+    trace_indices += list(range(spark_trace, spark_trace + len(spark_markers)))
+
+    def frame_data(i: int):
+        # the cached per-stop state covers every relation, so toggling relations (or
+        # routes) reassembles frames from it instead of recomputing them
+        fpos = frame_positions[i] if moving else pos
+        state = frame_cache.get(dates[i]) if frame_cache is not None else None
+        if frame_cache is not None:
+            CACHE_HITS["frame_state", "miss" if state is None else "hit"].inc()
+        if state is None:
+            scores = node_scores[i] if node_scores is not None else None
+            state = frame_state(visible_nodes_by_date[i], scores, fpos)
+            if frame_cache is not None:
+                frame_cache[dates[i]] = state
+        visible, segments, node_updates = state
+        edge_count = sum(segments[p][2] for p in shown_parts)
+
+        if kpi is None:
+            data = [
+                {"text": [_kpi_value_html(len(visible))]},
+                {"text": [_kpi_value_html(edge_count)]},
+            ]
+        else:
+            data = [
+                {"text": [_kpi_delta_html(int(kpi["tools"][i]), int(kpi["new_tools"][i]))]},
+                {"text": [_kpi_value_html(int(kpi["nodes"][i]))]},
+                {"text": [_kpi_value_html(int(kpi["outcomes"][i]))]},
+            ]
+
+        axes = {"xaxis": graph_xaxis, "yaxis": graph_yaxis}
+        if shown_parts:
+            data += [dict(axes, x=segments[p][0], y=segments[p][1]) for p in shown_parts]
+        else:
+            data.append(dict(axes, x=[], y=[]))
+        data += node_updates
+        if path_segments:
+            path_x, path_y = path_xy(visible, fpos)
+            data.append({"x": path_x, "y": path_y, "xaxis": graph_xaxis, "yaxis": graph_yaxis})
+        for j, (sx, sy) in enumerate(spark_markers):
+            t = traces[spark_trace + j]
+            data.append({"x": [float(sx[i])], "y": [float(sy[i])], "xaxis": t["xaxis"], "yaxis": t["yaxis"]})
+        return data
+
+    # Init to last frame (this is also the progressive first paint)
+    t_frames = perf_counter()
+    STAGE_SECONDS["traces"].observe(t_frames - t_traces)
+    last_data = None
+    if dates:
+        last_data = frame_data(len(dates) - 1)
+        node_traces = range(node_trace_start, node_trace_start + num_node_traces)
+        for t, upd in zip(trace_indices, last_data):
+            trace = traces[t]
+            if t in node_traces:
+                marker = dict(trace["marker"], opacity=upd["marker"]["opacity"])
+                if "size" in upd["marker"]:
+                    marker["size"] = upd["marker"]["size"]
+                trace["marker"] = marker
+                trace["text"] = upd["text"]
+            elif "text" in upd:
+                trace["text"] = upd["text"]
+            else:
+                trace["x"], trace["y"] = upd["x"], upd["y"]
 
-    steps = []
-    for d in dates:
-        steps.append(dict(
-            method="animate",
-            args=[[d.isoformat()],
-                  {"frame": {"duration": frame_ms, "redraw": True},
-                   "transition": {"duration": int(frame_ms * 0.85), "easing": "cubic-in-out"}}],
-            label=d.strftime("%b %Y"),
-        ))
+    # skeleton dicts are shared between calls: patch copies
+    layout = dict(skeleton["layout"])
+    static_layout = dict(skeleton["static_layout"])
+    if axis_ranges is not None:
+        for lay in (layout, static_layout):
+            _set_ranges(lay, graph_xaxis, graph_yaxis, axis_ranges)
 
-    fig.update_layout(
-        title=dict(text=title, x=0.01, xanchor="left", font=dict(size=18, color="rgba(255,255,255,.92)")),
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="left",
-            x=0.01,
-            font=dict(color="rgba(255,255,255,.78)"),
-            bgcolor="rgba(0,0,0,0)",
-        ),
-        margin=dict(l=8, r=8, t=40, b=55),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        hoverlabel=dict(bgcolor="rgba(15,23,42,.92)", font=dict(color="white")),
-        font=dict(color="rgba(255,255,255,.85)"),
-        updatemenus=[dict(
-            type="buttons",
-            direction="left",
-            x=0.01,
-            y=-0.08,
-            xanchor="left",
-            yanchor="top",
-            showactive=False,
-            buttons=[
-                dict(label="▶ Play", method="animate",
-                     args=[None, {"fromcurrent": True,
-                                 "frame": {"duration": frame_ms, "redraw": True},
-                                 "transition": {"duration": int(frame_ms * 0.85)}}]),
-                dict(label="⏸ Pause", method="animate",
-                     args=[[None], {"mode": "immediate",
-                                   "frame": {"duration": 0, "redraw": True},
-                                   "transition": {"duration": 0}}]),
-            ],
-        )],
-        sliders=[dict(
-            active=max(0, len(steps) - 1),
-            x=0.01,
-            y=-0.14,
-            xanchor="left",
-            yanchor="top",
-            len=0.98,
-            pad={"t": 0, "b": 0},
-            currentvalue={"prefix": "Timeline: ", "font": {"color": "rgba(255,255,255,.78)"}},
-            steps=steps,
-        )],
-    )
+    frames_seconds = perf_counter() - t_frames
+    if on_first_paint is not None:
+        # latest state only: no frames, no Play/slider until the animation is attached
+        on_first_paint(go.Figure({"data": traces, "layout": static_layout}, _validate=False))
 
-    fig.update_xaxes(visible=False, row=2, col=1)
-    fig.update_yaxes(visible=False, row=2, col=1)
+    t_frames = perf_counter()
+    frames = []
+    for i, d in enumerate(dates):
+        data = last_data if i == len(dates) - 1 else frame_data(i)
+        frames.append({"name": d.isoformat(), "data": [dict(upd, type="scatter") for upd in data], "traces": trace_indices})
+    t_assemble = perf_counter()
+    STAGE_SECONDS["frames"].observe(frames_seconds + t_assemble - t_frames)
 
+    fig = go.Figure({"data": traces, "layout": layout, "frames": frames}, _validate=False)
+    STAGE_SECONDS["assemble"].observe(perf_counter() - t_assemble)
     return fig
 
 
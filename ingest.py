@@ -0,0 +1,193 @@
+from __future__ import annotations
+import argparse
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from data import Node, Edge
+from graph_utils import KIND_ALIASES
+from resolve import Resolution, alias_table, resolve_entities
+
+
+# Bulk loading of node / edge tables (CSV or Parquet) into Node and Edge collections.
+# Kind normalization, date parsing, de-duplication and dangling-edge checks run as
+# column operations; Python only touches each row once, to build the dataclasses.
+# Duplicate tool / tag spellings are folded into canonical nodes (resolve.py) before
+# edges are built, so edges are re-pointed and de-duplicated in the same pass.
+#
+#   nodes: id, label, kind [, subtitle, metric, start, end, url]
+#   edges: source, target, rel [, weight]
+#
+#   python ingest.py nodes.parquet edges.parquet [--aliases aliases.csv]
+
+@dataclass
+class IngestReport:
+    nodes: int = 0
+    edges: int = 0
+    duplicate_nodes: int = 0
+    duplicate_edges: int = 0
+    bad_dates: int = 0
+    merged_nodes: int = 0      # tool / tag spellings folded into a canonical node
+    collapsed_edges: int = 0   # edges between two spellings of the same entity
+    dangling: List[Tuple[str, str, str]] = field(default_factory=list)
+    resolution: Resolution = field(default_factory=Resolution)
+
+
+def read_table(path: str, columns=None) -> pd.DataFrame:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        return pd.read_parquet(path, columns=columns)
+    if ext in (".csv", ".txt", ".gz"):
+        return pd.read_csv(path, usecols=columns, dtype=str, keep_default_na=False)
+    raise ValueError(f"Unsupported table format: {path!r} (expected .csv or .parquet)")
+
+
+def _require(df: pd.DataFrame, columns, what: str) -> None:
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise KeyError(f"{what} table is missing column(s): {', '.join(missing)}")
+
+
+def _text(col: pd.Series) -> pd.Series:
+    return col.fillna("").astype(str).str.strip()
+
+
+def normalize_kinds(kinds: pd.Series) -> pd.Series:
+    # vectorized graph_utils.norm_kind
+    lowered = _text(kinds).str.lower()
+    return lowered.map(KIND_ALIASES).fillna(lowered)
+
+
+def _dates(col: pd.Series) -> Tuple[np.ndarray, int]:
+    text = _text(col)
+    parsed = pd.to_datetime(text.where(text != ""), errors="coerce", format="mixed")
+    bad = int((parsed.isna() & (text != "")).sum())
+    values = np.array(parsed.dt.date, dtype=object)
+    values[parsed.isna().to_numpy()] = None
+    return values, bad
+
+
+def nodes_from_frame(df: pd.DataFrame, report: IngestReport) -> Dict[str, Node]:
+    _require(df, ("id", "label", "kind"), "Node")
+    df = df.assign(id=_text(df["id"]))
+    df = df[df["id"] != ""]
+    before = len(df)
+    df = df.drop_duplicates("id", keep="last")  # later rows win, like repeated add()
+    report.duplicate_nodes = before - len(df)
+
+    n = len(df)
+    empty = pd.Series([""] * n, index=df.index)
+    ids = df["id"].tolist()
+    labels = _text(df["label"]).tolist()
+    kinds = normalize_kinds(df["kind"]).tolist()
+    subtitles = _text(df.get("subtitle", empty)).tolist()
+    metrics = _text(df.get("metric", empty)).tolist()
+    starts, bad_starts = _dates(df.get("start", empty))
+    ends, bad_ends = _dates(df.get("end", empty))
+    urls = [url or None for url in _text(df.get("url", empty)).tolist()]
+    report.bad_dates = bad_starts + bad_ends
+
+    nodes = {
+        nid: Node(id=nid, label=label or nid, kind=kind, subtitle=sub, metric=metric, start=s, end=e, url=url)
+        for nid, label, kind, sub, metric, s, e, url in zip(ids, labels, kinds, subtitles, metrics, starts, ends, urls)
+    }
+    report.nodes = len(nodes)
+    return nodes
+
+
+def edges_from_frame(df: pd.DataFrame, node_ids, report: IngestReport) -> List[Edge]:
+    _require(df, ("source", "target", "rel"), "Edge")
+    src = _text(df["source"]).to_numpy(dtype=str)
+    dst = _text(df["target"]).to_numpy(dtype=str)
+    rel = _text(df["rel"]).to_numpy(dtype=object)
+    if "weight" in df.columns:
+        weight = pd.to_numeric(df["weight"], errors="coerce").fillna(1.0).to_numpy(dtype=np.float64)
+    else:
+        weight = np.ones(len(df))
+
+    known = pd.Index(list(node_ids))
+    ok = known.get_indexer(src) >= 0
+    ok &= known.get_indexer(dst) >= 0
+    bad = np.flatnonzero(~ok)
+    report.dangling = list(zip(src[bad].tolist(), dst[bad].tolist(), rel[bad].tolist()))
+    src, dst, rel, weight = src[ok], dst[ok], rel[ok], weight[ok]
+
+    # undirected: (a, b) and (b, a) are the same edge; the last one wins (GraphStore semantics)
+    lo, hi = np.where(src <= dst, src, dst), np.where(src <= dst, dst, src)
+    keys = pd.DataFrame({"lo": lo, "hi": hi})
+    keep = ~keys.duplicated(keep="last").to_numpy()
+    report.duplicate_edges = int((~keep).sum())
+
+    edges = [
+        Edge(source=s, target=t, rel=r, weight=w)
+        for s, t, r, w in zip(src[keep].tolist(), dst[keep].tolist(), rel[keep].tolist(), weight[keep].tolist())
+    ]
+    report.edges = len(edges)
+    return edges
+
+
+def resolve_frame(
+    nodes: Dict[str, Node],
+    edge_df: pd.DataFrame,
+    report: IngestReport,
+) -> Tuple[Dict[str, Node], pd.DataFrame, Resolution]:
+    # fold duplicate tool / tag spellings and re-point the edge table at the survivors
+    _require(edge_df, ("source", "target", "rel"), "Edge")
+    src, dst = _text(edge_df["source"]), _text(edge_df["target"])
+    degree = pd.concat([src, dst]).value_counts().to_dict()
+    nodes, resolution = resolve_entities(nodes, degree)
+    report.merged_nodes = len(resolution.aliases)
+    report.nodes = len(nodes)
+    if not resolution.aliases:
+        return nodes, edge_df, resolution
+
+    aliases = pd.Series(resolution.aliases)
+    src, dst = src.map(aliases).fillna(src), dst.map(aliases).fillna(dst)
+    loops = (src == dst) & (edge_df["source"] != edge_df["target"])
+    report.collapsed_edges = int(loops.sum())
+    edge_df = edge_df.assign(source=src, target=dst)[~loops.to_numpy()]
+    return nodes, edge_df, resolution
+
+
+def load_graph(
+    nodes_path: str,
+    edges_path: str,
+    resolve: bool = True,
+) -> Tuple[Dict[str, Node], List[Edge], IngestReport]:
+    report = IngestReport()
+    node_df = read_table(nodes_path)
+    edge_df = read_table(edges_path)
+    nodes = nodes_from_frame(node_df, report)
+    if resolve:
+        nodes, edge_df, report.resolution = resolve_frame(nodes, edge_df, report)
+    edges = edges_from_frame(edge_df, nodes.keys(), report)
+    return nodes, edges, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load node / edge tables and report what was dropped")
+    parser.add_argument("nodes", help="node table (.csv or .parquet)")
+    parser.add_argument("edges", help="edge table (.csv or .parquet)")
+    parser.add_argument("--no-resolve", action="store_true", help="keep duplicate tool / tag spellings apart")
+    parser.add_argument("--aliases", help="write the alias table (alias -> canonical id) to this CSV")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    nodes, edges, report = load_graph(args.nodes, args.edges, resolve=not args.no_resolve)
+    elapsed = time.perf_counter() - t0
+    print(f"N nodes: {report.nodes} ({report.duplicate_nodes} duplicates dropped)")
+    print(f"Merged spellings: {report.merged_nodes} ({report.collapsed_edges} edges collapsed)")
+    print(f"N edges: {report.edges} ({report.duplicate_edges} duplicates dropped)")
+    print(f"Unparsed dates: {report.bad_dates}")
+    print(f"Dangling edges: {len(report.dangling)}")
+    print(f"Examples: {report.dangling[:10]}")
+    print(f"Loaded in {elapsed:.2f}s")
+    if args.aliases:
+        alias_table(report.resolution, nodes).to_csv(args.aliases, index=False)
+
+
+if __name__ == "__main__":
+    main()
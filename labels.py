@@ -0,0 +1,119 @@
+from __future__ import annotations
+from math import floor
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Greedy, priority-ranked label placement for "smart" label mode. Label boxes are
+# estimated in screen pixels and kept in a uniform grid so each overlap test only
+# looks at nearby labels. Between timeline stops the placement is extended instead
+# of recomputed, so labels that are already on screen stay put.
+
+KIND_PRIORITY = {"project": 0, "experience": 1, "outcome": 2, "tool": 3, "leadership": 4, "tag": 5}
+
+CHAR_PX = 6.8       # average glyph width at the default 12px font
+LINE_PX = 15.0
+GAP_PX = 3.0        # space between marker and the text below it
+PAD_PX = 4.0
+
+# nominal drawing area of the graph subplot (used to map data units to pixels)
+PLOT_WIDTH_PX = 1000.0
+PLOT_HEIGHT_PX = 420.0
+
+Box = Tuple[float, float, float, float]  # x0, y0, x1, y1 in pixels
+
+
+def _overlap(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class GridIndex:
+    def __init__(self, cell_px: float = 64.0):
+        self.cell_px = cell_px
+        self.cells: Dict[Tuple[int, int], List[Box]] = {}
+
+    def _cells(self, box: Box):
+        c = self.cell_px
+        for i in range(floor(box[0] / c), floor(box[2] / c) + 1):
+            for j in range(floor(box[1] / c), floor(box[3] / c) + 1):
+                yield (i, j)
+
+    def overlaps(self, box: Box) -> bool:
+        for cell in self._cells(box):
+            for other in self.cells.get(cell, ()):
+                if _overlap(box, other):
+                    return True
+        return False
+
+    def insert(self, box: Box) -> None:
+        for cell in self._cells(box):
+            self.cells.setdefault(cell, []).append(box)
+
+
+def pixel_scale(pos: Dict[str, Tuple[float, float]]) -> Tuple[float, float]:
+    if not pos:
+        return 1.0, 1.0
+    xs = [p[0] for p in pos.values()]
+    ys = [p[1] for p in pos.values()]
+    # plotly autorange pads the data span by a few percent on each side
+    span_x = (max(xs) - min(xs)) * 1.1 or 1.0
+    span_y = (max(ys) - min(ys)) * 1.1 or 1.0
+    return PLOT_WIDTH_PX / span_x, PLOT_HEIGHT_PX / span_y
+
+
+class LabelPlacer:
+    def __init__(
+        self,
+        pos: Dict[str, Tuple[float, float]],
+        labels: Dict[str, str],
+        marker_px: Dict[str, float],
+        priority: Dict[str, tuple],
+    ):
+        self.pos = pos
+        self.labels = labels
+        self.marker_px = marker_px
+        self.priority = priority
+        self.sx, self.sy = pixel_scale(pos)
+        self._visible: Optional[Set[str]] = None
+        self._placed: Set[str] = set()
+        self._index = GridIndex()
+
+    def _box(self, nid: str) -> Box:
+        x, y = self.pos[nid]
+        cx, cy = x * self.sx, y * self.sy
+        half_w = len(self.labels.get(nid, nid)) * CHAR_PX / 2.0 + PAD_PX
+        top = cy - self.marker_px.get(nid, 14.0) / 2.0 - GAP_PX
+        return (cx - half_w, top - LINE_PX, cx + half_w, top)
+
+    def place(self, visible: Set[str]) -> Set[str]:
+        visible = {nid for nid in visible if nid in self.pos}
+        if self._visible is not None and self._visible <= visible:
+            candidates = visible - self._visible
+        else:
+            # something left the frame: start over
+            self._placed = set()
+            self._index = GridIndex()
+            candidates = visible
+
+        for nid in sorted(candidates, key=lambda n: self.priority.get(n, (99,))):
+            box = self._box(nid)
+            if not self._index.overlaps(box):
+                self._index.insert(box)
+                self._placed.add(nid)
+
+        self._visible = visible
+        return set(self._placed)
+
+
+def label_priority(
+    kinds: Dict[str, str],
+    degree: Dict[str, int],
+    labels: Dict[str, str],
+    selected: Optional[str] = None,
+    neigh: Optional[Set[str]] = None,
+) -> Dict[str, tuple]:
+    neigh = neigh or set()
+    priority = {}
+    for nid, kind in kinds.items():
+        spot = 0 if nid == selected else (1 if nid in neigh else 2)
+        priority[nid] = (spot, KIND_PRIORITY.get(kind, 9), -degree.get(nid, 0), labels.get(nid, nid).lower())
+    return priority
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import argparse
+import os
+import random
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+from streamlit.testing.v1 import AppTest
+
+
+# Local load test: many simulated sessions drive app.py in-process through Streamlit's
+# AppTest API, each running a scripted mix of interactions. Reports rerun latency
+# percentiles, throughput and process RSS.
+#
+#   python loadtest.py --sessions 16 --steps 25
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+LAYER_TOGGLES = ["Experiences", "Projects", "Tools", "Outcomes (metrics)", "Leadership", "Tags"]
+
+
+@dataclass
+class SessionStats:
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: int = 0
+
+    def record(self, action: str, seconds: float) -> None:
+        self.latencies.setdefault(action, []).append(seconds)
+
+
+def _widget(elements, label: str):
+    for el in elements:
+        if el.label == label:
+            return el
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def _toggle_layer(at: AppTest, rng: random.Random) -> None:
+    t = _widget(at.toggle, rng.choice(LAYER_TOGGLES))
+    t.set_value(not t.value)
+
+
+def _tool_filter(at: AppTest, rng: random.Random) -> None:
+    sb = _widget(at.selectbox, "Filter projects by tool")
+    sb.set_value(rng.choice(sb.options))
+
+
+def _spotlight(at: AppTest, rng: random.Random) -> None:
+    sb = _widget(at.selectbox, "Spotlight")
+    sb.set_value(rng.choice(sb.options))
+
+
+def _spacing(at: AppTest, rng: random.Random) -> None:
+    label = rng.choice(["Column spacing", "Vertical spacing"])
+    s = _widget(at.slider, label)
+    s.set_value(round(rng.uniform(s.min, s.max), 1))
+
+
+ACTIONS: Dict[str, Callable[[AppTest, random.Random], None]] = {
+    "toggle_layer": _toggle_layer,
+    "tool_filter": _tool_filter,
+    "spotlight": _spotlight,
+    "spacing": _spacing,
+}
+
+
+def run_session(session_id: int, steps: int, timeout: float, seed: int) -> SessionStats:
+    rng = random.Random(seed + session_id)
+    stats = SessionStats()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    try:
+        t0 = time.perf_counter()
+        at.run()
+        stats.record("initial", time.perf_counter() - t0)
+
+        # the selectbox Spotlight is what the server sees; click mode is browser-side
+        _widget(at.toggle, "Click nodes to spotlight").set_value(False)
+        at.run()
+    except Exception:
+        # a session that cannot start counts once and stops; the others carry on
+        stats.errors += 1
+        return stats
+
+    for _ in range(steps):
+        name = rng.choice(list(ACTIONS))
+        try:
+            ACTIONS[name](at, rng)
+        except LookupError:
+            continue  # e.g. spotlight options changed under us
+        except Exception:
+            stats.errors += 1
+            continue
+        t0 = time.perf_counter()
+        try:
+            at.run()
+        except Exception:
+            # e.g. a rerun timeout: an error for this step, not the end of the load test
+            stats.errors += 1
+            continue
+        stats.record(name, time.perf_counter() - t0)
+        if at.exception:
+            stats.errors += 1
+    return stats
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # peak rather than current RSS; KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (2**20 if os.uname().sysname == "Darwin" else 2**10)
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _row(name: str, values: List[float]) -> str:
+    ms = [v * 1000 for v in values]
+    return (
+        f"{name:<14}{len(ms):>7}{percentile(ms, 0.50):>10.1f}{percentile(ms, 0.95):>10.1f}"
+        f"{percentile(ms, 0.99):>10.1f}{max(ms, default=0.0):>10.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for app.py")
+    parser.add_argument("--sessions", type=int, default=8, help="simulated concurrent sessions")
+    parser.add_argument("--steps", type=int, default=20, help="interactions per session")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-rerun timeout (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rss_before = rss_mb()
+    peak = [rss_before]
+    done = threading.Event()
+
+    def sample_rss():
+        while not done.wait(0.25):
+            peak[0] = max(peak[0], rss_mb())
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        futures = [pool.submit(run_session, i, args.steps, args.timeout, args.seed) for i in range(args.sessions)]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - t0
+    done.set()
+    sampler.join()
+
+    merged: Dict[str, List[float]] = {}
+    for stats in results:
+        for name, values in stats.latencies.items():
+            merged.setdefault(name, []).extend(values)
+    # one population for both the summary row and throughput: every timed run,
+    # initial page loads included (wall time covers them too)
+    everything = [v for values in merged.values() for v in values]
+    errors = sum(s.errors for s in results)
+
+    print(f"sessions={args.sessions} steps={args.steps} wall={wall:.2f}s")
+    print(f"{'action':<14}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name in sorted(merged):
+        print(_row(name, merged[name]))
+    print(_row("all runs", everything))
+    print(f"throughput: {len(everything) / wall:.1f} runs/s   errors: {errors}")
+    print(f"rss: {rss_before:.0f} MB before, {peak[0]:.0f} MB peak, {rss_mb():.0f} MB after")
+
+
+if __name__ == "__main__":
+    main()
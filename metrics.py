@@ -0,0 +1,229 @@
+from __future__ import annotations
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Process-wide metrics: counters, gauges and histograms, rendered in the Prometheus text
+# format (api.py serves it at /metrics; the app can flush it to a file for a textfile
+# scraper). Recording never takes a lock: every thread writes its own cell and only
+# render() walks the cells, so concurrent sessions don't contend on a hot metric.
+#
+#   RESUME_GRAPH_METRICS_FILE=/var/lib/node_exporter/resume_graph.prom streamlit run app.py
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1e4, 3e4, 1e5, 3e5, 1e6, 3e6, 1e7, 3e7)
+FLUSH_INTERVAL = 15.0
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Cells:
+    # one list per writing thread; the lock is only taken the first time a thread
+    # touches the metric, which is also when cells of finished threads are folded away
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._cells: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * size
+        self._lock = threading.Lock()
+
+    def cell(self) -> List[float]:
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = [0.0] * self._size
+            with self._lock:
+                live = []
+                for thread, c in self._cells:
+                    if thread.is_alive():
+                        live.append((thread, c))
+                    else:
+                        self._retired = [a + b for a, b in zip(self._retired, c)]
+                self._cells = live + [(threading.current_thread(), cell)]
+            self._local.cell = cell
+        return cell
+
+    def total(self) -> List[float]:
+        with self._lock:
+            out = list(self._retired)
+            cells = [c for _, c in self._cells]
+        for cell in cells:
+            for i, v in enumerate(cell):
+                out[i] += v
+        return out
+
+
+class Counter:
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    def value(self) -> float:
+        return self._cells.total()[0]
+
+
+class Gauge:
+    def __init__(self):
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def value(self) -> float:
+        return self._value
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # per cell: one count per bucket (non-cumulative), then +Inf, sum, count
+        self._cells = _Cells(len(self.buckets) + 3)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        # (cumulative bucket counts incl. +Inf, sum, count)
+        total = self._cells.total()
+        cumulative, running = [], 0.0
+        for v in total[:-2]:
+            running += v
+            cumulative.append(running)
+        return cumulative, total[-2], total[-1]
+
+
+class _Family:
+    def __init__(self, name: str, help: str, kind: str, make):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self._make = make
+        self._children: Dict[LabelKey, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels: str):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._make())
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(dict(self._children).items()):
+            if isinstance(child, Histogram):
+                cumulative, total, count = child.snapshot()
+                for bound, n in zip(child.buckets + (math.inf,), cumulative):
+                    le = key + (("le", _number(bound)),)
+                    lines.append(f"{self.name}_bucket{_labels(le)} {_number(n)}")
+                lines.append(f"{self.name}_sum{_labels(key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(key)} {_number(count)}")
+            else:
+                lines.append(f"{self.name}{_labels(key)} {_number(child.value())}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def _family(self, name: str, help: str, kind: str, make) -> _Family:
+        family = self._families.get(name)
+        if family is None:
+            with self._lock:
+                family = self._families.setdefault(name, _Family(name, help, kind, make))
+        if family.kind != kind:
+            raise ValueError(f"Metric {name!r} is already registered as a {family.kind}")
+        return family
+
+    def counter(self, name: str, help: str, **labels: str) -> Counter:
+        return self._family(name, help, "counter", Counter).labels(**labels)
+
+    def gauge(self, name: str, help: str, **labels: str) -> Gauge:
+        return self._family(name, help, "gauge", Gauge).labels(**labels)
+
+    def histogram(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **labels: str) -> Histogram:
+        return self._family(name, help, "histogram", lambda: Histogram(buckets)).labels(**labels)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name in sorted(self._families):
+            lines += self._families[name].render()
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        # atomic replace, so a scraper never reads a half-written file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+class FileFlusher:
+    def __init__(self, path: str, interval: float = FLUSH_INTERVAL, registry: Registry = REGISTRY):
+        self.path = path
+        self.interval = interval
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+
+    def start(self) -> "FileFlusher":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.registry.write(self.path)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.registry.write(self.path)
+
+
+def flush_to_file(path: Optional[str] = None, interval: float = FLUSH_INTERVAL) -> Optional[FileFlusher]:
+    path = path or os.environ.get("RESUME_GRAPH_METRICS_FILE")
+    if not path:
+        return None
+    return FileFlusher(path, interval).start()
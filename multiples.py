@@ -0,0 +1,188 @@
+from __future__ import annotations
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+import networkx as nx
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from graph_utils import (
+    EDGE_COLOR, KIND_COLORS, KIND_STYLES, LAYOUT_GAP, LAYOUT_SPREAD,
+    compute_positions, spacing_ranges, timeline_controls,
+)
+
+
+# Small multiples: one mini timeline per project, side by side under one shared slider.
+# A panel is the project's ego network (its tool / outcome neighbors), taken as a
+# subgraph view of the shared graph, so node and edge data are never copied; the
+# per-stop visible sets are the ones the main timeline already computed, turned once into
+# a (stops, nodes) boolean matrix that every panel slices by its ego ids. Panels are
+# stitched into one figure, where each timeline frame updates every panel at once.
+
+MULTIPLE_KINDS = ("project", "tool", "outcome")
+MAX_PANELS = 12
+PANEL_COLUMNS = 3
+PANEL_HEIGHT = 240
+
+
+@dataclass(frozen=True)
+class Panel:
+    project: str
+    title: str
+    ids: Tuple[str, ...]            # project first
+    x: np.ndarray
+    y: np.ndarray
+    ranges: Tuple[List[float], List[float]]
+    opacity: np.ndarray             # (stops, nodes) 1.0 where visible
+    edges_x: Tuple[np.ndarray, ...]  # per stop, NaN-separated segments
+    edges_y: Tuple[np.ndarray, ...]
+
+
+def ego_ids(G: nx.Graph, project: str, enabled_kinds: Set[str]) -> List[str]:
+    neighbors = [
+        nid for nid in G.neighbors(project)
+        if G.nodes[nid].get("kind") in MULTIPLE_KINDS[1:] and G.nodes[nid].get("kind") in enabled_kinds
+    ]
+    return [project] + sorted(neighbors, key=lambda nid: str(G.nodes[nid].get("label", nid)).lower())
+
+
+def visibility_matrix(index: Dict[str, int], visible_nodes_by_date: List[Set[str]]) -> np.ndarray:
+    # (stops, len(index)) True where the node is visible at that stop
+    shown = np.zeros((len(visible_nodes_by_date), len(index)), dtype=bool)
+    for s, visible in enumerate(visible_nodes_by_date):
+        shown[s, [index[nid] for nid in visible if nid in index]] = True
+    return shown
+
+
+def build_panel(
+    G: nx.Graph,
+    project: str,
+    ids: List[str],
+    shown: np.ndarray,
+) -> Panel:
+    H = G.subgraph(ids)
+    pos = compute_positions(H, list(MULTIPLE_KINDS), LAYOUT_GAP, LAYOUT_SPREAD)
+    index = {nid: i for i, nid in enumerate(ids)}
+    x = np.array([pos[nid][0] for nid in ids], dtype=np.float32)
+    y = np.array([pos[nid][1] for nid in ids], dtype=np.float32)
+    pairs = np.array([(index[u], index[v]) for u, v in H.edges()], dtype=np.int64).reshape(-1, 2)
+    eu, ev = pairs[:, 0], pairs[:, 1]
+
+    # every edge as a NaN-terminated segment; a stop keeps the rows with both ends shown
+    segments_x = np.full((len(eu), 3), np.nan, dtype=np.float32)
+    segments_y = np.full((len(eu), 3), np.nan, dtype=np.float32)
+    segments_x[:, 0], segments_x[:, 1] = x[eu], x[ev]
+    segments_y[:, 0], segments_y[:, 1] = y[eu], y[ev]
+    on = shown[:, eu] & shown[:, ev]
+    edges_x = [segments_x[row].ravel() for row in on]
+    edges_y = [segments_y[row].ravel() for row in on]
+
+    return Panel(
+        project=project,
+        title=str(G.nodes[project].get("label", project)),
+        ids=tuple(ids),
+        x=x,
+        y=y,
+        ranges=spacing_ranges(pos),
+        opacity=shown.astype(np.float32),
+        edges_x=tuple(edges_x),
+        edges_y=tuple(edges_y),
+    )
+
+
+def build_panels(
+    G: nx.Graph,
+    projects: List[str],
+    visible_nodes_by_date: List[Set[str]],
+    enabled_kinds: Set[str],
+) -> List[Panel]:
+    egos = [ego_ids(G, p, enabled_kinds) for p in projects]
+    index: Dict[str, int] = {}
+    for ids in egos:
+        for nid in ids:
+            index.setdefault(nid, len(index))
+    shown = visibility_matrix(index, visible_nodes_by_date)
+    return [
+        build_panel(G, p, ids, shown[:, [index[nid] for nid in ids]])
+        for p, ids in zip(projects, egos)
+    ]
+
+
+def plot_small_multiples(
+    G: nx.Graph,
+    projects: List[str],
+    dates: List,
+    visible_nodes_by_date: List[Set[str]],
+    enabled_kinds: Set[str],
+    date_labels: Optional[List[str]] = None,
+    frame_ms: int = 1000,
+    columns: int = PANEL_COLUMNS,
+) -> go.Figure:
+    projects = projects[:MAX_PANELS]
+    panels = build_panels(G, projects, visible_nodes_by_date, enabled_kinds)
+    if date_labels is None:
+        date_labels = [d.strftime("%b %Y") for d in dates]
+    columns = max(1, min(columns, len(panels)))
+    rows = max(1, math.ceil(len(panels) / columns))
+
+    fig = make_subplots(
+        rows=rows, cols=columns,
+        subplot_titles=[p.title for p in panels],
+        horizontal_spacing=0.03,
+        vertical_spacing=0.12 / rows,
+    )
+    last = len(dates) - 1
+    for i, p in enumerate(panels):
+        row, col = i // columns + 1, i % columns + 1
+        kinds = [G.nodes[nid].get("kind") for nid in p.ids]
+        fig.add_trace(go.Scatter(
+            x=p.edges_x[last] if dates else [], y=p.edges_y[last] if dates else [],
+            mode="lines",
+            line=dict(width=1.4, color=EDGE_COLOR),
+            hoverinfo="none",
+            showlegend=False,
+        ), row=row, col=col)
+        fig.add_trace(go.Scatter(
+            x=p.x, y=p.y,
+            mode="markers",
+            marker=dict(
+                color=[KIND_COLORS.get(k, "#2563eb") for k in kinds],
+                symbol=[KIND_STYLES.get(k, {"symbol": "circle"})["symbol"] for k in kinds],
+                size=[KIND_STYLES.get(k, {"size": 14})["size"] * 0.7 for k in kinds],
+                opacity=p.opacity[last] if dates else 1.0,
+                line=dict(width=1.0, color="rgba(15,23,42,0.45)"),
+            ),
+            hovertext=[str(G.nodes[nid].get("label", nid)) for nid in p.ids],
+            hoverinfo="text",
+            customdata=list(p.ids),
+            showlegend=False,
+        ), row=row, col=col)
+        fig.update_xaxes(visible=False, range=p.ranges[0], row=row, col=col)
+        fig.update_yaxes(visible=False, range=p.ranges[1], row=row, col=col)
+
+    fig.update_annotations(font=dict(size=13, color="rgba(255,255,255,.85)"))
+    fig.update_layout(
+        height=PANEL_HEIGHT * rows + 90,
+        margin=dict(l=8, r=8, t=30, b=70),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        hoverlabel=dict(bgcolor="rgba(15,23,42,.92)", font=dict(color="white")),
+        font=dict(color="rgba(255,255,255,.85)"),
+        **timeline_controls(dates, date_labels, frame_ms),
+    )
+
+    # every frame updates all panels: (edges, nodes) per panel, in trace order
+    full = fig.to_dict()
+    axes = [{"xaxis": t["xaxis"], "yaxis": t["yaxis"]} for t in full["data"]]
+    traces = list(range(2 * len(panels)))
+    frames = []
+    for s, d in enumerate(dates):
+        data = []
+        for i, p in enumerate(panels):
+            data.append(dict(axes[2 * i], type="scatter", x=p.edges_x[s], y=p.edges_y[s]))
+            data.append(dict(axes[2 * i + 1], type="scatter", marker={"opacity": p.opacity[s]}))
+        frames.append({"name": d.isoformat(), "data": data, "traces": traces})
+
+    full["frames"] = frames
+    return go.Figure(full, _validate=False)
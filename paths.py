@@ -0,0 +1,232 @@
+from __future__ import annotations
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import RLock
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+import numpy as np
+
+from centrality import SparseGraph, _expand, sparse_graph
+from graph_store import ChangeSet, GraphStore
+
+
+# Connection queries between two nodes over the CSR arrays from centrality.py. The hop
+# shortest path is a vectorized bidirectional BFS; weighted and top-k routes use
+# bidirectional Dijkstra (edge cost = 1 / Edge.weight, so strong links are short) inside
+# Yen's algorithm. Results are cached per graph version.
+
+MAX_ROUTES = 5
+RESULT_CACHE_SIZE = 1024   # (source, target, k, weighted, kinds) queries kept per graph version
+
+
+@dataclass(frozen=True)
+class Path:
+    nodes: Tuple[str, ...]
+    cost: float
+
+    @property
+    def hops(self) -> int:
+        return len(self.nodes) - 1
+
+    @property
+    def edges(self) -> List[Tuple[str, str]]:
+        return list(zip(self.nodes, self.nodes[1:]))
+
+
+def bidirectional_bfs(g: SparseGraph, s: int, t: int, mask: np.ndarray) -> Optional[List[int]]:
+    if s == t:
+        return [s]
+    dist = [np.full(g.n, -1, dtype=np.int64), np.full(g.n, -1, dtype=np.int64)]
+    parent = [np.full(g.n, -1, dtype=np.int64), np.full(g.n, -1, dtype=np.int64)]
+    dist[0][s] = dist[1][t] = 0
+    frontiers = [np.array([s], dtype=np.int64), np.array([t], dtype=np.int64)]
+    depth = [0, 0]
+
+    while frontiers[0].size and frontiers[1].size:
+        # grow the smaller side by one full level
+        side = 0 if frontiers[0].size <= frontiers[1].size else 1
+        other = 1 - side
+        parents, nbrs = _expand(g, frontiers[side])
+        ok = mask[nbrs] & (dist[side][nbrs] == -1)
+        parents, nbrs = parents[ok], nbrs[ok]
+        fresh, first = np.unique(nbrs, return_index=True)
+        depth[side] += 1
+        dist[side][fresh] = depth[side]
+        parent[side][fresh] = parents[first]
+
+        meet = fresh[dist[other][fresh] >= 0]
+        if meet.size:
+            m = int(meet[np.argmin(dist[other][meet])])
+            half = [m]
+            while half[-1] != s:
+                half.append(int(parent[0][half[-1]]))
+            path = half[::-1]
+            while path[-1] != t:
+                path.append(int(parent[1][path[-1]]))
+            return path
+        frontiers[side] = fresh
+    return None
+
+
+class _Adjacency:
+    # plain-list CSR copy: heap searches index single elements, which numpy makes slow
+    def __init__(self, g: SparseGraph, weighted: bool):
+        self.indptr = g.indptr.tolist()
+        self.indices = g.indices.tolist()
+        if weighted:
+            w = np.maximum(g.csr_weight, 1e-9)
+            self.cost = (1.0 / w).tolist()
+        else:
+            self.cost = [1.0] * len(self.indices)
+
+    def edge_cost(self, u: int, v: int) -> float:
+        for j in range(self.indptr[u], self.indptr[u + 1]):
+            if self.indices[j] == v:
+                return self.cost[j]
+        raise KeyError((u, v))
+
+
+def bidirectional_dijkstra(
+    adj: _Adjacency,
+    s: int,
+    t: int,
+    allowed: List[bool],
+    banned_nodes: Set[int] = frozenset(),
+    banned_edges: Set[Tuple[int, int]] = frozenset(),
+) -> Optional[Tuple[float, List[int]]]:
+    if s == t:
+        return 0.0, [s]
+    indptr, indices, cost = adj.indptr, adj.indices, adj.cost
+    dist: List[Dict[int, float]] = [{s: 0.0}, {t: 0.0}]
+    parent: List[Dict[int, int]] = [{s: -1}, {t: -1}]
+    heaps = [[(0.0, s)], [(0.0, t)]]
+    settled: List[Set[int]] = [set(), set()]
+    best, meet = float("inf"), -1
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+        mine, theirs = dist[side], dist[1 - side]
+        for j in range(indptr[u], indptr[u + 1]):
+            v = indices[j]
+            if not allowed[v] or v in banned_nodes:
+                continue
+            if banned_edges and ((u, v) if u < v else (v, u)) in banned_edges:
+                continue
+            nd = d + cost[j]
+            if nd < mine.get(v, float("inf")):
+                mine[v] = nd
+                parent[side][v] = u
+                heapq.heappush(heaps[side], (nd, v))
+            if v in theirs and mine[v] + theirs[v] < best:
+                best, meet = mine[v] + theirs[v], v
+
+    if meet < 0:
+        return None
+    half = [meet]
+    while half[-1] != s:
+        half.append(parent[0][half[-1]])
+    path = half[::-1]
+    while path[-1] != t:
+        path.append(parent[1][path[-1]])
+    return best, path
+
+
+def k_shortest_paths(adj: _Adjacency, s: int, t: int, allowed: List[bool], k: int) -> List[Tuple[float, List[int]]]:
+    # Yen's algorithm: each spur search bans the prefix nodes and the edges earlier
+    # routes took out of the spur node
+    first = bidirectional_dijkstra(adj, s, t, allowed)
+    if first is None:
+        return []
+    routes = [first]
+    seen = {tuple(first[1])}
+    candidates: List[Tuple[float, List[int]]] = []
+
+    while len(routes) < k:
+        prev = routes[-1][1]
+        root_cost = 0.0
+        for i in range(len(prev) - 1):
+            spur, root = prev[i], prev[:i + 1]
+            banned_edges = set()
+            for _, p in routes:
+                if p[:i + 1] == root and len(p) > i + 1:
+                    a, b = p[i], p[i + 1]
+                    banned_edges.add((a, b) if a < b else (b, a))
+            found = bidirectional_dijkstra(adj, spur, t, allowed, set(root[:-1]), banned_edges)
+            if found is not None:
+                path = root[:-1] + found[1]
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heapq.heappush(candidates, (root_cost + found[0], path))
+            root_cost += adj.edge_cost(prev[i], prev[i + 1])
+        if not candidates:
+            break
+        routes.append(heapq.heappop(candidates))
+    return routes
+
+
+class PathIndex:
+    def __init__(self, store: GraphStore):
+        self.store = store
+        self._lock = RLock()
+        self._graphs: Dict[Hashable, SparseGraph] = {}
+        self._adjacency: Dict[Hashable, _Adjacency] = {}
+        self._results: "OrderedDict[Hashable, List[Path]]" = OrderedDict()
+        store.subscribe(self._on_change)
+
+    def _on_change(self, changes: ChangeSet) -> None:
+        # one new edge can shorten any route
+        with self._lock:
+            self._graphs.clear()
+            self._adjacency.clear()
+            self._results.clear()
+
+    def _graph(self, kinds: Optional[FrozenSet[str]]) -> SparseGraph:
+        g = self._graphs.get(kinds)
+        if g is None:
+            g = sparse_graph(self.store, kinds)
+            self._graphs[kinds] = g
+        return g
+
+    def paths(
+        self,
+        source: str,
+        target: str,
+        k: int = 1,
+        weighted: bool = False,
+        enabled_kinds: Optional[Set[str]] = None,
+    ) -> List[Path]:
+        kinds = frozenset(enabled_kinds) if enabled_kinds is not None else None
+        k = max(1, min(k, MAX_ROUTES))
+        key = (source, target, k, weighted, kinds)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+
+            g = self._graph(kinds)
+            s, t = g.index.get(source), g.index.get(target)
+            if s is None or t is None:
+                routes = []
+            elif k == 1 and not weighted:
+                found = bidirectional_bfs(g, s, t, np.ones(g.n, dtype=bool))
+                routes = [] if found is None else [(float(len(found) - 1), found)]
+            else:
+                adj_key = (kinds, weighted)
+                adj = self._adjacency.get(adj_key)
+                if adj is None:
+                    adj = _Adjacency(g, weighted)
+                    self._adjacency[adj_key] = adj
+                routes = k_shortest_paths(adj, s, t, [True] * g.n, k)
+
+            cached = [Path(nodes=tuple(g.ids[i] for i in p), cost=float(c)) for c, p in routes]
+            self._results[key] = cached
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+            return cached
@@ -0,0 +1,228 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import RLock
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from data import Node
+from graph_store import ChangeSet, GraphStore
+from resolve import match_key
+
+
+# Typed quantities parsed out of free text: every Node.metric segment ("45ms latency",
+# "150GB+ climate pipelines", "$10–15M allocation") and every outcome label becomes
+# (quantity, unit, value) measures in a canonical unit (ms, GB, %, ×, USD, plain counts).
+# Measures sit in a columnar index sorted by (quantity, unit, value); a range query like
+# "latency < 50 ms" or "AUC >= 0.9" finds its group and binary-searches the value
+# column, so lookups stay logarithmic however many outcomes there are. Text is parsed
+# once per node and re-parsed only for nodes an edit touched.
+
+SEPARATORS = re.compile(r"\s*(?:•|;|\|)\s*")
+SCORES = frozenset({"auc", "f1", "accuracy", "precision", "recall", "r2", "rmse", "mae", "ndcg", "bleu", "map"})
+MAGNITUDES = {"k": 1e3, "K": 1e3, "M": 1e6, "B": 1e9, "bn": 1e9}
+SIZES = {"KB": 1e-6, "MB": 1e-3, "GB": 1.0, "TB": 1e3, "PB": 1e6}             # -> GB
+TIMES = {  # -> ms
+    "ms": 1.0, "s": 1e3, "sec": 1e3, "secs": 1e3, "second": 1e3, "seconds": 1e3,
+    "min": 6e4, "mins": 6e4, "minute": 6e4, "minutes": 6e4, "h": 3.6e6, "hr": 3.6e6, "hrs": 3.6e6, "hour": 3.6e6, "hours": 3.6e6,
+}
+CURRENCIES = {"$": "USD", "€": "EUR", "£": "GBP"}
+# words that follow a number without naming it ("from 200ms to 45ms", "10k in 2023")
+STOPWORDS = frozenset({"a", "an", "and", "at", "by", "for", "from", "in", "of", "on", "or", "per", "than", "the", "to", "vs", "with"})
+DEFAULT_QUANTITY = {"ms": "latency", "GB": "data", "%": "percent", "×": "speedup", "USD": "money", "EUR": "money", "GBP": "money"}
+
+_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+"
+_UNIT = r"%|[x×](?![A-Za-z])|[KMGTP]B\b|ms\b|secs?\b|seconds?\b|mins?\b|minutes?\b|hrs?\b|hours?\b|[sh]\b|bn\b|[kKMB]\b"
+# a number starts a token: not the 1 of "F1", the 99 of "p99" or the -19 of "COVID-19"
+MEASURE = re.compile(
+    rf"(?P<cur>[$€£])?(?<![\w.])(?P<sign>[+\-−])?(?<![\w.][+\-−])(?P<num>{_NUMBER})"
+    rf"(?:\s*[–\-]\s*[$€£]?(?P<hi>{_NUMBER}))?"
+    rf"(?:\s?(?P<unit>{_UNIT}))?\+?"
+    rf"(?P<after>\s+[A-Za-z][\w²]*)?"
+)
+# "AUC 0.91", "AUC of 0.91", "AUC: 0.91", "F1 score 0.88"
+BEFORE = re.compile(r"([A-Za-z][\w²]*)(?:\s+scores?)?(?:\s*:\s*|\s+)(?:of\s+)?$")
+QUERY = re.compile(
+    rf"^\s*(?P<quantity>[^<>=≤≥]*?)\s*(?P<op><=|>=|==|=|<|>|≤|≥)\s*"
+    rf"(?P<cur>[$€£])?(?P<sign>[+\-−])?(?P<num>{_NUMBER})\s?(?P<unit>{_UNIT})?\s*$"
+)
+OPS = {"<": "<", "<=": "<=", "≤": "<=", ">": ">", ">=": ">=", "≥": ">=", "=": "=", "==": "="}
+
+
+@dataclass(frozen=True)
+class Measure:
+    node: str
+    quantity: str     # match key of the measured thing: "latency", "auc", "node", "percent"
+    unit: str         # canonical unit ("" for scores and counts)
+    value: float
+    text: str         # the segment it came from
+
+
+@dataclass(frozen=True)
+class Query:
+    quantity: Optional[str]   # None: every quantity in the unit
+    unit: Optional[str]
+    op: str
+    value: float
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+def _scaled(value: float, unit: Optional[str], cur: Optional[str]) -> Tuple[float, str]:
+    # value in the canonical unit, and that unit
+    if unit in SIZES:
+        return value * SIZES[unit], "GB"
+    if unit in TIMES:
+        return value * TIMES[unit], "ms"
+    if unit == "%":
+        return value, "%"
+    if unit in ("x", "×"):
+        return value, "×"
+    if unit in MAGNITUDES:
+        value *= MAGNITUDES[unit]
+    return value, CURRENCIES.get(cur, "")
+
+
+@lru_cache(maxsize=4096)
+def _word(text: Optional[str]) -> str:
+    # the same key for "class" / "classes" and "company" / "companies"
+    key = match_key(text.strip()) if text else ""
+    if key.endswith("ie"):
+        return key[:-2] + "y"
+    if key.endswith(("sse", "che", "she", "xe")):
+        return key[:-1]
+    return key
+
+
+def parse_measures(nid: str, text: str) -> List[Measure]:
+    out: List[Measure] = []
+    for segment in SEPARATORS.split(text or ""):
+        for m in MEASURE.finditer(segment):
+            unit, cur, num = m.group("unit"), m.group("cur"), m.group("num")
+            after = _word(m.group("after"))
+            if after in STOPWORDS:
+                after = ""
+            before = BEFORE.search(segment, max(0, m.start() - 24), m.start())
+            before = _word(before.group(1)) if before else ""
+            # scores name themselves on either side ("0.91 AUC", "AUC of 0.91")
+            quantity = before if before in SCORES else after if after in SCORES else ""
+            if unit is None and cur is None and not quantity:
+                if not after or re.fullmatch(r"(19|20)\d\d", num):
+                    continue   # a bare number or a year ("2010–2024 macro coverage")
+            sign = -1.0 if m.group("sign") in ("-", "−") else 1.0
+            # a range ("$10–15M", "20–30 ms") is indexed at both ends
+            for n in [num] + ([m.group("hi")] if m.group("hi") else []):
+                value, canonical = _scaled(sign * _number(n), unit, cur)
+                q = quantity or (after if canonical == "ms" and after else DEFAULT_QUANTITY.get(canonical, after))
+                if q:
+                    out.append(Measure(nid, q, canonical, value, segment))
+    return out
+
+
+def node_measures(node: Node) -> List[Measure]:
+    measures = parse_measures(node.id, node.metric)
+    if node.kind == "outcome":
+        measures += parse_measures(node.id, node.label)
+    return measures
+
+
+def parse_query(text: str) -> Query:
+    # "<quantity> <op> <number>[unit]": "latency < 50 ms", "AUC ≥ 0.9", "data >= 1TB",
+    # "< 100 ms" (every time quantity), "node >= 10k"
+    m = QUERY.match(text or "")
+    if m is None:
+        raise ValueError(f"Not a range query: {text!r} (try 'latency < 50 ms' or 'AUC >= 0.9')")
+    unit, cur = m.group("unit"), m.group("cur")
+    sign = -1.0 if m.group("sign") in ("-", "−") else 1.0
+    value, canonical = _scaled(sign * _number(m.group("num")), unit, cur)
+    quantity = _word(m.group("quantity")) or None
+    if quantity is None and not canonical:
+        raise ValueError(f"Say what to compare in {text!r}, e.g. 'AUC >= 0.9'")
+    # plain magnitudes (10k) and scores carry no unit of their own
+    return Query(quantity=quantity, unit=canonical or None, op=OPS[m.group("op")], value=value)
+
+
+@dataclass(frozen=True)
+class MeasureColumns:
+    groups: Tuple[Tuple[str, str], ...]   # sorted (quantity, unit)
+    offsets: np.ndarray                   # group g is rows offsets[g]:offsets[g + 1]
+    values: np.ndarray                    # sorted within each group
+    rows: np.ndarray                      # row -> position in measures
+    measures: Tuple[Measure, ...]
+
+    def _span(self, g: int, op: str, value: float) -> Tuple[int, int]:
+        lo, hi = int(self.offsets[g]), int(self.offsets[g + 1])
+        col = self.values[lo:hi]
+        if op == "<":
+            return lo, lo + int(np.searchsorted(col, value, side="left"))
+        if op == "<=":
+            return lo, lo + int(np.searchsorted(col, value, side="right"))
+        if op == ">":
+            return lo + int(np.searchsorted(col, value, side="right")), hi
+        if op == ">=":
+            return lo + int(np.searchsorted(col, value, side="left")), hi
+        return lo + int(np.searchsorted(col, value, side="left")), lo + int(np.searchsorted(col, value, side="right"))
+
+    def select(self, query: Query) -> List[Measure]:
+        out: List[Measure] = []
+        for g, (quantity, unit) in enumerate(self.groups):
+            if query.quantity is not None and quantity != query.quantity:
+                continue
+            if query.unit is not None and unit != query.unit:
+                continue
+            a, b = self._span(g, query.op, query.value)
+            out += [self.measures[i] for i in self.rows[a:b].tolist()]
+        return out
+
+
+def measure_columns(measures: List[Measure]) -> MeasureColumns:
+    groups = sorted({(m.quantity, m.unit) for m in measures})
+    code = {g: i for i, g in enumerate(groups)}
+    group = np.fromiter((code[(m.quantity, m.unit)] for m in measures), dtype=np.int64, count=len(measures))
+    values = np.fromiter((m.value for m in measures), dtype=np.float64, count=len(measures))
+    order = np.lexsort((values, group))
+    offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(group, minlength=len(groups)), out=offsets[1:])
+    return MeasureColumns(
+        groups=tuple(groups),
+        offsets=offsets,
+        values=values[order],
+        rows=order,
+        measures=tuple(measures),
+    )
+
+
+class QuantityIndex:
+    def __init__(self, store: GraphStore):
+        self.store = store
+        self._lock = RLock()
+        self._parsed: Dict[str, List[Measure]] = {nid: node_measures(n) for nid, n in store.nodes.items()}
+        self._columns: Optional[MeasureColumns] = None
+        store.subscribe(self._on_change)
+
+    def _on_change(self, changes: ChangeSet) -> None:
+        # only the edited nodes are re-parsed; the sort is redone on the next query
+        with self._lock:
+            for nid in changes.nodes:
+                node = self.store.nodes.get(nid)
+                if node is None:
+                    self._parsed.pop(nid, None)
+                else:
+                    self._parsed[nid] = node_measures(node)
+            self._columns = None
+
+    def columns(self) -> MeasureColumns:
+        with self._lock:
+            if self._columns is None:
+                self._columns = measure_columns([m for ms in self._parsed.values() for m in ms])
+            return self._columns
+
+    def query(self, text: str) -> List[Measure]:
+        # matches sorted by value; raises ValueError on a malformed query
+        return sorted(self.columns().select(parse_query(text)), key=lambda m: (m.value, m.node))
+
+    def quantities(self) -> List[Tuple[str, str]]:
+        return list(self.columns().groups)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from threading import RLock
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+import networkx as nx
+import numpy as np
+
+from graph_store import ChangeSet, GraphStore
+
+if TYPE_CHECKING:
+    from shared import GraphArrays
+
+
+# "Related items": projects / experiences that share tools, tags and outcomes (and, the
+# other way round, tools that show up in the same projects). Similarity is the sparse
+# product B·Bᵀ of the item × feature incidence matrix, computed row-batched as a two-hop
+# expansion over CSR arrays. Top-k lists are cached per node; after an edit only rows
+# whose similarities can have changed are recomputed. Over a published shared-memory
+# version the incidence comes from its CSR arrays and is built once.
+
+ITEM_KINDS = frozenset({"project", "experience", "leadership"})
+FEATURE_KINDS = frozenset({"tool", "tag", "outcome"})
+TOP_K = 5
+SIMILARITIES = ("jaccard", "cosine")
+PAIR_BUDGET = 2_000_000  # candidate pairs materialized per batch
+MAX_FANOUT = 1000        # features on more nodes than this are too common to mean "related"
+
+
+@dataclass(frozen=True)
+class Incidence:
+    ids: List[str]           # rows of this side
+    index: Dict[str, int]
+    indptr: np.ndarray       # row -> columns on the other side
+    indices: np.ndarray
+    degree: np.ndarray
+
+
+def _csr(n_rows: int, rows: np.ndarray, cols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols[order]
+
+
+def incidence(G: nx.Graph) -> Tuple[Incidence, Incidence]:
+    items = sorted(nid for nid, data in G.nodes(data=True) if data.get("kind") in ITEM_KINDS)
+    features = sorted(nid for nid, data in G.nodes(data=True) if data.get("kind") in FEATURE_KINDS)
+    item_index = {nid: i for i, nid in enumerate(items)}
+    feature_index = {nid: i for i, nid in enumerate(features)}
+
+    rows, cols = [], []
+    for u, v in G.edges():
+        if u in feature_index:
+            u, v = v, u
+        if u in item_index and v in feature_index:
+            rows.append(item_index[u])
+            cols.append(feature_index[v])
+    return incidence_sides(items, features, np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))
+
+
+def incidence_sides(items: List[str], features: List[str], r: np.ndarray, c: np.ndarray) -> Tuple[Incidence, Incidence]:
+    # (item row, feature column) pairs, one per item-feature edge
+    item_index = {nid: i for i, nid in enumerate(items)}
+    feature_index = {nid: i for i, nid in enumerate(features)}
+    sides = []
+    for ids, index, a, b in ((items, item_index, r, c), (features, feature_index, c, r)):
+        indptr, indices = _csr(len(ids), a, b)
+        sides.append(Incidence(ids=ids, index=index, indptr=indptr, indices=indices, degree=np.diff(indptr)))
+    return sides[0], sides[1]
+
+
+def _expand(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # (position in rows, neighbor) for every stored entry of the given rows
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return np.repeat(np.arange(len(rows)), counts), indices[np.arange(total) + offsets]
+
+
+def two_hop(side: Incidence, other: Incidence, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # hub features would make the product dense; like stop words they are skipped
+    p1, mid = _expand(side.indptr, side.indices, rows)
+    common = other.degree[mid] <= MAX_FANOUT
+    p1, mid = p1[common], mid[common]
+    p2, j = _expand(other.indptr, other.indices, mid)
+    return rows[p1][p2], j
+
+
+def _batches(side: Incidence, other: Incidence, rows: np.ndarray):
+    p1, mid = _expand(side.indptr, side.indices, rows)
+    fanout = np.where(other.degree[mid] <= MAX_FANOUT, other.degree[mid], 0)
+    work = np.cumsum(np.bincount(p1, weights=fanout, minlength=len(rows)))
+    start = 0
+    while start < len(rows):
+        base = work[start - 1] if start else 0.0
+        end = max(start + 1, int(np.searchsorted(work, base + PAIR_BUDGET, side="right")))
+        yield rows[start:end]
+        start = end
+
+
+def top_k_similar(
+    side: Incidence,
+    other: Incidence,
+    rows: np.ndarray,
+    k: int = TOP_K,
+    similarity: str = "jaccard",
+) -> Dict[int, List[Tuple[int, float]]]:
+    if similarity not in SIMILARITIES:
+        raise ValueError(f"Unknown similarity: {similarity!r}")
+    result: Dict[int, List[Tuple[int, float]]] = {}
+    for batch in _batches(side, other, rows):
+        result.update(_top_k_rows(side, other, batch, k, similarity))
+    return result
+
+
+def _top_k_rows(
+    side: Incidence,
+    other: Incidence,
+    rows: np.ndarray,
+    k: int,
+    similarity: str,
+) -> Dict[int, List[Tuple[int, float]]]:
+    i, j = two_hop(side, other, rows)
+    keep = i != j
+    n = len(side.ids)
+    codes, shared = np.unique(i[keep] * n + j[keep], return_counts=True)
+    i, j = codes // n, codes % n
+
+    di, dj = side.degree[i], side.degree[j]
+    if similarity == "jaccard":
+        score = shared / (di + dj - shared)
+    else:
+        score = shared / np.sqrt(di * dj)
+
+    order = np.lexsort((j, -score, i))
+    i, j, score = i[order], j[order], score[order]
+    first = np.searchsorted(i, i, side="left")
+    top = (np.arange(len(i)) - first) < k
+
+    result: Dict[int, List[Tuple[int, float]]] = {int(r): [] for r in rows}
+    for a, b, s in zip(i[top].tolist(), j[top].tolist(), score[top].tolist()):
+        result[a].append((b, s))
+    return result
+
+
+class RelatedIndex:
+    def __init__(
+        self,
+        store: Optional[GraphStore],
+        k: int = TOP_K,
+        similarity: str = "jaccard",
+        arrays: Optional["GraphArrays"] = None,
+    ):
+        self.store = store
+        self.arrays = arrays
+        self.k = k
+        self.similarity = similarity
+        self._lock = RLock()
+        self._top: Dict[str, List[Tuple[str, float]]] = {}
+        self._dirty: Optional[Set[str]] = None  # None = build everything
+        if store is not None:
+            store.subscribe(self._on_change)
+
+    @classmethod
+    def from_arrays(cls, arrays: "GraphArrays", k: int = TOP_K, similarity: str = "jaccard") -> "RelatedIndex":
+        # a published version never changes: the first lookup builds every list
+        return cls(None, k, similarity, arrays)
+
+    def _on_change(self, changes: ChangeSet) -> None:
+        # endpoints covers added / removed edges and any node whose kind or existence changed
+        with self._lock:
+            if self._dirty is not None:
+                self._dirty |= changes.endpoints
+
+    def _refresh(self) -> None:
+        if self._dirty is not None and not self._dirty:
+            return
+        items, features = self.arrays.incidence() if self.arrays is not None else incidence(self.store.G)
+        live = set(items.index) | set(features.index)
+        for nid in [nid for nid in self._top if nid not in live]:
+            del self._top[nid]
+
+        for side, other in ((items, features), (features, items)):
+            if self._dirty is None:
+                rows = np.arange(len(side.ids), dtype=np.int64)
+            else:
+                # rows touching a changed node now, plus rows whose cached list mentions one
+                changed = np.array([side.index[n] for n in self._dirty if n in side.index], dtype=np.int64)
+                stale = {side.index[nid] for nid, top in self._top.items()
+                         if nid in side.index and any(nb in self._dirty for nb, _ in top)}
+                _, near = two_hop(side, other, changed)
+                rows = np.unique(np.concatenate([changed, near, np.fromiter(stale, dtype=np.int64)]))
+            for r, top in top_k_similar(side, other, rows, self.k, self.similarity).items():
+                self._top[side.ids[r]] = [(side.ids[j], s) for j, s in top]
+        self._dirty = set()
+
+    def related(self, nid: str) -> List[Tuple[str, float]]:
+        with self._lock:
+            self._refresh()
+            return self._top.get(nid, [])
@@ -0,0 +1,141 @@
+from __future__ import annotations
+import dataclasses
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from data import Node
+
+
+# Entity resolution for tool and tag nodes at ingest. Labels are normalized into a
+# match key ("Git / GitHub", "git-github" -> "gitgithub"; "REST APIs" -> "restapi"),
+# and candidate duplicates come from a character n-gram index: only labels that share
+# n-grams are ever compared, and n-grams too common to discriminate are skipped, so
+# the work grows with the number of labels, not with the number of pairs. Matches are
+# merged with union-find into one canonical node per cluster (the best-connected
+# member); the other ids become aliases and edges are re-pointed to the canonical id.
+
+RESOLVE_KINDS = ("tool", "tag")
+NGRAM = 3
+THRESHOLD = 0.8      # Jaccard similarity of n-gram sets
+MAX_POSTING = 50     # n-grams shared by more labels than this carry no signal
+
+
+@dataclass
+class Resolution:
+    aliases: Dict[str, str] = field(default_factory=dict)   # alias id -> canonical id
+    labels: Dict[str, str] = field(default_factory=dict)    # alias id -> its own label
+    clusters: List[Tuple[str, ...]] = field(default_factory=list)  # canonical id first
+
+
+def match_key(label: str) -> str:
+    tokens = re.sub(r"[^a-z0-9+#]+", " ", label.lower()).split()
+    # plural / singular spellings: "apis" -> "api", but not "css", "js" or a fused "nodejs"
+    tokens = [t[:-1] if len(t) > 3 and t.endswith("s") and not t.endswith(("ss", "js")) else t for t in tokens]
+    return "".join(tokens)
+
+
+def _ngrams(key: str) -> List[str]:
+    padded = f"#{key}#"
+    return [padded[i:i + NGRAM] for i in range(max(1, len(padded) - NGRAM + 1))]
+
+
+def candidate_pairs(keys: pd.Series, kinds: pd.Series) -> pd.DataFrame:
+    # (a, b) row pairs of the same kind with n-gram Jaccard >= THRESHOLD, a < b
+    grams = pd.DataFrame({"row": np.arange(len(keys)), "kind": kinds.to_numpy(), "gram": keys.map(_ngrams).to_numpy()})
+    grams = grams.explode("gram").drop_duplicates(["row", "gram"])
+    sizes = grams.groupby("row").size()
+    posting = grams.groupby(["kind", "gram"])["row"].transform("size")
+    grams = grams[posting <= MAX_POSTING]
+
+    pairs = grams.merge(grams, on=["kind", "gram"], suffixes=("_a", "_b"))
+    pairs = pairs[pairs["row_a"] < pairs["row_b"]]
+    shared = pairs.groupby(["row_a", "row_b"]).size().rename("shared").reset_index()
+    size_a = sizes.reindex(shared["row_a"]).to_numpy()
+    size_b = sizes.reindex(shared["row_b"]).to_numpy()
+    shared["score"] = shared["shared"] / (size_a + size_b - shared["shared"])
+    return shared[shared["score"] >= THRESHOLD][["row_a", "row_b", "score"]]
+
+
+def _find(parent: np.ndarray, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _merged(canonical: Node, members: List[Node]) -> Node:
+    # the canonical node keeps its own fields and fills blanks from its aliases;
+    # it exists from the earliest start among them
+    def first(attr: str) -> str:
+        return next((getattr(n, attr) for n in members if getattr(n, attr)), getattr(canonical, attr))
+
+    starts = [n.start for n in [canonical] + members if n.start]
+    ends = [n.end for n in [canonical] + members]
+    return dataclasses.replace(
+        canonical,
+        subtitle=canonical.subtitle or first("subtitle"),
+        metric=canonical.metric or first("metric"),
+        url=canonical.url or first("url") or None,
+        start=min(starts) if starts else None,
+        end=None if any(e is None for e in ends) else max(ends),
+    )
+
+
+def resolve_entities(
+    nodes: Dict[str, Node],
+    degree: Optional[Dict[str, int]] = None,
+    kinds=RESOLVE_KINDS,
+) -> Tuple[Dict[str, Node], Resolution]:
+    degree = degree or {}
+    ids = [nid for nid, n in nodes.items() if n.kind in kinds]
+    if not ids:
+        return nodes, Resolution()
+    frame = pd.DataFrame({
+        "id": ids,
+        "kind": [nodes[nid].kind for nid in ids],
+        "key": [match_key(nodes[nid].label) for nid in ids],
+    })
+
+    parent = np.arange(len(ids))
+    # identical keys always match, however short; the index finds the near misses
+    rows = np.arange(len(ids))
+    first = pd.Series(rows).groupby([frame["kind"], frame["key"]]).transform("min").to_numpy()
+    same = (first != rows) & (frame["key"] != "").to_numpy()
+    near = candidate_pairs(frame["key"], frame["kind"])
+    pairs = list(zip(first[same].tolist(), rows[same].tolist()))
+    pairs += list(zip(near["row_a"].tolist(), near["row_b"].tolist()))
+    for a, b in pairs:
+        ra, rb = _find(parent, a), _find(parent, b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    clusters: Dict[int, List[str]] = {}
+    for i, nid in enumerate(ids):
+        clusters.setdefault(_find(parent, i), []).append(nid)
+
+    resolution = Resolution()
+    nodes = dict(nodes)
+    for members in clusters.values():
+        if len(members) < 2:
+            continue
+        # best-connected member wins, then the shortest id
+        members.sort(key=lambda nid: (-degree.get(nid, 0), len(nid), nid))
+        canonical = members[0]
+        nodes[canonical] = _merged(nodes[canonical], [nodes[nid] for nid in members[1:]])
+        for alias in members[1:]:
+            resolution.aliases[alias] = canonical
+            resolution.labels[alias] = nodes[alias].label
+            del nodes[alias]
+        resolution.clusters.append(tuple(members))
+    return nodes, resolution
+
+
+def alias_table(resolution: Resolution, nodes: Dict[str, Node]) -> pd.DataFrame:
+    rows = [
+        {"alias": alias, "alias_label": resolution.labels[alias], "canonical": canonical, "label": nodes[canonical].label}
+        for alias, canonical in sorted(resolution.aliases.items())
+    ]
+    return pd.DataFrame(rows, columns=["alias", "alias_label", "canonical", "label"])
@@ -0,0 +1,276 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from threading import RLock
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+import pandas as pd
+
+from data import Node, Edge
+from graph_utils import build_nx_graph, norm_kind
+from ingest import IngestReport, load_graph, nodes_from_frame
+from timeline import appearance_dates
+
+
+# Time-sharded on-disk graph storage. Every node goes to the shard of the period in which
+# it first becomes visible on the timeline (undated, always-visible and never-visible nodes
+# go to the "base" shard), and every edge to the shard of its later endpoint. A visible
+# node's tools and outcomes never appear after it, so the edges that pull them in live in
+# the node's own shard: each shard contributes a visible set of its own, and the view as
+# of a date is the union of the contributions up to that date. Shards are read lazily
+# (Parquet) as the timeline reaches them, only the parsed visibility index of a few shards
+# is kept, and contributions are cached per shard, so going back in time is a union of
+# cached sets. Later shards are never touched; the tool filter reads one pins table.
+# The app does not read shards: its timeline runs to today and its GraphStore needs
+# every shard, so there is nothing to skip there; this serves offline / CLI queries.
+#
+#   python shards.py write nodes.parquet edges.parquet shards/ --period year
+#   python shards.py visible shards/ 2024-06-01
+
+PERIODS = ("year", "month")
+BASE = "base"
+MANIFEST = "manifest.json"
+PINS = "pins.parquet"
+SHARD_CACHE = 4
+CONTRIBUTION_CACHE = 256   # (shard, kinds, tool[, date]) visible sets
+ALL_KINDS = {"experience", "project", "tool", "outcome", "leadership", "tag"}
+EXPANDS = ("tool", "outcome")   # kinds a visible node pulls in (timeline.visible_by_date)
+
+
+@dataclass(frozen=True)
+class Shard:
+    key: str
+    start: Optional[date]   # None for the base shard
+    nodes: int
+    edges: int
+
+
+@dataclass(frozen=True)
+class ShardIndex:
+    # what visibility needs from one shard: nodes that become visible on their own,
+    # and the tools / outcomes each of them pulls in
+    seeds: Tuple[Tuple[str, str, date], ...]                # (id, kind, visible from)
+    expand: Dict[str, Tuple[Tuple[str, str], ...]]          # seed -> ((neighbor, kind), ...)
+    last: date                                              # latest "visible from" in the shard
+
+
+def _period(d: date, period: str) -> Tuple[str, date]:
+    if d == date.min:
+        return BASE, date.min
+    if period == "year":
+        return str(d.year), date(d.year, 1, 1)
+    return f"{d.year}-{d.month:02d}", date(d.year, d.month, 1)
+
+
+def write_shards(nodes: Dict[str, Node], edges: List[Edge], directory: str, period: str = "year") -> List[Shard]:
+    if period not in PERIODS:
+        raise ValueError(f"Unknown shard period: {period!r}")
+    G = build_nx_graph(nodes, edges)
+    first = appearance_dates(G, ALL_KINDS)
+    starts: Dict[str, date] = {BASE: date.min}
+    shard_of: Dict[str, str] = {}
+    for nid in G.nodes():
+        key, start = _period(first.get(nid, date.min), period)
+        shard_of[nid] = key
+        starts[key] = start
+
+    node_rows: Dict[str, List[dict]] = {key: [] for key in starts}
+    for nid in G.nodes():
+        n = nodes[nid]
+        node_rows[shard_of[nid]].append({
+            "id": n.id, "label": n.label, "kind": n.kind, "subtitle": n.subtitle, "metric": n.metric,
+            "start": n.start.isoformat() if n.start else "",
+            "end": n.end.isoformat() if n.end else "",
+            "url": n.url or "",
+        })
+    kind = dict(G.nodes(data="kind", default=""))
+    edge_rows: Dict[str, List[dict]] = {key: [] for key in starts}
+    pin_rows: List[dict] = [{"tool": nid, "neighbor": "", "kind": ""} for nid in G if kind[nid] == "tool"]
+    for u, v, data in G.edges(data=True):
+        key = max(shard_of[u], shard_of[v], key=lambda k: starts[k])
+        edge_rows[key].append({
+            "source": u, "target": v, "rel": data.get("rel", ""), "weight": data.get("weight", 1.0),
+            "source_kind": kind[u], "target_kind": kind[v],
+        })
+        # a filtered tool is visible from the start with its tools / outcomes, wherever
+        # those are stored
+        for a, b in ((u, v), (v, u)):
+            if kind[a] == "tool" and kind[b] in EXPANDS:
+                pin_rows.append({"tool": a, "neighbor": b, "kind": kind[b]})
+
+    os.makedirs(directory, exist_ok=True)
+    shards = []
+    for key in sorted(starts, key=lambda k: starts[k]):
+        pd.DataFrame(node_rows[key], columns=["id", "label", "kind", "subtitle", "metric", "start", "end", "url"]) \
+            .to_parquet(os.path.join(directory, f"{key}.nodes.parquet"), index=False)
+        pd.DataFrame(edge_rows[key], columns=["source", "target", "rel", "weight", "source_kind", "target_kind"]) \
+            .to_parquet(os.path.join(directory, f"{key}.edges.parquet"), index=False)
+        start = None if key == BASE else starts[key]
+        shards.append(Shard(key=key, start=start, nodes=len(node_rows[key]), edges=len(edge_rows[key])))
+    pd.DataFrame(pin_rows, columns=["tool", "neighbor", "kind"]).to_parquet(os.path.join(directory, PINS), index=False)
+
+    manifest = {
+        "period": period,
+        "shards": [
+            {"key": s.key, "start": s.start.isoformat() if s.start else None, "nodes": s.nodes, "edges": s.edges}
+            for s in shards
+        ],
+    }
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return shards
+
+
+class ShardedGraph:
+    def __init__(self, directory: str, cache_size: int = SHARD_CACHE):
+        self.directory = directory
+        self.cache_size = cache_size
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.period = manifest["period"]
+        self.shards = [
+            Shard(key=s["key"], start=date.fromisoformat(s["start"]) if s["start"] else None,
+                  nodes=s["nodes"], edges=s["edges"])
+            for s in manifest["shards"]
+        ]
+        self._lock = RLock()
+        self._cache: "OrderedDict[str, ShardIndex]" = OrderedDict()
+        self._visible: "OrderedDict[tuple, FrozenSet[str]]" = OrderedDict()
+        self._pins: Dict[str, Optional[FrozenSet[Tuple[str, str]]]] = {}
+        self._last: Dict[str, date] = {}   # shard -> latest "visible from" in it (tiny, kept for all)
+        self.reads = 0
+
+    def _path(self, key: str, table: str) -> str:
+        return os.path.join(self.directory, f"{key}.{table}.parquet")
+
+    def shard(self, key: str) -> ShardIndex:
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit
+            nodes = nodes_from_frame(pd.read_parquet(self._path(key, "nodes"), columns=["id", "label", "kind", "start"]),
+                                     IngestReport())
+            seeds = []
+            for nid, n in nodes.items():
+                kind = norm_kind(n.kind)
+                if kind in ("project", "experience") and n.start is not None:
+                    seeds.append((nid, kind, n.start))
+                elif kind in ("leadership", "tag"):
+                    seeds.append((nid, kind, date.min))
+            seed_ids = {nid for nid, _, _ in seeds}
+            df = pd.read_parquet(self._path(key, "edges"), columns=["source", "target", "source_kind", "target_kind"])
+            expand: Dict[str, List[Tuple[str, str]]] = {}
+            for u, v, ku, kv in zip(df["source"].tolist(), df["target"].tolist(),
+                                    df["source_kind"].tolist(), df["target_kind"].tolist()):
+                if u in seed_ids and kv in EXPANDS:
+                    expand.setdefault(u, []).append((v, kv))
+                if v in seed_ids and ku in EXPANDS:
+                    expand.setdefault(v, []).append((u, ku))
+            index = ShardIndex(
+                seeds=tuple(seeds),
+                expand={nid: tuple(nbs) for nid, nbs in expand.items()},
+                last=max((since for _, _, since in seeds), default=date.min),
+            )
+            self.reads += 1
+            self._last[key] = index.last
+            self._cache[key] = index
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return index
+
+    def shards_until(self, d: date) -> int:
+        # base shard + every shard that starts on or before d
+        return sum(1 for s in self.shards if s.start is None or s.start <= d)
+
+    def _pinned(self, tool_id: str) -> Optional[FrozenSet[Tuple[str, str]]]:
+        # the filtered tool's (neighbor, kind) tools / outcomes; None if there is no such tool
+        if tool_id not in self._pins:
+            df = pd.read_parquet(os.path.join(self.directory, PINS), filters=[("tool", "==", tool_id)])
+            rows = list(zip(df["neighbor"].tolist(), df["kind"].tolist()))
+            self._pins[tool_id] = frozenset((nb, k) for nb, k in rows if nb) if rows else None
+        return self._pins[tool_id]
+
+    def _contribution(self, i: int, enabled: FrozenSet[str], tool_id: Optional[str], d: date) -> FrozenSet[str]:
+        # shard i's share of visible_by_date(.., d, ..); once d is past every node in the
+        # shard it no longer depends on d and is cached as such
+        key = self.shards[i].key
+        last = self._last.get(key)
+        if last is None:
+            last = self.shard(key).last
+        cache_key = (i, enabled, tool_id) + ((d,) if d < last else ())
+        cached = self._visible.get(cache_key)
+        if cached is not None:
+            self._visible.move_to_end(cache_key)
+            return cached
+
+        index = self.shard(key)
+        expands = set(EXPANDS) & enabled
+        out: Set[str] = set()
+        for nid, kind, since in index.seeds:
+            if kind not in enabled or since > d:
+                continue
+            nbs = index.expand.get(nid, ())
+            if tool_id is not None and kind == "project" and not any(nb == tool_id for nb, _ in nbs):
+                continue
+            out.add(nid)
+            out.update(nb for nb, k in nbs if k in expands)
+        cached = frozenset(out)
+        self._visible[cache_key] = cached
+        while len(self._visible) > CONTRIBUTION_CACHE:
+            self._visible.popitem(last=False)
+        return cached
+
+    def timeline(self, dates: List[date], enabled_kinds: Set[str], tool_id: Optional[str] = None) -> List[Set[str]]:
+        # visible set per stop, in the order given; stops are swept in date order so each
+        # shard's contribution is added to the running union once
+        enabled = frozenset(norm_kind(k) for k in enabled_kinds)
+        with self._lock:
+            acc: Set[str] = set()
+            pinned = self._pinned(tool_id) if tool_id else None
+            if pinned is None:
+                tool_id = None
+            else:
+                acc = {tool_id} | {nb for nb, k in pinned if k in enabled}
+            visible: Dict[date, Set[str]] = {}
+            done = 0
+            for d in sorted(set(dates)):
+                count = self.shards_until(d)
+                while done < count - 1:
+                    acc |= self._contribution(done, enabled, tool_id, d)
+                    done += 1
+                visible[d] = acc | self._contribution(count - 1, enabled, tool_id, d) if count else set(acc)
+            return [set(visible[d]) for d in dates]
+
+    def visible_by_date(self, d: date, enabled_kinds: Set[str], tool_id: Optional[str] = None) -> Set[str]:
+        return self.timeline([d], enabled_kinds, tool_id)[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time-sharded graph storage")
+    sub = parser.add_subparsers(dest="command", required=True)
+    w = sub.add_parser("write", help="shard node / edge tables into a directory")
+    w.add_argument("nodes")
+    w.add_argument("edges")
+    w.add_argument("directory")
+    w.add_argument("--period", choices=PERIODS, default="year")
+    v = sub.add_parser("visible", help="visible nodes at a date")
+    v.add_argument("directory")
+    v.add_argument("date", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    if args.command == "write":
+        nodes, edges, _ = load_graph(args.nodes, args.edges)
+        for s in write_shards(nodes, edges, args.directory, args.period):
+            print(f"{s.key}: {s.nodes} nodes, {s.edges} edges")
+    else:
+        graph = ShardedGraph(args.directory)
+        visible = graph.visible_by_date(args.date, ALL_KINDS)
+        print(f"{len(visible)} visible nodes ({graph.reads} of {len(graph.shards)} shards read)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,614 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from threading import RLock
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import networkx as nx
+import numpy as np
+
+from centrality import SparseGraph
+from counts import CountCube, cube_from_days
+from data import Node, Edge, build_resume_graph
+from graph_store import ChangeSet, GraphStore
+from graph_utils import LAYOUT_GAP, LAYOUT_SPREAD, node_attrs
+from ingest import load_graph
+from related import FEATURE_KINDS, ITEM_KINDS, Incidence, incidence_sides
+from timeline import event_dates, month_floor, visible_by_date
+
+
+# Shared-memory graph arrays for several app processes on one box. One publisher packs
+# the immutable numeric side of the graph into a single named segment per version:
+# CSR adjacency (+ relation codes, weights), reference-spacing coordinates, kind codes,
+# start / end days, per-stop visibility bitmaps for the default layers, and the node
+# text as UTF-8 blobs with offsets. Readers map it zero-copy.
+#
+# Scope: the segment replaces loading and parsing the input tables in every worker. The
+# default view (default layers, no tool filter, event stops, column order by connections)
+# reads its per-stop visible sets and coordinates from the bitmaps and coordinate arrays;
+# node lookups decode one row at a time (SharedNodes), and the centrality, count and
+# related-items indexes are built from the CSR arrays for any filter. A worker builds
+# its own GraphStore (networkx graph and indexes) from the segment only when a view
+# needs one: paths, metric search, Details, other layers / tool filter / importance /
+# layout. Drawing the default view builds a networkx graph of the drawn layers for the
+# figure build only (as plot_graph_timeline's own subgraph copy did); it is not kept.
+# The stops end at the current month, so `publish` republishes when the month rolls over.
+#
+# Version handshake: a small control segment holds (sequence, version). The publisher
+# writes the new data segment completely, then bumps the sequence to odd, stores the
+# version and bumps it back to even; readers retry until they see the same even
+# sequence on both sides of the version read, then switch to that segment in one
+# reference swap. The previous segment stays linked for a grace period so a reader
+# switching mid-publish never finds its segment gone.
+#
+#   python shared.py publish --prefix resume_graph [--nodes n.parquet --edges e.parquet]
+#   RESUME_GRAPH_SHM=resume_graph streamlit run app.py     # each worker attaches
+
+MAGIC = b"RGSHM001"
+ALIGN = 64
+KEEP_VERSIONS = 2
+SHARED_KINDS = ("experience", "project", "tool", "outcome")   # layers of the bitmaps / coordinates
+LAYER_KINDS = ("experience", "project", "tool", "outcome", "leadership", "tag")
+KIND_CODES = LAYER_KINDS + ("skill",)
+TEXT_COLUMNS = ("id", "label", "subtitle", "metric", "url")
+
+
+def _attach(name: str) -> SharedMemory:
+    # readers must not let the resource tracker unlink the publisher's segment on exit
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        shm = SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _text(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _days(values: List[Optional[date]]) -> np.ndarray:
+    return np.array([d.toordinal() if d else 0 for d in values], dtype=np.int32)
+
+
+def pack(store: GraphStore) -> Tuple[dict, Dict[str, np.ndarray]]:
+    G = store.G
+    ids = list(G.nodes())
+    index = {nid: i for i, nid in enumerate(ids)}
+    nodes = [store.nodes[nid] for nid in ids]
+    arrays: Dict[str, np.ndarray] = {}
+    for col in TEXT_COLUMNS:
+        arrays[f"{col}_bytes"], arrays[f"{col}_offsets"] = _text([getattr(n, col) or "" for n in nodes])
+    # the graph's normalized kinds, which every filter compares against
+    kinds = [G.nodes[nid].get("kind", "") for nid in ids]
+    arrays["kind"] = np.array([KIND_CODES.index(k) if k in KIND_CODES else -1 for k in kinds], dtype=np.int8)
+    arrays["start"] = _days([n.start for n in nodes])
+    arrays["end"] = _days([n.end for n in nodes])
+
+    rels = sorted({rel for _, _, rel in G.edges(data="rel", default="")})
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    indices, rel, weight = [], [], []
+    for i, nid in enumerate(ids):
+        for nb, data in G.adj[nid].items():
+            indices.append(index[nb])
+            rel.append(rels.index(data.get("rel", "")))
+            weight.append(data.get("weight", 1.0))
+        indptr[i + 1] = len(indices)
+    arrays["indptr"] = indptr
+    arrays["indices"] = np.asarray(indices, dtype=np.int32)
+    arrays["rel"] = np.asarray(rel, dtype=np.int16)
+    arrays["weight"] = np.asarray(weight, dtype=np.float64)
+
+    # default view: coordinates at the reference spacing (NaN outside the shared layers)
+    pos = store.positions(list(LAYER_KINDS), set(SHARED_KINDS), layer_gap=LAYOUT_GAP, y_spread=LAYOUT_SPREAD)
+    arrays["x"] = np.array([pos[nid][0] if nid in pos else np.nan for nid in ids], dtype=np.float32)
+    arrays["y"] = np.array([pos[nid][1] if nid in pos else np.nan for nid in ids], dtype=np.float32)
+
+    stops = event_dates(G)
+    bits = np.zeros((len(stops), len(ids)), dtype=bool)
+    for s, d in enumerate(stops):
+        bits[s, [index[nid] for nid in visible_by_date(G, d, set(SHARED_KINDS))]] = True
+    arrays["visible"] = np.packbits(bits, axis=1)
+
+    meta = {
+        "store_version": store.version,
+        "nodes": len(ids),
+        "edges": G.number_of_edges(),
+        "rels": rels,
+        "stops": [d.isoformat() for d in stops],
+        "kinds": list(SHARED_KINDS),
+    }
+    return meta, arrays
+
+
+def _align(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+def _layout(meta: dict, arrays: Dict[str, np.ndarray]) -> Tuple[bytes, Dict[str, int], int]:
+    # magic, header length, JSON header (meta + name -> [offset, dtype, shape]); the
+    # arrays follow the header, each at an ALIGN-aligned offset from the data start
+    specs, offsets, offset = {}, {}, 0
+    for name, arr in arrays.items():
+        specs[name] = [offset, arr.dtype.str, list(arr.shape)]
+        offsets[name] = offset
+        offset += _align(arr.nbytes)
+    header = json.dumps(dict(meta, arrays=specs)).encode("utf-8")
+    header = MAGIC + len(header).to_bytes(8, "little") + header
+    start = _align(len(header))
+    return header, {name: start + o for name, o in offsets.items()}, start + offset
+
+
+class GraphArrays:
+    # one published version, mapped read-only; the arrays are views into the segment
+    def __init__(self, shm: SharedMemory):
+        buf = shm.buf
+        if bytes(buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{shm.name} is not a graph segment")
+        size = int.from_bytes(bytes(buf[len(MAGIC):len(MAGIC) + 8]), "little")
+        self.meta = json.loads(bytes(buf[len(MAGIC) + 8:len(MAGIC) + 8 + size]).decode("utf-8"))
+        self.version: int = self.meta["version"]
+        self.arrays: Dict[str, np.ndarray] = {}
+        start = _align(len(MAGIC) + 8 + size)
+        for name, (offset, dtype, shape) in self.meta["arrays"].items():
+            count = int(np.prod(shape)) if shape else 1
+            arr = np.frombuffer(buf, dtype=np.dtype(dtype), count=count, offset=start + offset).reshape(shape)
+            arr.flags.writeable = False
+            self.arrays[name] = arr
+        self.stops = [date.fromisoformat(d) for d in self.meta["stops"]]
+        self._ids: Optional[List[str]] = None
+        self._index: Optional[Dict[str, int]] = None
+        self._labels: Optional[Dict[str, str]] = None
+        self._kinds: Optional[Dict[str, str]] = None
+        # a version never changes: decoded sets and coordinates are kept for every rerun
+        self._visible: Dict[int, Set[str]] = {}
+        self._positions: Optional[Dict[str, Tuple[float, float]]] = None
+        self._shm = shm   # last: the arrays above are released before the mapping
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def close(self) -> None:
+        # views handed out elsewhere keep the mapping alive; it goes with the last of them
+        self.arrays = {}
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+
+    def text(self, column: str) -> List[str]:
+        data = self.arrays[f"{column}_bytes"].tobytes()
+        offsets = self.arrays[f"{column}_offsets"].tolist()
+        return [data[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+
+    @property
+    def ids(self) -> List[str]:
+        if self._ids is None:
+            self._ids = self.text("id")
+        return self._ids
+
+    @property
+    def index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {nid: i for i, nid in enumerate(self.ids)}
+        return self._index
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        if self._labels is None:
+            self._labels = dict(zip(self.ids, self.text("label")))
+        return self._labels
+
+    @property
+    def kinds(self) -> Dict[str, str]:
+        # id -> normalized kind ("" for kinds outside KIND_CODES)
+        if self._kinds is None:
+            self._kinds = {nid: KIND_CODES[k] if k >= 0 else "" for nid, k in zip(self.ids, self.arrays["kind"].tolist())}
+        return self._kinds
+
+    @property
+    def nodes(self) -> "SharedNodes":
+        return SharedNodes(self)
+
+    def _value(self, column: str, i: int) -> str:
+        offsets = self.arrays[f"{column}_offsets"]
+        return self.arrays[f"{column}_bytes"][offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+    def node(self, nid: str) -> Node:
+        i = self.index[nid]
+        k, s, e = int(self.arrays["kind"][i]), int(self.arrays["start"][i]), int(self.arrays["end"][i])
+        return Node(
+            id=nid, label=self.labels[nid], kind=KIND_CODES[k] if k >= 0 else "",
+            subtitle=self._value("subtitle", i), metric=self._value("metric", i),
+            start=date.fromordinal(s) if s else None, end=date.fromordinal(e) if e else None,
+            url=self._value("url", i) or None,
+        )
+
+    def kind_mask(self, kinds) -> np.ndarray:
+        return np.isin(self.arrays["kind"], [KIND_CODES.index(k) for k in kinds if k in KIND_CODES])
+
+    def _edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        # (source, target) of every CSR entry: both directions of each edge
+        indptr = self.arrays["indptr"]
+        return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr)), self.arrays["indices"].astype(np.int64)
+
+    def event_dates(self, today: Optional[date] = None) -> List[date]:
+        # timeline.event_dates over the arrays
+        start = self.arrays["start"]
+        dated = self.kind_mask(("project", "experience", "leadership")) & (start > 0)
+        dates = {month_floor(date.fromordinal(d)) for d in np.unique(start[dated]).tolist()}
+        dates.add(month_floor(today or date.today()))
+        return sorted(dates)
+
+    def adjacency(self, nids) -> Dict[str, List[str]]:
+        # graph_component.adjacency_list of the subgraph on nids
+        ids, index = self.ids, self.index
+        keep = np.zeros(self.meta["nodes"], dtype=bool)
+        keep[[index[nid] for nid in nids]] = True
+        indptr, indices = self.arrays["indptr"], self.arrays["indices"]
+        out = {}
+        for i in np.flatnonzero(keep).tolist():
+            nbs = indices[indptr[i]:indptr[i + 1]]
+            out[ids[i]] = sorted(ids[j] for j in nbs[keep[nbs]].tolist())
+        return out
+
+    def graph(self, kinds: Set[str]) -> nx.Graph:
+        # networkx graph of just these layers, for a figure build; not kept
+        keep = self.kind_mask(kinds)
+        ids, rels = self.ids, self.meta["rels"]
+        G = nx.Graph()
+        for i in np.flatnonzero(keep).tolist():
+            G.add_node(ids[i], **node_attrs(self.node(ids[i])))
+        src, dst = self._edges()
+        on = np.flatnonzero(keep[src] & keep[dst] & (src <= dst))
+        G.add_edges_from(
+            (ids[a], ids[b], {"rel": rels[r], "weight": w})
+            for a, b, r, w in zip(src[on].tolist(), dst[on].tolist(),
+                                  self.arrays["rel"][on].tolist(), self.arrays["weight"][on].tolist())
+        )
+        return G
+
+    def sparse_graph(self, kinds: Optional[Set[str]] = None) -> SparseGraph:
+        # centrality.sparse_graph straight from the CSR arrays
+        n = self.meta["nodes"]
+        keep = np.ones(n, dtype=bool) if kinds is None else self.kind_mask(kinds)
+        sel = np.flatnonzero(keep)
+        remap = np.full(n, -1, dtype=np.int64)
+        remap[sel] = np.arange(len(sel))
+        src, dst = self._edges()
+        on = keep[src] & keep[dst]
+        src, dst, weight = remap[src[on]], remap[dst[on]], self.arrays["weight"][on]
+        indptr = np.zeros(len(sel) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(sel)), out=indptr[1:])
+        ids = [self.ids[i] for i in sel.tolist()]
+        return SparseGraph(
+            ids=ids, index={nid: i for i, nid in enumerate(ids)}, src=src, dst=dst, weight=weight,
+            indptr=indptr, indices=dst, csr_weight=weight,
+        )
+
+    def count_cube(self, enabled_kinds: Set[str], tool_id: Optional[str] = None) -> CountCube:
+        # timeline.appearance_dates + counts.count_cube over the arrays
+        kind, start = self.arrays["kind"], self.arrays["start"].astype(np.int64)
+        enabled = self.kind_mask(enabled_kinds)
+        never = np.iinfo(np.int64).max
+        first = np.full(len(kind), never, dtype=np.int64)
+        dated = enabled & self.kind_mask(("project", "experience")) & (start > 0)
+        first[dated] = start[dated]
+        first[enabled & self.kind_mask(("leadership", "tag"))] = date.min.toordinal()
+
+        src, dst = self._edges()
+        t = self.index.get(tool_id) if tool_id else None
+        if t is not None:
+            linked = np.zeros(len(kind), dtype=bool)
+            linked[dst[src == t]] = True
+            first[self.kind_mask(("project",)) & ~linked] = never
+            first[t] = date.min.toordinal()
+
+        # visible nodes pull in their tools / outcomes from their own first day
+        seen = first.copy()
+        pull = (seen[src] < never) & self.kind_mask({"tool", "outcome"} & set(enabled_kinds))[dst]
+        np.minimum.at(first, dst[pull], seen[src[pull]])
+
+        counted = (first < never) & enabled
+        once = counted[src] & counted[dst] & (src <= dst)
+        kinds = self.kinds
+        ids = self.ids
+        rels = self.meta["rels"]
+        return cube_from_days(
+            first[counted],
+            [kinds[ids[i]] for i in np.flatnonzero(counted).tolist()],
+            np.maximum(first[src[once]], first[dst[once]]),
+            [rels[r] for r in self.arrays["rel"][once].tolist()],
+        )
+
+    def incidence(self) -> Tuple[Incidence, Incidence]:
+        # related.incidence straight from the CSR arrays
+        ids, n = self.ids, self.meta["nodes"]
+        item, feature = self.kind_mask(ITEM_KINDS), self.kind_mask(FEATURE_KINDS)
+        items = sorted(ids[i] for i in np.flatnonzero(item).tolist())
+        features = sorted(ids[i] for i in np.flatnonzero(feature).tolist())
+        row_of, col_of = np.full(n, -1, dtype=np.int64), np.full(n, -1, dtype=np.int64)
+        row_of[[self.index[nid] for nid in items]] = np.arange(len(items))
+        col_of[[self.index[nid] for nid in features]] = np.arange(len(features))
+        src, dst = self._edges()
+        on = item[src] & feature[dst]
+        return incidence_sides(items, features, row_of[src[on]], col_of[dst[on]])
+
+    def visible(self, stop: int) -> Set[str]:
+        # shared with the caller: treat as read-only
+        visible = self._visible.get(stop)
+        if visible is None:
+            bits = np.unpackbits(self.arrays["visible"][stop], count=self.meta["nodes"]).astype(bool)
+            ids = self.ids
+            visible = {ids[i] for i in np.flatnonzero(bits).tolist()}
+            self._visible[stop] = visible
+        return visible
+
+    def visible_by_dates(self, dates: List[date], enabled_kinds: Set[str], tool_id: Optional[str] = None) -> Optional[List[Set[str]]]:
+        # the published bitmaps answer only the default view
+        if tool_id is not None or set(enabled_kinds) != set(self.meta["kinds"]):
+            return None
+        stop = {d: i for i, d in enumerate(self.stops)}
+        if any(d not in stop for d in dates):
+            return None
+        return [self.visible(stop[d]) for d in dates]
+
+    def positions(self) -> Dict[str, Tuple[float, float]]:
+        if self._positions is None:
+            x, y = self.arrays["x"], self.arrays["y"]
+            keep = np.flatnonzero(~np.isnan(x)).tolist()
+            ids = self.ids
+            self._positions = {ids[i]: (float(x[i]), float(y[i])) for i in keep}
+        return self._positions
+
+    def to_data(self) -> Tuple[Dict[str, Node], List[Edge]]:
+        cols = {c: self.text(c) for c in TEXT_COLUMNS}
+        kinds = self.arrays["kind"].tolist()
+        starts, ends = self.arrays["start"].tolist(), self.arrays["end"].tolist()
+        nodes = {
+            nid: Node(
+                id=nid, label=label, kind=KIND_CODES[k] if k >= 0 else "", subtitle=sub, metric=metric,
+                start=date.fromordinal(s) if s else None, end=date.fromordinal(e) if e else None, url=url or None,
+            )
+            for nid, label, k, sub, metric, s, e, url in zip(
+                cols["id"], cols["label"], kinds, cols["subtitle"], cols["metric"], starts, ends, cols["url"],
+            )
+        }
+        ids, rels = cols["id"], self.meta["rels"]
+        indptr, indices = self.arrays["indptr"], self.arrays["indices"]
+        rel, weight = self.arrays["rel"], self.arrays["weight"]
+        src = np.repeat(np.arange(len(ids)), np.diff(indptr))
+        once = np.flatnonzero(src <= indices).tolist()   # each undirected edge once
+        edges = [
+            Edge(source=ids[src[j]], target=ids[indices[j]], rel=rels[rel[j]], weight=float(weight[j]))
+            for j in once
+        ]
+        return nodes, edges
+
+
+class SharedNodes(Mapping):
+    # id -> Node over one published version, decoded per lookup and not kept
+    def __init__(self, arrays: GraphArrays):
+        self._arrays = arrays
+
+    def __getitem__(self, nid: str) -> Node:
+        return self._arrays.node(nid)
+
+    def __contains__(self, nid) -> bool:
+        return nid in self._arrays.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._arrays.ids)
+
+    def __len__(self) -> int:
+        return self._arrays.meta["nodes"]
+
+
+class _Control:
+    # [sequence, version] as two int64 in their own segment
+    def __init__(self, shm: SharedMemory):
+        self.shm = shm
+        self.cells = np.ndarray((2,), dtype=np.int64, buffer=shm.buf)
+
+    def read(self, attempts: int = 1000) -> int:
+        for _ in range(attempts):
+            seq = int(self.cells[0])
+            version = int(self.cells[1])
+            if seq % 2 == 0 and int(self.cells[0]) == seq:
+                return version
+            time.sleep(0.001)
+        raise TimeoutError("graph publisher stuck mid-publish")
+
+    def write(self, version: int) -> None:
+        self.cells[0] += 1
+        self.cells[1] = version
+        self.cells[0] += 1
+
+
+class SharedGraphPublisher:
+    def __init__(self, store: GraphStore, prefix: str):
+        self.prefix = prefix
+        self._lock = RLock()
+        self._segments: List[SharedMemory] = []
+        try:
+            # a restarted publisher continues the version sequence readers already follow
+            self._control = _Control(_attach(f"{prefix}_ctl"))
+            self._owns_control = False
+        except FileNotFoundError:
+            self._control = _Control(SharedMemory(name=f"{prefix}_ctl", create=True, size=16))
+            self._control.cells[:] = 0
+            self._owns_control = True
+        self.version = self._control.read()
+        self.replace(store)
+
+    def replace(self, store: GraphStore) -> int:
+        # a reloaded graph: readers move over on their next current()
+        with self._lock:
+            self.store = store
+            store.subscribe(self._on_change)
+            return self.publish()
+
+    def _on_change(self, changes: ChangeSet) -> None:
+        self.publish()
+
+    def publish(self) -> int:
+        with self._lock:
+            meta, arrays = pack(self.store)
+            version = self.version + 1
+            meta["version"] = version
+            header, offsets, size = _layout(meta, arrays)
+            name = f"{self.prefix}_v{version}"
+            try:
+                # left over by a publisher that died mid-publish
+                stale = _attach(name)
+                stale.close()
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+            shm = SharedMemory(name=name, create=True, size=max(size, 1))
+            shm.buf[:len(header)] = header
+            for arr_name, offset in offsets.items():
+                data = np.ascontiguousarray(arrays[arr_name]).view(np.uint8).reshape(-1)
+                shm.buf[offset:offset + len(data)] = data
+            self._control.write(version)
+            self.version = version
+            self._segments.append(shm)
+            while len(self._segments) > KEEP_VERSIONS:
+                old = self._segments.pop(0)
+                old.close()
+                old.unlink()
+            return version
+
+    def close(self) -> None:
+        with self._lock:
+            for shm in self._segments:
+                shm.close()
+                shm.unlink()
+            self._segments = []
+            self._control.shm.close()
+            if self._owns_control:
+                self._control.shm.unlink()
+
+
+class SharedGraphReader:
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._control = _Control(_attach(f"{prefix}_ctl"))
+        self._lock = RLock()
+        self._current: Optional[GraphArrays] = None
+        self._recent: "OrderedDict[int, GraphArrays]" = OrderedDict()   # versions handed out lately
+
+    @property
+    def version(self) -> int:
+        return self._control.read()
+
+    def current(self) -> GraphArrays:
+        # cheap when nothing changed: one control read
+        for _ in range(10):
+            version = self._control.read()
+            current = self._current
+            if current is not None and current.version == version:
+                return current
+            with self._lock:
+                try:
+                    arrays = GraphArrays(_attach(f"{self.prefix}_v{version}"))
+                except FileNotFoundError:
+                    continue   # superseded while we looked: read the control again
+                if arrays.version == version:
+                    self._current = arrays
+                    self._recent[version] = arrays
+                    while len(self._recent) > KEEP_VERSIONS:
+                        self._recent.popitem(last=False)
+                    return arrays
+        raise RuntimeError(f"could not attach to a published graph under {self.prefix!r}")
+
+    def at(self, version: int) -> GraphArrays:
+        # exactly this version, even if a newer one was published since current() saw it;
+        # the mapping outlives the publisher unlinking the segment
+        with self._lock:
+            arrays = self._recent.get(version)
+            if arrays is None:
+                arrays = GraphArrays(_attach(f"{self.prefix}_v{version}"))
+                self._recent[version] = arrays
+                while len(self._recent) > KEEP_VERSIONS:
+                    self._recent.popitem(last=False)
+            return arrays
+
+    def close(self) -> None:
+        with self._lock:
+            if self._current is not None:
+                self._current.close()
+                self._current = None
+            for arrays in self._recent.values():
+                arrays.close()
+            self._recent.clear()
+            self._control.shm.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish the graph into shared memory for app workers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("publish", help="publish and keep serving until interrupted")
+    p.add_argument("--prefix", default="resume_graph")
+    p.add_argument("--nodes", help="node table (.csv / .parquet) instead of the built-in resume")
+    p.add_argument("--edges", help="edge table (.csv / .parquet), required with --nodes")
+    p.add_argument("--watch", type=float, default=0.0, help="re-read the tables every N seconds when they change")
+    i = sub.add_parser("info", help="describe the current published version")
+    i.add_argument("--prefix", default="resume_graph")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        reader = SharedGraphReader(args.prefix)
+        arrays = reader.current()
+        total = sum(a.nbytes for a in arrays.arrays.values())
+        print(f"version {arrays.version}: {arrays.meta['nodes']} nodes, {arrays.meta['edges']} edges, "
+              f"{len(arrays.stops)} stops, {total / 1e6:.1f} MB")
+        del arrays
+        reader.close()
+        return
+
+    if bool(args.nodes) != bool(args.edges):
+        parser.error("--nodes and --edges go together")
+
+    def load() -> GraphStore:
+        nodes, edges = load_graph(args.nodes, args.edges)[:2] if args.nodes else build_resume_graph()
+        return GraphStore.from_data(nodes, edges)
+
+    def mtimes():
+        return tuple(os.path.getmtime(p) for p in (args.nodes, args.edges)) if args.nodes else ()
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))   # still unlink the segments
+    seen, month = mtimes(), month_floor(date.today())
+    publisher = SharedGraphPublisher(load(), args.prefix)
+    print(f"Published version {publisher.version} under {args.prefix!r}")
+    try:
+        while True:
+            time.sleep(args.watch or 3600)
+            if args.watch and mtimes() != seen:
+                seen = mtimes()
+                publisher.replace(load())
+                print(f"Published version {publisher.version}")
+            elif month_floor(date.today()) != month:
+                # the stops end at the current month: republish when it rolls over
+                publisher.publish()
+                print(f"Published version {publisher.version}")
+            month = month_floor(date.today())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import http.client
+import json
+import threading
+from datetime import date
+
+import pytest
+
+from api import GraphApi, serve
+from data import build_resume_graph
+from graph_store import GraphStore
+from timeline import change_dates, visible_by_date
+
+KINDS = {"experience", "project", "tool", "outcome"}
+
+
+@pytest.fixture(scope="module")
+def store():
+    return GraphStore.from_data(*build_resume_graph())
+
+
+def get(conn, path):
+    conn.request("GET", path)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_idle_keepalive_connections_do_not_starve_workers(store):
+    workers = 2
+    server = serve(store, port=0, workers=workers, idle_timeout=0.5)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    idle = [http.client.HTTPConnection(host, port, timeout=10) for _ in range(workers)]
+    try:
+        # each connection is kept open after its request, pinning a worker until it times out
+        for conn in idle:
+            assert get(conn, "/dates")[0] == 200
+        last = http.client.HTTPConnection(host, port, timeout=10)
+        status, body = get(last, "/dates")
+        assert status == 200 and body["dates"]
+        last.close()
+    finally:
+        for conn in idle:
+            conn.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_visible_snaps_to_change_dates(store):
+    api = GraphApi(store)
+    G = store.G
+    starts = change_dates(G)
+    for d in [date(1990, 1, 1), starts[0], date(2024, 7, 19), date(2031, 1, 1)] + starts[1:]:
+        expected = visible_by_date(G, d, KINDS)
+        assert api._visible(d, frozenset(KINDS), None) == expected
+        assert api._visible(d, frozenset(KINDS | {"bogus"}), "no-such-tool") == expected
+
+    entries = [k for k in store._frame_cache if k[0][0] == "visible"]
+    assert {key for key, _ in entries} == {("visible", frozenset(KINDS) & {k for _, k in G.nodes(data="kind")}, None)}
+    assert {d for _, d in entries} <= set(starts) | {date.min}
@@ -0,0 +1,99 @@
+import random
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+import graph_store
+from data import Edge, Node, build_resume_graph
+from graph_store import GraphStore
+from timeline import event_dates, visible_by_date
+
+KINDS = ["experience", "project", "tool", "outcome", "leadership", "tag"]
+FILTERS = [None, {"project", "tool"}, {"experience", "project", "tool", "outcome"}]
+
+
+def fresh(store):
+    return GraphStore.from_data(dict(store.nodes), store.edges)
+
+
+def warm(store, dates, tools):
+    # fill every cache the checks below read back
+    for kind in KINDS:
+        for enabled in FILTERS:
+            store.layer_order(kind, enabled)
+    for nid in list(store.nodes)[::3]:
+        store.neighborhood(nid)
+    G = store.G
+    for tool in tools:
+        for d in dates:
+            key = ("visible", frozenset(KINDS), tool)
+            store.frame(key, d, lambda: visible_by_date(G, d, set(KINDS), tool))
+
+
+def check(store, dates, tools):
+    expected = fresh(store)
+    for kind in KINDS:
+        for enabled in FILTERS:
+            assert store.layer_order(kind, enabled) == expected.layer_order(kind, enabled)
+    for nid in store.nodes:
+        assert store.neighborhood(nid) == expected.neighborhood(nid)
+    G = store.G
+    for tool in tools:
+        for d in dates:
+            key = ("visible", frozenset(KINDS), tool)
+            cached = store.frame(key, d, lambda: visible_by_date(G, d, set(KINDS), tool))
+            assert cached == visible_by_date(expected.G, d, set(KINDS), tool)
+
+
+def mutate(store, rng, step):
+    ids = sorted(store.nodes)
+    op = rng.choice(["add", "update", "relabel", "rekind", "remove", "edge", "unedge"])
+    if op == "add":
+        start = rng.choice([None, date(2023, rng.randint(1, 12), rng.randint(1, 28))])
+        store.add_node(Node(f"new{step}", f"New {step}", rng.choice(KINDS), start=start))
+        store.add_edge(Edge(f"new{step}", rng.choice(ids), "uses"))
+    elif op in ("update", "relabel", "rekind"):
+        node = store.nodes[rng.choice(ids)]
+        if op == "update":
+            node = replace(node, start=date(rng.randint(2022, 2025), rng.randint(1, 12), 1))
+        elif op == "relabel":
+            node = replace(node, label=node.label[::-1])
+        else:
+            node = replace(node, kind=rng.choice(KINDS))
+        store.update_node(node)
+    elif op == "remove":
+        store.remove_node(rng.choice(ids))
+    elif op == "edge":
+        u, v = rng.sample(ids, 2)
+        store.add_edge(Edge(u, v, "uses"))
+    elif store.edges:
+        e = rng.choice(store.edges)
+        store.remove_edge(e.source, e.target)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_caches_match_a_fresh_store_after_mutations(seed):
+    rng = random.Random(seed)
+    store = GraphStore.from_data(*build_resume_graph())
+    dates = event_dates(store.G, today=date(2025, 6, 1)) + [date(2024, 7, 19)]
+    tools = [None] + [nid for nid, kind in store.G.nodes(data="kind") if kind == "tool"][:2]
+    for step in range(25):
+        warm(store, dates, tools)
+        mutate(store, rng, step)
+        check(store, dates, [t for t in tools if t is None or t in store.G])
+
+
+def test_frame_and_force_caches_are_bounded(monkeypatch):
+    monkeypatch.setattr(graph_store, "FRAME_CACHE_SIZE", 3)
+    monkeypatch.setattr(graph_store, "FORCE_CACHE_SIZE", 2)
+    store = GraphStore.from_data(*build_resume_graph())
+    for day in range(1, 10):
+        store.frame("k", date(2024, 1, day), lambda: day)
+    assert [d.day for _, d in store._frame_cache] == [7, 8, 9]
+    assert store.frame("k", date(2024, 1, 9), lambda: None) == 9
+
+    visible = [set(list(store.nodes)[:8])]
+    for gap in (2.0, 2.1, 2.2):
+        store.force_positions(None, visible, layer_gap=gap)
+    assert [key[2] for key in store._force_cache] == [2.1, 2.2]
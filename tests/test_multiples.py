@@ -0,0 +1,52 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from data import build_resume_graph
+from graph_store import GraphStore
+from multiples import build_panels, plot_small_multiples
+from timeline import event_dates, visible_by_date
+
+KINDS = {"project", "tool", "outcome"}
+
+
+@pytest.fixture(scope="module")
+def graph():
+    G = GraphStore.from_data(*build_resume_graph()).G
+    dates = event_dates(G, today=date(2025, 6, 1))
+    projects = sorted(nid for nid, kind in G.nodes(data="kind") if kind == "project")
+    return G, dates, projects
+
+
+@pytest.mark.parametrize("tool", [None, "first"])
+def test_panels_follow_visible_by_date(graph, tool):
+    G, dates, projects = graph
+    if tool == "first":
+        tool = next(nid for nid, kind in G.nodes(data="kind") if kind == "tool")
+    visible = [visible_by_date(G, d, KINDS, tool) for d in dates]
+    panels = build_panels(G, projects, visible, KINDS)
+    assert [p.project for p in panels] == projects
+
+    for p in panels:
+        assert p.opacity.shape == (len(dates), len(p.ids))
+        index = {nid: i for i, nid in enumerate(p.ids)}
+        for s, shown in enumerate(visible):
+            assert p.opacity[s].tolist() == [float(nid in shown) for nid in p.ids]
+
+            expected = sorted(
+                ((p.x[index[u]], p.y[index[u]]), (p.x[index[v]], p.y[index[v]]))
+                for u, v in G.subgraph(p.ids).edges()
+                if u in shown and v in shown
+            )
+            ex, ey = p.edges_x[s].reshape(-1, 3), p.edges_y[s].reshape(-1, 3)
+            assert np.isnan(ex[:, 2]).all() and np.isnan(ey[:, 2]).all()
+            assert sorted(((a, c), (b, d)) for a, b, c, d in zip(ex[:, 0], ex[:, 1], ey[:, 0], ey[:, 1])) == expected
+
+
+def test_every_frame_updates_every_panel(graph):
+    G, dates, projects = graph
+    visible = [visible_by_date(G, d, KINDS) for d in dates]
+    fig = plot_small_multiples(G, projects, dates, visible, KINDS)
+    assert len(fig.frames) == len(dates)
+    assert all(len(f.data) == 2 * len(projects) for f in fig.frames)
@@ -0,0 +1,71 @@
+import pytest
+
+from data import Node
+from graph_store import GraphStore
+from quantities import Query, QuantityIndex, parse_measures, parse_query
+
+
+def measures(text):
+    return [(m.quantity, m.unit, m.value) for m in parse_measures("n", text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("F1 score 0.88", [("f1", "", 0.88)]),
+    ("AUC: 0.91", [("auc", "", 0.91)]),
+    ("AUC of 0.91", [("auc", "", 0.91)]),
+    ("0.91 AUC", [("auc", "", 0.91)]),
+    ("p99 latency 45 ms", [("latency", "ms", 45.0)]),
+    ("from 200ms to 45ms", [("latency", "ms", 200.0), ("latency", "ms", 45.0)]),
+    ("45ms inference", [("inference", "ms", 45.0)]),
+    ("150GB+ climate pipelines", [("data", "GB", 150.0)]),
+    ("$10–15M allocation", [("money", "USD", 1e7), ("money", "USD", 1.5e7)]),
+    ("-5% churn", [("percent", "%", -5.0)]),
+    ("3x faster", [("speedup", "×", 3.0)]),
+])
+def test_parse_measures(text, expected):
+    assert measures(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", [
+    "COVID-19 model",
+    "2010–2024 macro coverage",
+    "Python 3",
+    "GPT4 prompts",
+])
+def test_no_measure(text):
+    assert measures(text) == []
+
+
+def test_segments_parse_separately():
+    assert measures("AUC 0.91 • 45ms latency") == pytest.approx([("auc", "", 0.91), ("latency", "ms", 45.0)])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("latency < 50 ms", Query("latency", "ms", "<", 50.0)),
+    ("AUC ≥ 0.9", Query("auc", None, ">=", 0.9)),
+    ("data >= 1TB", Query("data", "GB", ">=", 1000.0)),
+    ("< 2 s", Query(None, "ms", "<", 2000.0)),
+    ("node >= 10k", Query("node", None, ">=", 10000.0)),
+])
+def test_parse_query(text, expected):
+    assert parse_query(text) == expected
+
+
+@pytest.mark.parametrize("text", ["latency", "< 50", "latency < fast"])
+def test_bad_query(text):
+    with pytest.raises(ValueError):
+        parse_query(text)
+
+
+def test_index_follows_edits():
+    store = GraphStore.from_data({
+        "a": Node("a", "Ranker", "outcome", metric="AUC: 0.91"),
+        "b": Node("b", "Search", "outcome", metric="p99 latency 45 ms"),
+    }, [])
+    index = QuantityIndex(store)
+    assert [m.node for m in index.query("AUC >= 0.9")] == ["a"]
+    assert [m.node for m in index.query("latency < 50 ms")] == ["b"]
+
+    store.update_node(Node("b", "Search", "outcome", metric="from 200ms to 60ms"))
+    assert index.query("latency < 50 ms") == []
+    assert [m.value for m in index.query("latency >= 50 ms")] == [60.0, 200.0]
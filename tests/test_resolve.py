@@ -0,0 +1,49 @@
+import pytest
+
+from data import Node
+from resolve import match_key, resolve_entities
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Node.js", "NodeJS"),
+    ("Vue.js", "VueJS"),
+    ("Next.js", "NextJS"),
+    ("REST APIs", "REST API"),
+    ("Git / GitHub", "git-github"),
+])
+def test_spellings_share_a_key(a, b):
+    assert match_key(a) == match_key(b)
+
+
+@pytest.mark.parametrize("label, key", [
+    ("NodeJS", "nodejs"),
+    ("Node.js", "nodejs"),
+    ("CSS", "css"),
+    ("REST APIs", "restapi"),
+])
+def test_match_key(label, key):
+    assert match_key(label) == key
+
+
+def test_js_spellings_resolve_to_one_node():
+    nodes = {
+        "tool_node": Node("tool_node", "Node.js", "tool"),
+        "tool_nodejs": Node("tool_nodejs", "NodeJS", "tool"),
+        "tool_vue": Node("tool_vue", "Vue.js", "tool"),
+        "tool_vuejs": Node("tool_vuejs", "VueJS", "tool"),
+        "tool_next": Node("tool_next", "Next.js", "tool"),
+        "tool_nextjs": Node("tool_nextjs", "NextJS", "tool"),
+    }
+    resolved, resolution = resolve_entities(nodes, degree={"tool_node": 3, "tool_vue": 2, "tool_next": 1})
+    assert resolution.aliases == {"tool_nodejs": "tool_node", "tool_vuejs": "tool_vue", "tool_nextjs": "tool_next"}
+    assert set(resolved) == {"tool_node", "tool_vue", "tool_next"}
+
+
+def test_different_kinds_stay_apart():
+    nodes = {
+        "tool_react": Node("tool_react", "React", "tool"),
+        "tag_react": Node("tag_react", "React", "tag"),
+    }
+    resolved, resolution = resolve_entities(nodes)
+    assert resolution.aliases == {}
+    assert set(resolved) == set(nodes)
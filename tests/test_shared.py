@@ -0,0 +1,76 @@
+import uuid
+from datetime import date
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from centrality import CentralityEngine
+from counts import CountIndex
+from data import build_resume_graph
+from graph_component import adjacency_list
+from graph_store import GraphStore
+from related import RelatedIndex
+from shared import GraphArrays, SharedGraphPublisher
+from timeline import event_dates
+
+FILTERS = [
+    {"experience", "project", "tool", "outcome"},
+    {"project", "tool"},
+    {"experience", "project", "tool", "outcome", "leadership", "tag"},
+]
+
+
+@pytest.fixture(scope="module")
+def published():
+    store = GraphStore.from_data(*build_resume_graph())
+    publisher = SharedGraphPublisher(store, f"test_{uuid.uuid4().hex[:8]}")
+    # attached without SharedGraphReader: in the publisher's own process its resource
+    # tracker unregistering would trip the publisher's unlink
+    arrays = GraphArrays(SharedMemory(name=f"{publisher.prefix}_v{publisher.version}"))
+    yield store, arrays
+    arrays.close()
+    publisher.close()
+
+
+def test_nodes_and_structure_match_the_store(published):
+    store, arrays = published
+    assert dict(arrays.nodes) == store.nodes
+    assert arrays.event_dates(date(2025, 6, 1)) == event_dates(store.G, date(2025, 6, 1))
+
+    kinds = FILTERS[0]
+    drawn = [nid for nid, kind in store.G.nodes(data="kind") if kind in kinds]
+    assert arrays.adjacency(drawn) == adjacency_list(store.G.subgraph(drawn))
+    H = arrays.graph(kinds)
+    assert dict(H.nodes(data=True)) == dict(store.G.subgraph(drawn).nodes(data=True))
+    assert {frozenset((u, v)): d for u, v, d in H.edges(data=True)} == \
+        {frozenset((u, v)): d for u, v, d in store.G.subgraph(drawn).edges(data=True)}
+
+
+@pytest.mark.parametrize("kinds", FILTERS + [None])
+def test_centrality_from_arrays(published, kinds):
+    store, arrays = published
+    expected, shared = CentralityEngine(store), CentralityEngine.from_arrays(arrays)
+    for metric in ("degree", "pagerank", "betweenness"):
+        a, b = expected.scores(metric, kinds), shared.scores(metric, kinds)
+        assert a.keys() == b.keys()
+        assert np.allclose([a[k] for k in a], [b[k] for k in a])
+
+
+@pytest.mark.parametrize("kinds", FILTERS)
+@pytest.mark.parametrize("tool", [None, "first", "missing"])
+def test_count_cube_from_arrays(published, kinds, tool):
+    store, arrays = published
+    if tool == "first":
+        tool = next(nid for nid, kind in store.G.nodes(data="kind") if kind == "tool")
+    a, b = CountIndex(store).cube(kinds, tool), CountIndex.from_arrays(arrays).cube(kinds, tool)
+    assert (a.kinds, a.rels) == (b.kinds, b.rels)
+    assert np.array_equal(a.days, b.days)
+    assert np.array_equal(a.nodes, b.nodes) and np.array_equal(a.edges, b.edges)
+
+
+def test_related_from_arrays(published):
+    store, arrays = published
+    expected, shared = RelatedIndex(store), RelatedIndex.from_arrays(arrays)
+    for nid in store.nodes:
+        assert shared.related(nid) == pytest.approx(expected.related(nid))
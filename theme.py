@@ -0,0 +1,126 @@
+from __future__ import annotations
+import argparse
+import glob
+import hashlib
+import os
+import re
+import urllib.request
+from typing import List, Tuple
+
+
+# Builds the app theme once: styles/theme.css (+ @font-face rules for fonts vendored in
+# static/fonts) is minified into static/theme.<hash>.css, which Streamlit serves from
+# app/static/ (server.enableStaticServing) and the browser caches; reruns only send the
+# <link> tag (the static route types files by extension, so .css goes out as text/css;
+# hence streamlit>=1.66 in requirements.txt). Fonts are fetched once, at build time,
+# never at render; without them the theme uses the system font stack:
+#
+#   python theme.py --fetch-fonts
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(_ROOT, "styles", "theme.css")
+STATIC_DIR = os.path.join(_ROOT, "static")
+FONT_DIR = os.path.join(STATIC_DIR, "fonts")
+STATIC_URL = "app/static"
+
+FONTS = {"DM Sans": (400, 500, 700), "Space Grotesk": (400, 500, 600, 700)}
+FONTS_API = "https://fonts.googleapis.com/css2"
+# a browser user agent, so the API answers with woff2 files
+WOFF2_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+_STRING = re.compile(r"\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'")
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def minify(css: str) -> str:
+    # strings (data URLs, font names) are set aside so only the CSS around them is squeezed
+    strings: List[str] = []
+
+    def stash(m: re.Match) -> str:
+        strings.append(m.group(0))
+        return f"\0{len(strings) - 1}\0"
+
+    css = _STRING.sub(stash, _COMMENT.sub("", css))
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    css = css.replace(";}", "}").strip()
+    return re.sub(r"\0(\d+)\0", lambda m: strings[int(m.group(1))], css)
+
+
+def _font_file(family: str, weight: int) -> str:
+    return f"{family.replace(' ', '')}-{weight}.woff2"
+
+
+def font_faces() -> str:
+    # only fonts that were actually vendored; anything missing falls back to the system stack
+    rules = []
+    for family, weights in FONTS.items():
+        for weight in weights:
+            name = _font_file(family, weight)
+            if os.path.exists(os.path.join(FONT_DIR, name)):
+                rules.append(
+                    f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};"
+                    f"font-display:swap;src:url(fonts/{name}) format('woff2')}}"
+                )
+    return "".join(rules)
+
+
+def compile_theme() -> Tuple[str, str]:
+    with open(SOURCE, encoding="utf-8") as f:
+        css = font_faces() + minify(f.read())
+    digest = hashlib.sha1(css.encode("utf-8")).hexdigest()[:10]
+    return css, f"theme.{digest}.css"
+
+
+def build_theme() -> Tuple[str, str]:
+    # (url, css); the hashed file is written once and stale builds are removed
+    css, name = compile_theme()
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        for old in glob.glob(os.path.join(STATIC_DIR, "theme.*.css")):
+            os.remove(old)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(css)
+        os.replace(tmp, path)
+    return f"{STATIC_URL}/{name}", css
+
+
+def fetch_fonts() -> List[str]:
+    os.makedirs(FONT_DIR, exist_ok=True)
+    saved = []
+    for family, weights in FONTS.items():
+        for weight in weights:
+            query = f"family={family.replace(' ', '+')}:wght@{weight}&display=swap"
+            req = urllib.request.Request(f"{FONTS_API}?{query}", headers={"User-Agent": WOFF2_AGENT})
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                css = resp.read().decode("utf-8")
+            # the API splits each face by script; keep the latin subset
+            block = re.search(r"/\* latin \*/\s*@font-face\s*{(.*?)}", css, re.S)
+            url = re.search(r"url\((https://[^)]+\.woff2)\)", block.group(1) if block else css)
+            if url is None:
+                raise RuntimeError(f"No woff2 file for {family} {weight}")
+            with urllib.request.urlopen(url.group(1), timeout=30) as resp:
+                data = resp.read()
+            name = _font_file(family, weight)
+            with open(os.path.join(FONT_DIR, name), "wb") as f:
+                f.write(data)
+            saved.append(name)
+    return saved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the static theme stylesheet")
+    parser.add_argument("--fetch-fonts", action="store_true", help="download the theme fonts into static/fonts first")
+    args = parser.parse_args()
+
+    if args.fetch_fonts:
+        for name in fetch_fonts():
+            print(f"Saved static/fonts/{name}")
+    url, css = build_theme()
+    print(f"{url} ({len(css)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
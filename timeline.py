@@ -0,0 +1,158 @@
+from __future__ import annotations
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+import networkx as nx
+
+
+# Timeline semantics shared by the app and the HTTP API: event stops, cumulative
+# visibility per date, and hierarchical stops (one per year, with a single "zoomed"
+# year expanded into monthly or weekly stops so payload and build time stay bounded).
+
+RESOLUTIONS = ("month", "week")
+
+
+def month_floor(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def parse_start(value) -> date | None:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value.strip())
+        except Exception:
+            return None
+    return None
+
+
+def event_dates(G: nx.Graph, today: Optional[date] = None) -> List[date]:
+    dates = set()
+    for _, data in G.nodes(data=True):
+        if data.get("kind") in {"project", "experience", "leadership"}:
+            s = parse_start(data.get("start"))
+            if s:
+                dates.add(month_floor(s))
+    dates.add(month_floor(today or date.today()))
+    return sorted(dates)
+
+
+def change_dates(G: nx.Graph) -> List[date]:
+    # the only dates visible_by_date can change on: any d gives the same set as the
+    # last of these at or before it (date.min before the first)
+    starts = set()
+    for _, data in G.nodes(data=True):
+        if data.get("kind") in {"project", "experience"}:
+            s = parse_start(data.get("start"))
+            if s:
+                starts.add(s)
+    return sorted(starts)
+
+
+def visible_by_date(
+    G: nx.Graph,
+    d: date,
+    enabled_kinds: Set[str],
+    tool_id: Optional[str] = None,
+) -> Set[str]:
+    # cumulative: dated projects/experiences appear once started, leadership and tags
+    # always; visible nodes then pull in their tools and outcomes
+    visible = set()
+    projects = set()
+    for nid, data in G.nodes(data=True):
+        kind = data.get("kind")
+        if kind == "project":
+            projects.add(nid)
+        if kind not in enabled_kinds:
+            continue
+        if kind in {"project", "experience"}:
+            s = parse_start(data.get("start"))
+            if s and s <= d:
+                visible.add(nid)
+        elif kind in {"leadership", "tag"}:
+            visible.add(nid)
+
+    if tool_id and tool_id in G:
+        connected_projects = {nb for nb in G.neighbors(tool_id) if nb in projects and nb in visible}
+        visible = (visible - projects) | connected_projects | {tool_id}
+
+    expanded = set(visible)
+    for nid in visible:
+        for nb in G.neighbors(nid):
+            if G.nodes[nb].get("kind") in {"tool", "outcome"} & enabled_kinds:
+                expanded.add(nb)
+
+    return expanded
+
+
+def appearance_dates(
+    G: nx.Graph,
+    enabled_kinds: Set[str],
+    tool_id: Optional[str] = None,
+) -> Dict[str, date]:
+    # first date each node is in visible_by_date(G, d, enabled_kinds, tool_id), in one
+    # pass: date.min = visible from the start, missing = never visible
+    first: Dict[str, date] = {}
+    for nid, data in G.nodes(data=True):
+        kind = data.get("kind")
+        if kind not in enabled_kinds:
+            continue
+        if kind in {"project", "experience"}:
+            s = parse_start(data.get("start"))
+            if s:
+                first[nid] = s
+        elif kind in {"leadership", "tag"}:
+            first[nid] = date.min
+
+    if tool_id and tool_id in G:
+        for nid in [nid for nid in first if G.nodes[nid].get("kind") == "project"]:
+            if not G.has_edge(nid, tool_id):
+                del first[nid]
+        first[tool_id] = date.min
+
+    expand = {"tool", "outcome"} & enabled_kinds
+    for nid, s in list(first.items()):
+        for nb in G.neighbors(nid):
+            if G.nodes[nb].get("kind") in expand and (nb not in first or s < first[nb]):
+                first[nb] = s
+    return first
+
+
+def _year_end(year: int, last: date) -> date:
+    return min(date(year, 12, 31), last)
+
+
+def period_stops(year: int, last: date, resolution: str = "month") -> List[Tuple[date, str]]:
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown timeline resolution: {resolution!r}")
+    end = _year_end(year, last)
+    stops: List[Tuple[date, str]] = []
+    if resolution == "month":
+        for m in range(1, end.month + 1):
+            d = date(year, m, 1)
+            stops.append((d, d.strftime("%b %Y")))
+    else:
+        d = date(year, 1, 1)
+        d += timedelta(days=(7 - d.weekday()) % 7)  # first Monday
+        while d <= end:
+            stops.append((d, d.strftime("%d %b %Y")))
+            d += timedelta(weeks=1)
+    return stops
+
+
+def hierarchical_stops(
+    first: date,
+    last: date,
+    zoom_year: Optional[int] = None,
+    resolution: str = "month",
+) -> List[Tuple[date, str]]:
+    stops: List[Tuple[date, str]] = []
+    for year in range(first.year, last.year + 1):
+        if year == zoom_year:
+            stops.extend(period_stops(year, last, resolution))
+        end = _year_end(year, last)
+        if not stops or stops[-1][0] != end:
+            stops.append((end, str(year)))
+    return stops